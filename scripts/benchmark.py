@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 벤치마크 (합성 종목, 네트워크 불필요)
+- 단계: 수익률 계산, 위험 지표, 종목 처리, 상위 종목 선정, JSON 저장, HTML 생성
+- 규모: 종목 수 × 기간(년) 조합별 실행 시간 + 최대 메모리(tracemalloc)
+- --save-baseline 으로 기준 저장, 이후 실행은 기준 대비 --threshold 이상 느려지면 실패
+
+사용 예:
+    python scripts/benchmark.py --sizes 500,5000 --years 1
+    python scripts/benchmark.py --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from fetch_data import process_spy, iter_stocks, select_top_symbols, write_output
+from generate_html import generate_html
+from performance import get_date_ranges, calculate_performance_matrix
+from risk import calculate_risk_matrix
+from sources import synthetic_universe
+
+BASELINE_PATH = Path(__file__).parent.parent / "benchmarks" / "baseline.json"
+DEFAULT_SIZES = [500, 5000, 50000]
+DEFAULT_YEARS = [1, 5]
+TRADING_DAYS = 252
+
+# 기준 대비 허용 증가율 / 이보다 작은 절대 차이는 측정 잡음으로 무시
+DEFAULT_THRESHOLD = 0.25
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_MB = 5.0
+
+
+def measure(func, repeat=1, memory=True):
+    """(결과, 최소 실행 시간 초, 최대 메모리 MB) — 메모리는 별도 1회 추적 실행"""
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = peak / 1024 / 1024
+
+    return result, best, peak_mb
+
+
+def run_case(n_tickers, years, repeat=1, memory=True):
+    """한 규모에 대해 모든 단계 측정 → {stage: {"seconds", "peak_mb"}}"""
+    close = synthetic_universe(n_tickers, years * TRADING_DAYS + 10).round(2)
+    tickers = [c for c in close.columns if c != "SPY"]
+    date_ranges = get_date_ranges()
+    results = {}
+
+    def record(stage, func):
+        result, seconds, peak_mb = measure(func, repeat, memory)
+        results[stage] = {"seconds": round(seconds, 4), "peak_mb": None if peak_mb is None else round(peak_mb, 1)}
+        return result
+
+    perf_matrix = record("performance", lambda: calculate_performance_matrix(close, date_ranges))
+    risk_matrix = record("risk", lambda: calculate_risk_matrix(close))
+    spy = process_spy(close, perf_matrix, risk_matrix)
+    all_stocks = record("process_stocks", lambda: list(iter_stocks(close, tickers, perf_matrix, None, risk_matrix)))
+    performances = {s["symbol"]: s["performance"] for s in all_stocks}
+    record("top_symbols", lambda: select_top_symbols(performances, spy["performance"], date_ranges.keys()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "stocks.json"
+        record("json_dump", lambda: write_output(data_path, close, spy, all_stocks, {}, {}))
+        results["json_dump"]["bytes"] = data_path.stat().st_size
+
+        def render():
+            # 호출마다 빈 출력 디렉터리 → 반복/메모리 측정도 첫 실행처럼 파일 쓰기 + 압축까지 수행
+            # (같은 디렉터리면 write_if_changed 가 건너뛰어 거의 아무것도 안 한 시간이 측정됨)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_html(data_path, Path(tempfile.mkdtemp(dir=tmp)))
+
+        record("generate_html", render)
+
+    return results
+
+
+def compare(current, baseline, threshold):
+    """기준 대비 회귀 목록"""
+    regressions = []
+    for case, stages in current.items():
+        for stage, now in stages.items():
+            before = baseline.get(case, {}).get(stage)
+            if not before:
+                continue
+
+            if (now["seconds"] > before["seconds"] * (1 + threshold)
+                    and now["seconds"] - before["seconds"] > MIN_SECONDS_DELTA):
+                regressions.append(f"{case} {stage}: {before['seconds']:.3f}s → {now['seconds']:.3f}s")
+
+            if (now.get("peak_mb") is not None and before.get("peak_mb") is not None
+                    and now["peak_mb"] > before["peak_mb"] * (1 + threshold)
+                    and now["peak_mb"] - before["peak_mb"] > MIN_MEMORY_DELTA_MB):
+                regressions.append(f"{case} {stage}: {before['peak_mb']:.1f}MB → {now['peak_mb']:.1f}MB")
+    return regressions
+
+
+def parse_list(text):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 벤치마크")
+    parser.add_argument("--sizes", type=parse_list, default=DEFAULT_SIZES, help="종목 수 (쉼표 구분)")
+    parser.add_argument("--years", type=parse_list, default=DEFAULT_YEARS, help="가격 기간(년) (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=1, help="시간 측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="기준 결과 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="허용 증가율 (0.25 = 25%%)")
+    parser.add_argument("--output", type=Path, help="이번 결과 저장 경로 (JSON)")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("⏱️  파이프라인 벤치마크")
+    print("=" * 60)
+
+    results = {}
+    for years in args.years:
+        for n_tickers in args.sizes:
+            case = f"{n_tickers}x{years}y"
+            print(f"\n📊 {case} ({n_tickers}개 종목 × {years}년)")
+            results[case] = run_case(n_tickers, years, args.repeat, not args.no_memory)
+            for stage, result in results[case].items():
+                peak = "-" if result["peak_mb"] is None else f"{result['peak_mb']:.1f}MB"
+                print(f"  {stage:15} {result['seconds']:9.3f}s  {peak:>10}")
+
+    report = {
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=1), encoding="utf-8")
+        print(f"\n💾 기준 저장: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("\nℹ️  기준 파일 없음 (--save-baseline 으로 생성)")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ 기준 대비 {args.threshold:.0%} 이상 회귀:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"\n✅ 회귀 없음 (기준: {args.baseline})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+중단된 fetch_data 실행 재개용 체크포인트 (data/.checkpoint/)
+- state.json: 실행 키(날짜 + 소스 + 종목 목록 해시) + 완료 단계
+- chunks/: 다운로드 끝난 청크 종가
+- close.csv: 다운로드 단계 결과
+- stocks.json.partial / ranking.json: 종목까지 기록한 stocks.json 임시 파일 + 종목별 수익률/상위 종목
+- written 단계: partial 을 stocks.json 으로 옮긴 뒤 표시 → 재실행은 이어 쓰지 않고 뒤 단계(인덱스/캐시)만
+- 키가 다르면(다음 날, 종목 목록 변경) 이전 체크포인트는 버림, 정상 종료 시 삭제
+"""
+
+import json
+import shutil
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from fileio import write_atomic
+
+CHECKPOINT_DIR = Path(__file__).parent.parent / "data" / ".checkpoint"
+
+
+def run_key(source_name, symbols, today=None):
+    """같은 날, 같은 소스, 같은 종목 목록이면 같은 키"""
+    today = today or datetime.now()
+    universe = zlib.crc32(",".join(sorted(symbols)).encode())
+    return f"{today.strftime('%Y-%m-%d')}-{source_name}-{universe:08x}"
+
+
+class Checkpoint:
+    """단계 완료 표시 + 부분 결과 저장/복원"""
+
+    def __init__(self, key, path=CHECKPOINT_DIR):
+        self.key = key
+        self.path = Path(path)
+        self.state = self._load_state()
+        self.resumed = bool(self.state["stages"] or list(self._chunk_dir().glob("*.csv")))
+        self._save_state()
+
+    def _load_state(self):
+        state_path = self.path / "state.json"
+        if state_path.exists():
+            try:
+                state = json.loads(state_path.read_text(encoding="utf-8"))
+                if state.get("key") == self.key:
+                    return state
+            except ValueError:
+                pass
+        # 다른 실행의 체크포인트는 버림
+        shutil.rmtree(self.path, ignore_errors=True)
+        return {"key": self.key, "stages": []}
+
+    def _chunk_dir(self):
+        return self.path / "chunks"
+
+    def _save_state(self):
+        write_atomic(self.path / "state.json", json.dumps(self.state))
+
+    def done(self, stage):
+        return stage in self.state["stages"]
+
+    def complete(self, stage):
+        if stage not in self.state["stages"]:
+            self.state["stages"].append(stage)
+            self._save_state()
+
+    def save_json(self, name, obj):
+        write_atomic(self.path / name, json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+
+    def load_json(self, name):
+        return json.loads((self.path / name).read_text(encoding="utf-8"))
+
+    def save_frame(self, name, frame):
+        write_atomic(self.path / name, frame.to_csv())
+
+    def load_frame(self, name):
+        path = self.path / name
+        if not path.exists():
+            return None
+        return pd.read_csv(path, index_col=0, parse_dates=True, float_precision="round_trip")
+
+    def chunk_name(self, symbols, start):
+        """청크 파일명 (시작일 + 종목 목록)"""
+        digest = zlib.crc32(",".join(symbols).encode())
+        return f"chunks/{pd.Timestamp(start).strftime('%Y%m%d')}-{digest:08x}.csv"
+
+    def load_chunk(self, symbols, start):
+        return self.load_frame(self.chunk_name(symbols, start))
+
+    def save_chunk(self, symbols, start, close):
+        self.save_frame(self.chunk_name(symbols, start), close)
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
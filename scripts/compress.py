@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+빌드 결과물 미리 압축 (정적 호스트가 <파일>.gz / <파일>.br 이 있으면 그대로 전송)
+- gzip: 최고 압축(9), mtime=0 → 같은 내용이면 같은 바이트 (불필요한 커밋 없음)
+- brotli: 최고 압축(11), brotli 패키지가 없으면 건너뜀 (오래된 .br 은 삭제)
+- 원본이 이번 실행에서 바뀌었거나 압축본이 없을 때만 다시 압축
+"""
+
+import gzip
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def sibling(path, suffix):
+    path = Path(path)
+    return path.with_name(path.name + suffix)
+
+
+def remove_siblings(path):
+    """원본을 지울 때 압축본도 같이 삭제"""
+    for suffix in COMPRESSED_SUFFIXES:
+        sibling(path, suffix).unlink(missing_ok=True)
+
+
+def encoders():
+    """{확장자: 압축 함수} (사용 가능한 것만)"""
+    result = {".gz": lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        result[".br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    return result
+
+
+def precompress(paths, changed=(), written=None):
+    """
+    paths 마다 .gz (+ .br) 작성
+    changed: 이번 실행에서 다시 쓴 원본 (이 파일들은 압축본이 있어도 다시 압축)
+    반환: {원본 경로: {"raw": 바이트, ".gz": 바이트, ".br": 바이트}}
+    """
+    changed = {Path(p) for p in changed}
+    codecs = encoders()
+    report = {}
+    for path in map(Path, paths):
+        data = None
+        sizes = {"raw": path.stat().st_size}
+        for suffix, encode in codecs.items():
+            target = sibling(path, suffix)
+            if path in changed or not target.exists():
+                data = path.read_bytes() if data is None else data
+                target.write_bytes(encode(data))
+                if written is not None:
+                    written.append(target)
+            sizes[suffix] = target.stat().st_size
+        if ".br" not in codecs:
+            sibling(path, ".br").unlink(missing_ok=True)
+        report[path] = sizes
+    return report
+
+
+def summarize(report):
+    """압축 전/후 합계 {"raw": n, ".gz": n, ".br": n}"""
+    totals = {}
+    for sizes in report.values():
+        for key, size in sizes.items():
+            totals[key] = totals.get(key, 0) + size
+    return totals
+
+
+def format_report(report, root=None):
+    """파일별 + 합계 크기 표 (KB, 원본 대비 %)"""
+    def row(name, sizes):
+        raw = sizes["raw"]
+        cells = [f"{name:40}", f"{raw / 1024:9.1f}KB"]
+        for suffix in COMPRESSED_SUFFIXES:
+            if suffix in sizes:
+                ratio = sizes[suffix] / raw * 100 if raw else 0
+                cells.append(f"{suffix} {sizes[suffix] / 1024:8.1f}KB ({ratio:4.1f}%)")
+        return "  " + "  ".join(cells)
+
+    lines = [row(str(path.relative_to(root) if root else path), sizes) for path, sizes in report.items()]
+    lines.append(row("합계", summarize(report)))
+    return "\n".join(lines)
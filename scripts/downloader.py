@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+종가 분할 다운로드
+- 종목 목록을 chunk_size 개씩 나눠 workers 개 스레드에서 처리
+  청크 요청이 실제로 동시에 나가는지는 소스가 결정
+  · yfinance: yf.download 가 스레드 안전하지 않아 한 번에 한 청크 (청크 안 종목은 yfinance 스레드로 동시 요청)
+    → workers 는 체크포인트 청크 복원/재시도 대기만 겹치게 함
+  · synthetic / fixture: 청크가 동시에 처리됨
+- 실패한 청크만 백오프 후 재시도 (한 번의 일시적 오류로 전체가 실패하지 않음)
+- 마지막에 빠진 종목(컬럼 없음/전부 NaN)만 모아 한 번 더 요청
+- checkpoint 를 주면 끝난 청크를 저장하고, 재실행 시 저장된 청크는 다시 받지 않음
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+CHUNK_SIZE = 100
+MAX_WORKERS = 4
+MAX_RETRIES = 3
+BACKOFF_BASE = 2.0
+
+
+def chunked(symbols, size):
+    """size 개씩 나눈 리스트"""
+    symbols = list(symbols)
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+def missing_symbols(close, symbols):
+    """응답에 없거나 값이 전부 NaN 인 종목"""
+    present = set(close.columns[close.notna().any()]) if not close.empty else set()
+    return [s for s in symbols if s not in present]
+
+
+def download_chunk(source, symbols, start, end, retries=MAX_RETRIES, on_retry=None):
+    """한 청크 다운로드 (예외 시 백오프 후 재시도, 모두 실패하면 마지막 예외)"""
+    for attempt in range(retries + 1):
+        try:
+            close = source.download(symbols, start, end)
+            return close.loc[:, ~close.columns.duplicated(keep="last")]
+        except Exception:
+            if attempt == retries:
+                raise
+            if on_retry:
+                on_retry(symbols)
+            time.sleep(BACKOFF_BASE * (2 ** attempt) * (1 + random.random()))
+
+
+def download_closes(source, symbols, start, end, chunk_size=CHUNK_SIZE,
+                    workers=MAX_WORKERS, retries=MAX_RETRIES, checkpoint=None):
+    """
+    여러 종목 종가를 청크 단위로 다운로드 (청크 동시 요청 여부는 소스에 따름, 모듈 설명 참고)
+    반환: (종가 행렬, stats)
+    stats: {"chunks", "retries", "failedChunks", "reconciled", "resumed", "missing": [끝까지 빠진 종목]}
+    """
+    # 청크 구성이 실행마다 같도록 정렬 (체크포인트 청크 재사용)
+    symbols = sorted(set(symbols))
+    retried = []
+    failed_chunks = []
+    resumed = []
+
+    def task(chunk):
+        if checkpoint:
+            saved = checkpoint.load_chunk(chunk, start)
+            if saved is not None:
+                resumed.append(chunk)
+                return saved
+        try:
+            close = download_chunk(source, chunk, start, end, retries, on_retry=retried.append)
+            if checkpoint and not close.empty:
+                checkpoint.save_chunk(chunk, start, close)
+            return close
+        except Exception as e:
+            print(f"  ⚠️ 청크 실패 ({chunk[0]}~{chunk[-1]}, {len(chunk)}개): {e}")
+            failed_chunks.append(chunk)
+            return None
+
+    chunks = chunked(symbols, chunk_size)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        frames = [close for close in pool.map(task, chunks) if close is not None and not close.empty]
+
+    # 재조정: 빠진 종목만 작은 청크로 한 번 더 요청
+    close = pd.concat(frames, axis=1) if frames else pd.DataFrame()
+    missing = missing_symbols(close, symbols)
+    reconciled = []
+    if missing:
+        print(f"  🔁 누락 {len(missing)}개 종목 재요청")
+        for chunk in chunked(missing, max(1, chunk_size // 10)):
+            try:
+                retry_close = download_chunk(source, chunk, start, end, retries, on_retry=retried.append)
+            except Exception as e:
+                print(f"  ⚠️ 재요청 실패 ({len(chunk)}개): {e}")
+                continue
+            found = [s for s in chunk if s not in missing_symbols(retry_close, chunk)]
+            if found:
+                frames.append(retry_close[found])
+                reconciled.extend(found)
+
+    close = pd.concat(frames, axis=1) if frames else pd.DataFrame()
+    if not close.empty:
+        close = close.loc[:, ~close.columns.duplicated(keep="last")].sort_index()
+
+    stats = {
+        "chunks": len(chunks),
+        "retries": len(retried),
+        "failedChunks": len(failed_chunks),
+        "reconciled": len(reconciled),
+        "resumed": len(resumed),
+        "missing": missing_symbols(close, symbols),
+    }
+    return close, stats
@@ -1,356 +1,411 @@
 #!/usr/bin/env python3
 """
 S&P 500 + Nasdaq 100 종목의 SPY 대비 성과 데이터 수집
-- 티커 목록 하드코딩 (Wikipedia 의존성 제거)
-- yfinance 배치 다운로드 (빠르고 안정적)
+- 종목 목록은 universes/*.txt 파일 (--universe 로 선택/병합, 기본: sp500 + nasdaq100 + growth)
+- yfinance 청크 단위 동시 다운로드 (실패 청크만 재시도), --source 로 합성/fixture 소스 선택 가능
+- 로컬 종가 저장소(data/prices/ 월별 세그먼트) 이후 구간만 증분 다운로드
+- 단계별 체크포인트(data/.checkpoint/) → 중단된 실행은 남은 작업만 이어서 진행
+- 컬럼형 stocks.json (version 2, 공통 날짜 축 + 델타 인코딩 가격)
+  종목 단위 스트리밍 기록 → 메모리에는 종목별 수익률만 유지
+- 종목별 베타/변동성/최대 낙폭/샤프/상대강도 (벡터 연산 한 번)
+- 이름/섹터는 전체 종목을 종목 정보 캐시(28일 TTL)에 유지 → 조회 서버의 섹터 필터 (첫 실행만 전체 요청)
+- 임의 기간 순위용 누적 로그 수익률 인덱스 (data/log_index.npz, scripts/ranges.py)
+- --watch: 장중 감시 모드 (최신 시세로 마지막 가격만 교체 → 바뀐 데이터 파일만 기록, scripts/watch.py)
+- 메모리 맵 종가 캐시 (data/cache/*.npy, scripts/price_cache.py)
 """
 
-import json
-from datetime import datetime, timedelta
+import argparse
+import heapq
+import sys
+from datetime import datetime
 from pathlib import Path
-import time
-
-try:
-    import yfinance as yf
-except ImportError:
-    import subprocess
-    subprocess.check_call(['pip', 'install', 'yfinance', '-q'])
-    import yfinance as yf
-
-# ============================================
-# S&P 500 + Nasdaq 100 티커 (하드코딩)
-# 중복 제거된 약 550개 종목
-# ============================================
-
-TICKERS = [
-    # Mega Cap Tech
-    "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA", "AVGO", "ORCL",
-    # Nasdaq 100 주요 종목
-    "ADBE", "AMD", "ADP", "ABNB", "ALGN", "AMGN", "ADI", "ANSS", "ASML", "AZN",
-    "TEAM", "ADSK", "BKR", "BIIB", "BKNG", "CDNS", "CDW", "CHTR", "CTAS", "CSCO",
-    "CTSH", "CMCSA", "CEG", "CPRT", "CSGP", "COST", "CRWD", "DDOG", "DXCM", "FANG",
-    "DLTR", "EA", "EXC", "FAST", "FTNT", "GEHC", "GILD", "GFS", "HON", "IDXX",
-    "ILMN", "INTC", "INTU", "ISRG", "KDP", "KLAC", "KHC", "LRCX", "LIN", "LULU",
-    "MAR", "MRVL", "MELI", "MDLZ", "MNST", "MU", "MCHP", "NFLX", "NXPI", "ODFL",
-    "ON", "ORLY", "PCAR", "PANW", "PAYX", "PDD", "PYPL", "PEP", "QCOM", "REGN",
-    "ROP", "ROST", "SBUX", "SNPS", "TTWO", "TMUS", "TXN", "VRSK", "VRTX", "WBD",
-    "WDAY", "XEL", "ZS",
-    # S&P 500 추가 종목 (A)
-    "A", "AAL", "AAP", "ABBV", "ABC", "ABT", "ACN", "ADM",
-    "AEE", "AEP", "AES", "AFL", "AIG", "AIZ", "AJG", "AKAM", "ALB",
-    "ALK", "ALL", "ALLE", "AMAT", "AMCR", "AME", "AMP", "AMT",
-    "ANET", "AON", "AOS", "APA", "APD", "APH", "APTV", "ARE", "ATO",
-    "AVB", "AVY", "AWK", "AXP", "AZO",
-    # S&P 500 (B)
-    "BA", "BAC", "BALL", "BAX", "BBWI", "BBY", "BDX", "BEN", "BG", "BIO",
-    "BK", "BLK", "BMY", "BR", "BRO", "BSX", "BWA",
-    # S&P 500 (C)
-    "C", "CAG", "CAH", "CARR", "CAT", "CB", "CBOE", "CBRE", "CCI", "CCL", "CDAY",
-    "CE", "CF", "CFG", "CHD", "CHRW", "CI", "CINF",
-    "CL", "CLX", "CMA", "CME", "CMG", "CMI", "CMS", "CNC", "CNP", "COF",
-    "COO", "COP", "CPB", "CPT", "CRL", "CRM",
-    "CSX", "CTLT", "CTRA", "CTVA", "CVS", "CVX", "CZR",
-    # S&P 500 (D)
-    "D", "DAL", "DD", "DE", "DFS", "DG", "DGX", "DHI", "DHR", "DIS", "DLR",
-    "DOV", "DOW", "DPZ", "DRI", "DTE", "DUK", "DVA", "DVN",
-    # S&P 500 (E)
-    "EBAY", "ECL", "ED", "EFX", "EG", "EIX", "EL", "ELV", "EMN", "EMR",
-    "ENPH", "EOG", "EPAM", "EQIX", "EQR", "EQT", "ES", "ESS", "ETN", "ETR",
-    "ETSY", "EVRG", "EW", "EXPD", "EXPE", "EXR",
-    # S&P 500 (F)
-    "F", "FCX", "FDS", "FDX", "FE", "FFIV", "FI", "FICO", "FIS",
-    "FITB", "FLT", "FMC", "FOX", "FOXA", "FRT", "FSLR", "FTV",
-    # S&P 500 (G)
-    "GD", "GE", "GEN", "GIS", "GL", "GLW", "GM", "GNRC",
-    "GPC", "GPN", "GRMN", "GS", "GWW",
-    # S&P 500 (H)
-    "HAL", "HAS", "HBAN", "HCA", "HD", "HES", "HIG", "HII", "HLT", "HOLX",
-    "HPE", "HPQ", "HRL", "HSIC", "HST", "HSY", "HUBB", "HUM", "HWM",
-    # S&P 500 (I)
-    "IBM", "ICE", "IEX", "IFF", "INCY", "INVH",
-    "IP", "IPG", "IQV", "IR", "IRM", "IT", "ITW", "IVZ",
-    # S&P 500 (J)
-    "J", "JBHT", "JCI", "JKHY", "JNJ", "JNPR", "JPM",
-    # S&P 500 (K)
-    "K", "KEY", "KEYS", "KIM", "KMB", "KMI", "KMX", "KO", "KR",
-    # S&P 500 (L)
-    "L", "LDOS", "LEN", "LH", "LHX", "LKQ", "LLY", "LMT", "LNC", "LNT",
-    "LOW", "LUV", "LVS", "LW", "LYB", "LYV",
-    # S&P 500 (M)
-    "MA", "MAA", "MAS", "MCD", "MCK", "MCO", "MDT", "MET",
-    "MGM", "MHK", "MKC", "MKTX", "MLM", "MMC", "MMM", "MO", "MOH",
-    "MOS", "MPC", "MPWR", "MRK", "MRNA", "MRO", "MS", "MSCI", "MSI", "MTB",
-    "MTCH", "MTD",
-    # S&P 500 (N)
-    "NCLH", "NDAQ", "NDSN", "NEE", "NEM", "NI", "NKE", "NOC", "NOW", "NRG",
-    "NSC", "NTAP", "NTRS", "NUE", "NVR", "NWL", "NWS", "NWSA",
-    # S&P 500 (O)
-    "O", "OGN", "OKE", "OMC", "OXY",
-    # S&P 500 (P)
-    "PARA", "PAYC", "PCG", "PEAK", "PEG", "PFE",
-    "PFG", "PG", "PGR", "PH", "PHM", "PKG", "PKI", "PLD", "PM", "PNC", "PNR",
-    "PNW", "POOL", "PPG", "PPL", "PRU", "PSA", "PSX", "PTC", "PWR", "PXD",
-    # S&P 500 (Q)
-    "QRVO",
-    # S&P 500 (R)
-    "RCL", "REG", "RF", "RHI", "RJF", "RL", "RMD", "ROK", "ROL",
-    "RSG", "RTX",
-    # S&P 500 (S)
-    "SBAC", "SCHW", "SHW", "SJM", "SLB", "SNA", "SO", "SPG",
-    "SPGI", "SRE", "STE", "STLD", "STT", "STX", "STZ", "SWK", "SWKS", "SYF",
-    "SYK", "SYY",
-    # S&P 500 (T)
-    "T", "TAP", "TDG", "TDY", "TECH", "TEL", "TER", "TFC", "TFX", "TGT", "TJX",
-    "TMO", "TPR", "TRGP", "TRMB", "TROW", "TRV", "TSCO", "TSN",
-    "TT", "TXT", "TYL",
-    # S&P 500 (U)
-    "UAL", "UDR", "UHS", "ULTA", "UNH", "UNP", "UPS", "URI", "USB",
-    # S&P 500 (V)
-    "V", "VFC", "VICI", "VLO", "VMC", "VRSN", "VTR", "VTRS", "VZ",
-    # S&P 500 (W)
-    "WAB", "WAT", "WBA", "WDC", "WEC", "WELL", "WFC", "WHR", "WM", "WMB",
-    "WMT", "WRB", "WRK", "WST", "WTW", "WY", "WYNN",
-    # S&P 500 (X-Z)
-    "XOM", "XRAY", "XYL", "YUM", "ZBH", "ZBRA", "ZION", "ZTS",
-    # 인기 성장주 추가
-    "PLTR", "COIN", "MSTR", "SMCI", "ARM", "RKLB", "IONQ", "RIVN", "LCID", "NIO",
-    "SOFI", "AFRM", "UPST", "HOOD", "DKNG", "ROKU", "SNAP", "PINS", "SQ", "SHOP",
-    "SNOW", "NET", "OKTA", "TWLO", "DOCU", "ZM", "U", "PATH", "MDB", "BILL"
-]
-
-# 중복 제거
-TICKERS = list(set(TICKERS))
-
-
-def get_date_ranges():
-    """기간별 시작 날짜 계산"""
-    today = datetime.now()
-    return {
-        "1W": today - timedelta(days=7),
-        "1M": today - timedelta(days=30),
-        "3M": today - timedelta(days=90),
-        "12M": today - timedelta(days=365),
-        "YTD": datetime(today.year, 1, 1),
+
+import numpy as np
+import pandas as pd
+
+from performance import get_date_ranges, history_start, calculate_performance_matrix, performance_dict
+from risk import calculate_risk_matrix, risk_dict
+from ranges import INDEX_PATH, LogReturnIndex
+from price_cache import CACHE_DIR as PRICE_CACHE_DIR, save_prices
+from price_store import STORE_PATH, load_store, manifest_path, save_store, plan_downloads, find_revised, merge_store
+from checkpoint import CHECKPOINT_DIR, Checkpoint, run_key
+from downloader import CHUNK_SIZE, MAX_WORKERS as DOWNLOAD_WORKERS, download_closes
+from metrics import Metrics
+from sources import get_source
+from stock_info import CACHE_PATH, CLASSIFY_FIELDS, fetch_stock_info, refresh_cache
+from stocks_schema import StocksWriter, encode_prices
+from universe import DEFAULT_UNIVERSE, load_universe
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+METRICS_NAME = "fetch_metrics.json"
+
+
+def encoded_prices(close_data, symbol):
+    start, prices = encode_prices(close_data[symbol].to_numpy(dtype=float))
+    return {"start": start, "prices": prices}
+
+
+def process_spy(close_data, perf_matrix, risk_matrix=None):
+    """SPY 항목 (계산 불가 기간은 None)"""
+    spy_performance = {
+        period: (None if np.isnan(v) else float(v))
+        for period, v in perf_matrix["SPY"].items()
     }
+    spy = {**encoded_prices(close_data, "SPY"), "performance": spy_performance}
+    if risk_matrix is not None:
+        spy["risk"] = risk_dict(risk_matrix, "SPY")
+    return spy
 
 
-def calculate_performance(prices, start_date):
-    """수익률 계산"""
-    if prices is None or len(prices) < 2:
-        return None
-    
-    start_str = start_date.strftime("%Y-%m-%d")
-    
-    # 시작 날짜에 가장 가까운 데이터 찾기
-    start_price = None
-    for p in prices:
-        if p["date"] >= start_str:
-            start_price = p["price"]
-            break
-    
-    if not start_price:
-        return None
-    
-    end_price = prices[-1]["price"]
-    return round((end_price - start_price) / start_price * 100, 2)
+def iter_stocks(close_data, tickers, perf_matrix, skipped=None, risk_matrix=None):
+    """
+    종가 행렬(소수 2자리) → 종목 항목을 하나씩 생성
+    - 데이터가 없거나 10거래일 미만, 계산 가능한 기간이 없는 종목은 제외 (skipped 에 추가)
+    - risk_matrix 를 주면 위험/상대강도 지표(risk) 포함
+    """
+    columns = set(close_data.columns)
+    valid_counts = close_data.count()
+    skipped = skipped if skipped is not None else []
+
+    for symbol in tickers:
+        if symbol not in columns or valid_counts[symbol] < 10:
+            skipped.append(symbol)
+            continue
+
+        # 기간별 성과
+        performance = performance_dict(perf_matrix, symbol)
+        if not performance:
+            skipped.append(symbol)
+            continue
+
+        entry = {
+            "symbol": symbol,
+            **encoded_prices(close_data, symbol),
+            "performance": performance
+        }
+        if risk_matrix is not None:
+            entry["risk"] = risk_dict(risk_matrix, symbol)
+        yield entry
+
+
+def select_top_symbols(performances, spy_performance, periods, top_n=30):
+    """
+    기간별 SPY 대비 상위 top_n 종목 합집합 (performances: {symbol: {기간: 수익률}})
+    전체 정렬 대신 상위 top_n 만 선택 (동점은 먼저 처리된 종목 우선)
+    실행마다 같은 순서 (기간 순 → 순위 순) → 종목 정보/메타 파일이 불필요하게 바뀌지 않음
+    """
+    top_symbols = {}
+    for period in periods:
+        spy_perf = spy_performance.get(period, 0) or 0
+        top_symbols.update(dict.fromkeys(heapq.nlargest(
+            top_n,
+            (symbol for symbol, perf in performances.items() if period in perf),
+            key=lambda symbol: performances[symbol][period] - spy_perf,
+        )))
+    return list(top_symbols)
+
 
+def write_output(output_path, close_data, spy, stocks, stock_names, stock_info):
+    """stocks.json 한 번에 저장 (stocks 는 종목 항목 이터러블)"""
+    writer = StocksWriter(output_path)
+    writer.write_header(datetime.now().strftime("%Y-%m-%d %H:%M"),
+                        close_data.index.strftime("%Y-%m-%d"), spy)
+    for entry in stocks:
+        writer.write_stock(entry)
+    writer.finish(stock_names, stock_info)
+
+
+def update_prices(source, all_symbols, start_date, store_path, stage,
+                  chunk_size=CHUNK_SIZE, workers=DOWNLOAD_WORKERS, checkpoint=None):
+    """로컬 저장소 이후 구간만 다운로드해서 저장소 갱신 → 종가 행렬 (stage 에 지표 기록)"""
+    store = load_store(store_path)
+    plan = plan_downloads(store, all_symbols, start_date)
+
+    print(f"\n📡 {len(all_symbols)}개 종목 데이터 다운로드 중...")
+    print(f"  (저장소 {len(store.columns)}개 종목, 요청 {len(plan)}건)")
+
+    fetched = []
+    refetch = []
+    download_stats = []
+    for gap_start, symbols in sorted(plan.items()):
+        gap_close, stats = download_closes(source, symbols, gap_start, datetime.now(),
+                                           chunk_size=chunk_size, workers=workers, checkpoint=checkpoint)
+        fetched.append(gap_close)
+        download_stats.append(stats)
+        print(f"  {gap_start.strftime('%Y-%m-%d')}~: {len(symbols)}개 종목 ({stats['chunks']}개 청크)")
+
+        # 분할/배당 재조정으로 과거 종가가 바뀐 종목은 전체 구간 재다운로드
+        if gap_start > pd.Timestamp(start_date).normalize():
+            refetch.extend(find_revised(store, gap_close, gap_start))
+
+    if refetch:
+        print(f"  🔁 과거 종가 재조정 {len(refetch)}개 종목 전체 재다운로드")
+        store = store.drop(columns=refetch)
+        refetch_close, stats = download_closes(source, refetch, start_date, datetime.now(),
+                                               chunk_size=chunk_size, workers=workers, checkpoint=checkpoint)
+        fetched.append(refetch_close)
+        download_stats.append(stats)
+
+    fetched = [f for f in fetched if not f.empty]
+    new_close = pd.concat(fetched, axis=1) if fetched else pd.DataFrame()
+    new_close = new_close.loc[:, ~new_close.columns.duplicated(keep="last")]
+    # 저장 전에 stocks.json 과 같은 반올림 (%.2f 출력은 x.xx5 경계에서 round(2) 와 0.01 다를 수 있음)
+    close_data = merge_store(store, new_close, all_symbols, start_date).round(2)
+    if "SPY" not in close_data.columns:
+        raise RuntimeError("SPY 종가 없음")
+    segments = save_store(close_data, store_path)
+
+    stage["items"] = len(all_symbols)
+    stage["requests"] = sum(s["chunks"] for s in download_stats)
+    stage["retries"] = sum(s["retries"] for s in download_stats)
+    stage["failedChunks"] = sum(s["failedChunks"] for s in download_stats)
+    stage["reconciled"] = sum(s["reconciled"] for s in download_stats)
+    stage["resumedChunks"] = sum(s["resumed"] for s in download_stats)
+    stage["revised"] = len(refetch)
+    stage["rows"] = len(close_data)
+    stage["segmentsWritten"] = segments
+    stage["missing"] = [s for s in all_symbols if s not in close_data.columns]
+    return close_data
+
+
+def main(source=None, data_dir=DATA_DIR, chunk_size=CHUNK_SIZE, workers=DOWNLOAD_WORKERS, resume=True,
+         universe=DEFAULT_UNIVERSE):
+    source = source or get_source("yfinance")
+    data_dir = Path(data_dir)
+    tickers = source.universe() or load_universe(universe)
+    metrics = Metrics("fetch_data", data_dir / METRICS_NAME)
+    metrics.set("source", source.name)
+    metrics.set("tickers", len(tickers))
 
-def main():
     print("=" * 60)
     print("🚀 SPY 대비 상위 종목 데이터 수집 시작")
     print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"📊 총 {len(TICKERS)}개 종목")
+    print(f"📊 총 {len(tickers)}개 종목 (소스: {source.name})")
     print("=" * 60)
     
     date_ranges = get_date_ranges()
     
     # 가장 긴 기간(12M) 기준으로 데이터 시작점 설정
-    start_date = date_ranges["12M"] - timedelta(days=10)
-    
-    # SPY + 모든 종목 한번에 다운로드
-    all_symbols = ["SPY"] + TICKERS
-    
-    print(f"\n📡 {len(all_symbols)}개 종목 데이터 다운로드 중...")
-    print("  (약 2-5분 소요)")
+    start_date = history_start(date_ranges)
     
+    # SPY + 모든 종목: 로컬 저장소 이후 구간만 다운로드
+    all_symbols = ["SPY"] + tickers
+    store_path = data_dir / STORE_PATH.name
+
+    # 같은 날 같은 종목 목록으로 중단된 실행이 있으면 이어서 진행
+    checkpoint = None
+    if resume:
+        checkpoint = Checkpoint(run_key(source.name, all_symbols), data_dir / CHECKPOINT_DIR.name)
+        if checkpoint.resumed:
+            print(f"♻️  체크포인트 발견: {', '.join(checkpoint.state['stages']) or '다운로드 청크'} 재사용")
+
     try:
-        data = yf.download(all_symbols, start=start_date, end=datetime.now(), progress=True, threads=True)
-        close_data = data["Close"]
+        with metrics.stage("download") as stage:
+            if checkpoint and checkpoint.done("download"):
+                close_data = checkpoint.load_frame("close.csv")
+                stage["resumed"] = True
+                print(f"\n♻️  체크포인트에서 종가 복원 ({len(close_data.columns)}개 종목)")
+            else:
+                close_data = update_prices(source, all_symbols, start_date, store_path, stage,
+                                           chunk_size, workers, checkpoint)
+                metrics.add_bytes(*(store_path / name for name in stage["segmentsWritten"]),
+                                  manifest_path(store_path))
+                if checkpoint:
+                    checkpoint.save_frame("close.csv", close_data)
+                    checkpoint.complete("download")
     except Exception as e:
         print(f"❌ 다운로드 오류: {e}")
-        return
-    
+        metrics.finish("download_failed")
+        return 1
+
     print(f"\n✅ 다운로드 완료")
-    
-    # SPY 데이터 추출
-    print("\n📈 SPY 데이터 처리 중...")
-    spy_prices = []
-    spy_series = close_data["SPY"].dropna()
-    for date, price in spy_series.items():
-        spy_prices.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "price": round(float(price), 2)
-        })
-    
-    spy_performance = {}
-    for period, period_start in date_ranges.items():
-        spy_performance[period] = calculate_performance(spy_prices, period_start)
-    
-    print(f"  SPY YTD: {spy_performance.get('YTD', 'N/A')}%")
-    
-    # 개별 종목 데이터 처리
-    print(f"\n📊 개별 종목 처리 중...")
-    all_stocks = []
-    stock_names = {}
-    
-    for symbol in TICKERS:
-        try:
-            if symbol not in close_data.columns:
-                continue
-                
-            series = close_data[symbol].dropna()
-            if len(series) < 10:
-                continue
-            
-            prices = []
-            for date, price in series.items():
-                prices.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "price": round(float(price), 2)
-                })
-            
-            # 기간별 성과 계산
-            performance = {}
-            for period, period_start in date_ranges.items():
-                perf = calculate_performance(prices, period_start)
-                if perf is not None:
-                    performance[period] = perf
-            
-            if not performance:
-                continue
-            
-            all_stocks.append({
-                "symbol": symbol,
-                "prices": prices,
-                "performance": performance
+    close_data = close_data.round(2)
+
+    # 종목 항목은 처리하는 대로 stocks.json 임시 파일에 기록, 메모리에는 수익률만 유지
+    output_path = data_dir / "stocks.json"
+    partial_path = checkpoint.path / "stocks.json.partial" if checkpoint else None
+
+    # 이어 쓰기는 종목까지 기록된 partial 이 남아 있을 때만
+    # (finish 후에는 partial 이 stocks.json 으로 옮겨져 있음 → "written" 단계로 구분)
+    resume_stocks = bool(checkpoint and checkpoint.done("stocks"))
+    written = resume_stocks and checkpoint.done("written") and output_path.exists()
+    if resume_stocks and not written and not partial_path.exists():
+        print("\n⚠️  체크포인트에 stocks.json.partial 없음 → 종목 다시 계산")
+        resume_stocks = False
+
+    if resume_stocks:
+        saved = checkpoint.load_json("ranking.json")
+        spy_performance, performances = saved["spyPerformance"], saved["performances"]
+        top_symbols = saved["topSymbols"]
+        metrics.set("resumedStocks", len(performances))
+        print(f"\n♻️  체크포인트에서 {len(performances)}개 종목 복원")
+    else:
+        # 전체 종목 × 기간 수익률 한번에 계산
+        with metrics.stage("performance") as stage:
+            perf_matrix = calculate_performance_matrix(close_data, date_ranges)
+            stage["items"] = perf_matrix.size
+
+        # 베타/변동성/최대 낙폭/샤프/상대강도 (일간 수익률 행렬 한 번으로 전체 종목)
+        with metrics.stage("risk") as stage:
+            risk_matrix = calculate_risk_matrix(close_data)
+            stage["items"] = risk_matrix.size
+
+        # SPY 데이터 추출
+        print("\n📈 SPY 데이터 처리 중...")
+        with metrics.stage("spy") as stage:
+            spy = process_spy(close_data, perf_matrix, risk_matrix)
+            stage["items"] = len(spy["prices"])
+        spy_performance = spy["performance"]
+
+        print(f"  SPY YTD: {spy_performance.get('YTD', 'N/A')}%")
+
+        # 개별 종목 데이터 처리
+        print(f"\n📊 개별 종목 처리 중...")
+        with metrics.stage("stocks") as stage:
+            # 종목 배열까지 기록하고 닫음 (오류 시에도 파일 핸들을 남기지 않음)
+            writer = StocksWriter(output_path, partial_path)
+            skipped = []
+            performances = {}
+            try:
+                writer.write_header(datetime.now().strftime("%Y-%m-%d %H:%M"),
+                                    close_data.index.strftime("%Y-%m-%d"), spy)
+                for entry in iter_stocks(close_data, tickers, perf_matrix, skipped, risk_matrix):
+                    writer.write_stock(entry)
+                    performances[entry["symbol"]] = entry["performance"]
+            except BaseException:
+                writer.abort()
+                raise
+            writer.close()
+            stage["items"] = len(performances)
+            stage["skipped"] = skipped
+
+        print(f"  ✅ {len(performances)}개 종목 처리 완료 (제외 {len(skipped)}개)")
+
+        # 종목 이름 가져오기 (기간별 상위 30개 종목만)
+        print("\n📝 종목 이름 수집 중...")
+        with metrics.stage("ranking") as stage:
+            top_symbols = select_top_symbols(performances, spy_performance, date_ranges.keys())
+            stage["items"] = len(top_symbols)
+
+        if checkpoint:
+            checkpoint.save_json("ranking.json", {
+                "spyPerformance": spy_performance, "performances": performances,
+                "topSymbols": top_symbols,
             })
-            
-        except Exception as e:
-            continue
-    
-    print(f"  ✅ {len(all_stocks)}개 종목 처리 완료")
-    
-    # 종목 이름 가져오기 (상위 종목만)
-    print("\n📝 종목 이름 수집 중...")
-    
-    # 각 기간별 상위 30개 종목 선정
-    top_symbols = set()
-    for period in date_ranges.keys():
-        spy_perf = spy_performance.get(period, 0) or 0
-        sorted_stocks = sorted(
-            [s for s in all_stocks if period in s["performance"]],
-            key=lambda x: x["performance"][period] - spy_perf,
-            reverse=True
-        )[:30]
-        for stock in sorted_stocks:
-            top_symbols.add(stock["symbol"])
-    
-    # 종목 정보 가져오기
-    stock_info = {}
-    for symbol in top_symbols:
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            name = info.get('shortName', info.get('longName', symbol))
-            stock_names[symbol] = name
-            
-            # 섹터 한국어 변환
-            sector_map = {
-                'Technology': '기술',
-                'Healthcare': '헬스케어',
-                'Financial Services': '금융',
-                'Consumer Cyclical': '경기소비재',
-                'Consumer Defensive': '필수소비재',
-                'Communication Services': '커뮤니케이션',
-                'Industrials': '산업재',
-                'Energy': '에너지',
-                'Utilities': '유틸리티',
-                'Real Estate': '부동산',
-                'Basic Materials': '소재'
-            }
-            sector_en = info.get('sector', 'N/A')
-            sector_kr = sector_map.get(sector_en, sector_en)
-            
-            # 시가총액 포맷
-            market_cap = info.get('marketCap', 0)
-            if market_cap >= 1e12:
-                market_cap_str = f"${market_cap/1e12:.2f}T"
-            elif market_cap >= 1e9:
-                market_cap_str = f"${market_cap/1e9:.2f}B"
-            elif market_cap >= 1e6:
-                market_cap_str = f"${market_cap/1e6:.2f}M"
-            else:
-                market_cap_str = "N/A"
-            
-            stock_info[symbol] = {
-                "name": name,
-                "sector": sector_kr,
-                "sectorEn": sector_en,
-                "marketCap": market_cap_str,
-                "price": round(info.get('currentPrice', info.get('regularMarketPrice', 0)) or 0, 2),
-                "high52w": round(info.get('fiftyTwoWeekHigh', 0) or 0, 2),
-                "low52w": round(info.get('fiftyTwoWeekLow', 0) or 0, 2),
-                "per": round(info.get('trailingPE', 0) or 0, 2),
-                "pbr": round(info.get('priceToBook', 0) or 0, 2),
-                "description": (info.get('longBusinessSummary', '') or '')[:200]
-            }
-            
-            time.sleep(0.15)
-        except Exception as e:
-            stock_names[symbol] = symbol
-            stock_info[symbol] = {"name": symbol}
-    
-    print(f"  ✅ {len(stock_info)}개 종목 정보 수집 완료")
-    
-    # 결과 저장
-    output = {
-        "lastUpdated": datetime.now().strftime("%Y-%m-%d %H:%M"),
-        "spy": {
-            "prices": spy_prices,
-            "performance": spy_performance
-        },
-        "stocks": all_stocks,
-        "stockNames": stock_names,
-        "stockInfo": stock_info
-    }
-    
-    output_path = Path(__file__).parent.parent / "data" / "stocks.json"
-    output_path.parent.mkdir(exist_ok=True)
-    
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False)
+            checkpoint.complete("stocks")
+
+    if written:
+        print("\n♻️  stocks.json 은 이미 기록됨 (체크포인트) → 순위 인덱스/종가 캐시만 다시 작성")
+    else:
+        cache_path = data_dir / CACHE_PATH.name
+
+        # 전체 종목 이름/섹터 (이름/섹터가 만료된 종목만 요청, 실패해도 계속 진행)
+        with metrics.stage("classify") as stage:
+            _, stats = refresh_cache(tickers, source.info, cache_path, fields=CLASSIFY_FIELDS,
+                                     rate=source.max_rate)
+            stage["items"] = len(tickers)
+            stage.update(stats)
+
+        print(f"\n🏷️  이름/섹터 캐시 갱신 {stats['requested']}건 (실패 {len(stats['failed'])}건)")
+
+        # 종목 정보 가져오기 (캐시 만료 종목만 동시 요청, 가격 필드는 종가로 계산)
+        with metrics.stage("info") as stage:
+            stock_names, stock_info, stats = fetch_stock_info(
+                top_symbols, source.info, close_data, cache_path=cache_path, rate=source.max_rate
+            )
+            stage["items"] = len(stock_info)
+            stage.update(stats)
+            metrics.add_bytes(cache_path)
+
+        print(f"  ✅ {len(stock_info)}개 종목 정보 수집 완료 (요청 {stats['requested']}건, 나머지 캐시)")
+
+    # 결과 저장 (종목 이름/정보를 붙이고 임시 파일 → stocks.json)
+    with metrics.stage("write") as stage:
+        if not written:
+            writer = StocksWriter(output_path, partial_path, append=True)
+            try:
+                writer.finish(stock_names, stock_info)
+            except BaseException:
+                writer.abort()
+                raise
+            # partial 은 stocks.json 으로 옮겨짐 → 이후 단계에서 중단되면 다음 실행은 이어 쓰지 않음
+            if checkpoint:
+                checkpoint.complete("written")
+        stage["items"] = len(performances)
+        stage["bytes"] = output_path.stat().st_size
+        metrics.add_bytes(output_path)
+
+        # 임의 기간 순위용 누적 로그 수익률 인덱스 (scripts/ranges.py)
+        index_path = data_dir / INDEX_PATH.name
+        LogReturnIndex.from_close(close_data).save(index_path)
+        metrics.add_bytes(index_path)
+
+        # 메모리 맵 종가 캐시 (generate_html 외 분석/리포트용)
+        metrics.add_bytes(*save_prices(close_data, data_dir / PRICE_CACHE_DIR.name))
+
+    if checkpoint:
+        checkpoint.clear()
+    metrics.finish()
     
     print("\n" + "=" * 60)
-    print(f"✅ 완료!")
+    print(f"✅ 완료! ({metrics.to_dict()['totalSeconds']:.1f}초)")
     print(f"📁 {output_path}")
+    print(f"📈 {metrics.path}")
     print("=" * 60)
     
     # YTD 상위 10개 출력
     spy_ytd = spy_performance.get("YTD", 0) or 0
     print(f"\n📊 YTD 상위 10개 (SPY: {spy_ytd}%):")
-    sorted_ytd = sorted(
-        [s for s in all_stocks if "YTD" in s["performance"]],
-        key=lambda x: x["performance"]["YTD"] - spy_ytd,
-        reverse=True
-    )[:10]
+    sorted_ytd = heapq.nlargest(
+        10,
+        (symbol for symbol, perf in performances.items() if "YTD" in perf),
+        key=lambda symbol: performances[symbol]["YTD"] - spy_ytd,
+    )
     
-    for i, stock in enumerate(sorted_ytd, 1):
-        perf = stock["performance"]["YTD"]
+    for i, symbol in enumerate(sorted_ytd, 1):
+        perf = performances[symbol]["YTD"]
         vs_spy = perf - spy_ytd
-        name = stock_names.get(stock["symbol"], stock["symbol"])
-        print(f"  {i:2}. {stock['symbol']:6} {perf:+7.2f}% (SPY 대비 {vs_spy:+.2f}%)")
+        print(f"  {i:2}. {symbol:6} {perf:+7.2f}% (SPY 대비 {vs_spy:+.2f}%)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SPY 대비 성과 데이터 수집")
+    parser.add_argument("--source", default="yfinance", choices=["yfinance", "synthetic", "fixture"],
+                        help="가격/메타데이터 소스 (기본: yfinance)")
+    parser.add_argument("--universe", default=",".join(DEFAULT_UNIVERSE),
+                        help="종목 목록 (universes/ 아래 이름 또는 파일 경로, 쉼표로 병합)")
+    parser.add_argument("--tickers", type=int, help="synthetic: 합성 종목 수 (생략 시 기본 티커 목록)")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic: 난수 시드")
+    parser.add_argument("--fixture", help="fixture: closes.csv / info.json 디렉터리")
+    parser.add_argument("--record", help="소스 응답을 fixture 로 기록할 디렉터리")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="다운로드 청크당 종목 수")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS,
+                        help="청크 처리 스레드 수 (yfinance 는 요청이 한 번에 한 청크씩 → 체크포인트 복원/재시도 대기만 겹침)")
+    parser.add_argument("--no-resume", action="store_true", help="체크포인트 무시하고 처음부터 실행")
+    parser.add_argument("--data-dir", default=DATA_DIR, type=Path, help="출력/저장소 디렉터리 (기본: data/)")
+    parser.add_argument("--watch", action="store_true", help="장중 감시 모드 (--interval 초마다 최신 시세 반영)")
+    parser.add_argument("--interval", type=float, default=60, help="감시 모드: 시세 요청 간격 (초)")
+    parser.add_argument("--ticks", type=int, help="감시 모드: 이 횟수만큼 돌고 종료 (기본: Ctrl+C 까지)")
+    parser.add_argument("--out-dir", type=Path, help="감시 모드: 페이지 루트 (기본: 저장소 루트)")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    source = get_source(args.source, n_tickers=args.tickers, seed=args.seed,
+                        fixture=args.fixture, record=args.record)
+    if args.watch:
+        from watch import ROOT, watch
+        watch(source, source.universe() or load_universe(args.universe), args.data_dir,
+              out_dir=args.out_dir or ROOT, interval=args.interval, chunk_size=args.chunk_size,
+              workers=args.workers, ticks=args.ticks)
+        sys.exit(0)
+    # 다운로드 실패 시 main 이 1 반환 → 종료 코드로 전달 (워크플로 단계 실패)
+    sys.exit(main(
+        source=source,
+        data_dir=args.data_dir,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        resume=not args.no_resume,
+        universe=args.universe,
+    ))
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+텍스트 파일 쓰기 공용 함수
+- write_atomic: 임시 파일 → rename (중간에 끊겨도 반쯤 쓴 파일이 남지 않음)
+- write_if_changed: 내용이 같으면 쓰지 않음 (mtime/커밋 변경 없음), 쓸 때는 write_atomic
+"""
+
+import os
+from pathlib import Path
+
+
+def write_atomic(path, text):
+    """임시 파일에 쓰고 rename"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_if_changed(path, text, written=None):
+    """내용이 바뀐 경우에만 쓰기 (바뀌었으면 True, written 리스트에 경로 추가)"""
+    path = Path(path)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    write_atomic(path, text)
+    if written is not None:
+        written.append(path)
+    return True
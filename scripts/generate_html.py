@@ -1,846 +1,328 @@
 #!/usr/bin/env python3
 """
 JSON 데이터를 읽어서 대시보드 HTML 생성
+- HTML 은 데이터가 없는 고정 셸 (내용이 같으면 다시 쓰지 않음 → 장기 캐시 가능)
+- 셸/스타일/스크립트 원본은 templates/ (index.html, app.css, app.js)
+  CSS/JS 는 assets/static/app.<hash>.css|js 로 복사, 셸에는 그 경로만 넣음
+  (템플릿이 바뀌지 않으면 HTML/CSS/JS 모두 그대로 → 재방문 시 데이터 파일만 새로 받음)
+- 데이터는 assets/data/ 아래 내용 해시 파일로 분리, 페이지가 필요할 때 fetch
+  manifest.json (매번 재검증) → meta.<hash>.json, period-<기간>.<hash>.json
+- 기간별 상위 20 종목 순위와 기간 시작 기준 수익률 시리즈는 빌드 시 미리 계산
+- stocks.json 은 종목 단위로 한 번만 훑음 (기간별 상위 후보만 메모리에 유지)
+- 모든 결과물(HTML, 데이터, 정적 파일)은 .gz / .br 압축본도 같이 생성 (compress.py, --no-compress 로 끔)
+- 긴 기간 차트 시리즈는 공유 날짜 LTTB 로 최대 --max-points 개까지 다운샘플링
+- --binary: 종가 행렬을 Float32 바이너리(prices.<hash>.f32 + 헤더 JSON, price_matrix.py)로도 작성
+  기간 파일에는 시리즈 대신 행렬 열 번호(index)만 넣고 페이지가 typed array 로 직접 계산
+  (감시 모드는 오늘 행을 live.<hash>.json 으로 따로 작성, 페이지가 행렬 뒤에 붙임 — watch.py)
 """
 
+import argparse
+import hashlib
+import heapq
 import json
+import warnings
+from bisect import bisect_left
 from pathlib import Path
-
-def generate_html():
-    # 데이터 로드
-    data_path = Path(__file__).parent.parent / "data" / "stocks.json"
-    
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    last_updated = data["lastUpdated"]
-    spy_json = json.dumps(data["spy"], ensure_ascii=False)
-    stocks_json = json.dumps(data["stocks"], ensure_ascii=False)
-    stock_names_json = json.dumps(data["stockNames"], ensure_ascii=False)
-    stock_info_json = json.dumps(data.get("stockInfo", {}), ensure_ascii=False)
-    
-    html = f'''<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
-    <title>SPY 대비 상위 종목</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns"></script>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;600;700&family=Noto+Sans+KR:wght@400;500;700;900&display=swap" rel="stylesheet">
-    <script src="https://t1.kakaocdn.net/kakao_js_sdk/2.7.4/kakao.min.js"></script>
-    <style>
-        :root {{
-            --bg: #000000;
-            --surface: #0a0a0a;
-            --surface2: #111111;
-            --border: #1a1a1a;
-            --border-hover: #2a2a2a;
-            --text: #e4e4e7;
-            --text-dim: #71717a;
-            --text-muted: #52525b;
-            --green: #22c55e;
-            --red: #ef4444;
-            --cyan: #22d3ee;
-            --blue: #4a90ff;
-            --gold: #ffd644;
-            --mono: 'JetBrains Mono', monospace;
-            --sans: 'Noto Sans KR', -apple-system, sans-serif;
-            --radius: 12px;
-            --radius-sm: 8px;
-        }}
-
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        html {{ scrollbar-width: none; }}
-        html::-webkit-scrollbar {{ display: none; }}
-        html, body {{
-            height: 100%;
-            overflow: auto;               /* 🔧 스크롤 허용: info card 공간 확보 */
-            -webkit-text-size-adjust: 100%;
-            -ms-text-size-adjust: 100%;
-        }}
-        body {{
-            background: var(--bg);
-            color: var(--text);
-            font-family: var(--sans);
-            padding: 0;
-            -webkit-overflow-scrolling: touch;
-            -webkit-font-smoothing: antialiased;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            width: 100%;
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        /* ====== HEADER ====== */
-        .header {{
-            padding: 20px 20px 14px;
-            text-align: center;
-            border-bottom: 1px solid var(--border);
-            flex-shrink: 0;
-        }}
-        .header h1 {{
-            font-size: clamp(18px, 4vw, 28px);
-            font-weight: 800;
-            color: #fff;
-            letter-spacing: -0.02em;
-            margin-bottom: 4px;
-        }}
-        .sub {{ font-size: 12px; color: var(--text-dim); }}
-        .time {{ font-family: var(--mono); font-size: 10px; color: var(--text-muted); margin-top: 6px; }}
-
-        /* ====== SHARE ====== */
-        .share-bar {{ display: flex; gap: 5px; justify-content: center; margin: 10px 0 2px; flex-wrap: wrap; flex-shrink: 0; }}
-        .share-btn {{ display: flex; align-items: center; gap: 4px; padding: 5px 10px; border-radius: 6px; border: 1px solid var(--border-hover); background: var(--surface); color: #a1a1aa; font-size: 10px; cursor: pointer; font-family: var(--sans); transition: all 0.2s; -webkit-tap-highlight-color: transparent; touch-action: manipulation; }}
-        .share-btn:hover {{ border-color: #444; color: var(--text); }}
-        .share-btn svg {{ width: 13px; height: 13px; flex-shrink: 0; }}
-        .share-btn.twitter:hover {{ border-color: #1d9bf0; color: #1d9bf0; }}
-        .share-btn.kakao:hover {{ border-color: #fee500; color: #fee500; }}
-        .share-btn.telegram:hover {{ border-color: #26a5e4; color: #26a5e4; }}
-        .share-btn.instagram:hover {{ border-color: #e1306c; color: #e1306c; }}
-        .share-btn.instagram.copied {{ border-color: var(--green); color: var(--green); }}
-        .share-btn.copy:hover {{ border-color: var(--green); color: var(--green); }}
-        .share-btn.copied {{ border-color: var(--green); color: var(--green); }}
-
-        .toast {{ position: fixed; bottom: 20px; right: 20px; background: var(--green); color: #000; padding: 10px 16px; border-radius: var(--radius-sm); font-size: 13px; font-weight: 600; z-index: 9999; opacity: 0; transform: translateY(10px); transition: all 0.3s ease; pointer-events: none; }}
-        .toast.show {{ opacity: 1; transform: translateY(0); }}
-
-        /* ====== CONTROLS ====== */
-        .controls {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 10px;
-            padding: 10px 16px;
-            flex-wrap: wrap;
-            flex-shrink: 0;
-        }}
-        .spy-info {{
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-            padding: 6px 12px;
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius-sm);
-            font: 13px var(--mono);
-            flex-shrink: 0;
-        }}
-        .spy-label {{ color: var(--text-muted); }}
-        .spy-value {{ font-weight: 600; color: var(--green); }}
-        .spy-value.negative {{ color: var(--red); }}
-
-        .period-buttons {{
-            display: flex;
-            gap: 4px;
-            background: var(--surface);
-            border: 1px solid var(--border);
-            padding: 3px;
-            border-radius: var(--radius-sm);
-            flex-shrink: 0;
-        }}
-        .period-btn {{
-            padding: 6px 12px;
-            border: none;
-            background: transparent;
-            color: var(--text-dim);
-            font: 500 12px var(--sans);
-            cursor: pointer;
-            border-radius: 6px;
-            transition: all 0.2s;
-            -webkit-tap-highlight-color: transparent;
-            touch-action: manipulation;
-        }}
-        .period-btn:hover {{ color: var(--text); }}
-        .period-btn.active {{ background: var(--cyan); color: #000; font-weight: 600; }}
-
-        /* ====== MAIN CONTENT ====== */
-        .main-content {{
-            display: grid;
-            grid-template-columns: 1fr 340px;
-            gap: 12px;
-            flex: 1;
-            min-height: 0;
-            padding: 0 16px;
-        }}
-
-        .left-column {{
-            display: flex;
-            flex-direction: column;
-            min-height: 0;
-        }}
-
-        /* ====== CHART ====== */
-        .chart-container {{
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius);
-            padding: 14px;
-            min-height: 350px;            /* 🔧 차트 최소 높이 보장 */
-            flex: 1;
-            position: relative;
-        }}
-        .chart-container::after {{
-            content: 'Herdvibe.com';
-            position: absolute;
-            top: 50%; left: 50%;
-            transform: translate(-50%, -50%);
-            font: 700 26px var(--mono);
-            color: rgba(255,255,255,0.04);
-            pointer-events: none;
-            z-index: 2;
-            white-space: nowrap;
-        }}
-
-        /* ====== TABLE ====== */
-        .table-container {{
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius);
-            overflow: hidden;
-            display: flex;
-            flex-direction: column;
-            min-height: 0;
-        }}
-        .table-header {{
-            padding: 12px;
-            border-bottom: 1px solid var(--border);
-            flex-shrink: 0;
-        }}
-        .table-title {{ font: 600 13px var(--sans); color: var(--text); }}
-
-        .table-scroll {{
-            overflow-y: auto;
-            flex: 1;
-            -ms-overflow-style: none;
-            scrollbar-width: none;
-        }}
-        .table-scroll::-webkit-scrollbar {{ display: none; }}
-
-        table {{ width: 100%; border-collapse: collapse; }}
-        th {{
-            text-align: left;
-            padding: 8px 10px;
-            font: 600 9px var(--mono);
-            color: var(--text-muted);
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            border-bottom: 1px solid var(--border);
-            position: sticky;
-            top: 0;
-            background: var(--surface);
-        }}
-        td {{
-            padding: 7px 10px;
-            font-size: 11px;
-            border-bottom: 1px solid var(--border);
-        }}
-        tr {{
-            cursor: pointer;
-            transition: all 0.2s;
-            -webkit-tap-highlight-color: transparent;
-        }}
-        @media (hover: hover) {{
-            tr:hover {{ background: var(--surface2); }}
-        }}
-        tr:active {{ background: var(--surface2); }}
-        tr.selected {{ background: rgba(34,211,238,0.08); }}
-        tr.dimmed {{ opacity: 0.4; }}
-
-        .rank {{ color: var(--text-muted); font: 500 11px var(--mono); width: 24px; }}
-        .stock-info {{ display: flex; flex-direction: column; gap: 1px; }}
-        .stock-symbol {{ font: 600 12px var(--mono); }}
-        .stock-name {{ font-size: 9px; color: var(--text-muted); }}
-
-        .perf-value {{ font: 600 11px var(--mono); text-align: right; }}
-        .perf-value.positive {{ color: var(--green); }}
-        .perf-value.negative {{ color: var(--red); }}
-
-        .vs-spy {{ font: 10px var(--mono); text-align: right; }}
-        .vs-spy.positive {{ color: var(--green); }}
-        .vs-spy.negative {{ color: var(--red); }}
-
-        /* ====== LEGEND ====== */
-        .legend {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            margin: 10px 16px;
-            padding: 10px 12px;
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius-sm);
-            font-size: 10px;
-            flex-shrink: 0;
-            justify-content: center;
-            color: var(--text-dim);
-        }}
-        .legend-item {{ display: flex; align-items: center; gap: 4px; }}
-        .legend-dot {{ width: 7px; height: 7px; border-radius: 50%; flex-shrink: 0; }}
-        .legend-spy {{ width: 14px; height: 2px; border-top: 2px dashed var(--text-muted); flex-shrink: 0; }}
-
-        /* ====== STOCK INFO CARD ====== */
-        .stock-info-card {{
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius);
-            padding: 16px;
-            margin-top: 12px;
-            flex-shrink: 0;
-        }}
-        .info-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 12px;
-            gap: 12px;
-        }}
-        .info-title {{ font: 700 16px var(--sans); color: #fff; }}
-        .info-sector {{ font-size: 11px; color: var(--text-dim); margin-top: 2px; }}
-        .info-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(100px, 1fr));
-            gap: 10px;
-            margin-bottom: 12px;
-        }}
-        .info-item {{
-            background: var(--surface2);
-            border: 1px solid var(--border);
-            padding: 10px;
-            border-radius: var(--radius-sm);
-        }}
-        .info-label {{ font: 10px var(--mono); color: var(--text-muted); margin-bottom: 3px; text-transform: uppercase; letter-spacing: 0.05em; }}
-        .info-value {{ font: 600 14px var(--mono); color: var(--text); }}
-        .info-description {{
-            font-size: 12px;
-            color: var(--text-dim);
-            line-height: 1.6;
-            padding-top: 12px;
-            border-top: 1px solid var(--border);
-        }}
-
-        /* ====== FOOTER ====== */
-        .footer {{
-            padding: 8px 16px 16px;
-            text-align: center;
-            font-size: 9px;
-            color: var(--text-muted);
-            flex-shrink: 0;
-        }}
-
-        /* === TABLET === */
-        @media (max-width: 1100px) {{
-            .main-content {{
-                grid-template-columns: 1fr;
-                grid-template-rows: 1fr auto;
-            }}
-            .table-container {{ max-height: 200px; }}
-        }}
-
-        /* === MOBILE === */
-        @media (max-width: 600px) {{
-            html, body {{
-                height: auto;              /* 📱 모바일: 고정 높이 해제 */
-                overflow: auto;            /* 📱 모바일: 스크롤 허용 */
-            }}
-            .container {{
-                height: auto;
-                min-height: 100%;
-            }}
-            .chart-container {{
-                min-height: 300px;         /* 📱 차트 최소 높이 ← 여기서 조절 */
-                height: 45vh;
-            }}
-            .header {{
-                padding: 14px 12px 10px;
-            }}
-            .header h1 {{ font-size: 16px; }}
-            .share-bar {{ gap: 4px; margin: 8px 0 2px; }}
-            .share-btn {{ padding: 4px 8px; font-size: 9px; }}
-            .share-btn svg {{ width: 11px; height: 11px; }}
-            .controls {{
-                padding: 8px 12px;
-                gap: 6px;
-            }}
-            .period-buttons {{
-                width: 100%;
-                justify-content: space-between;
-            }}
-            .period-btn {{
-                flex: 1;
-                padding: 7px 2px;
-                font-size: 11px;
-                text-align: center;
-            }}
-            .spy-info {{ font-size: 11px; padding: 5px 10px; }}
-            .main-content {{
-                grid-template-columns: 1fr;
-                grid-template-rows: auto auto;   /* 📱 자동 높이 */
-                gap: 8px;
-                padding: 0 10px;
-            }}
-            .left-column {{
-                min-height: auto;
-            }}
-            .chart-container {{
-                flex: none;                /* 📱 모바일: flex 해제 */
-                padding: 8px 4px 8px 8px;
-                border-radius: 10px;
-            }}
-            .chart-container::after {{ font-size: 18px; }}
-            .table-container {{
-                max-height: 180px;
-                border-radius: 10px;
-            }}
-            .table-header {{ padding: 10px; }}
-            .table-title {{ font-size: 12px; }}
-            th {{ padding: 6px 8px; font-size: 8px; }}
-            td {{ padding: 6px 8px; font-size: 10px; }}
-            .stock-symbol {{ font-size: 11px; }}
-            .stock-name {{ font-size: 8px; }}
-            .legend {{
-                gap: 6px;
-                padding: 8px 10px;
-                margin: 8px 10px;
-                border-radius: 8px;
-                font-size: 9px;
-            }}
-            .legend-dot {{ width: 6px; height: 6px; }}
-            .stock-info-card {{ margin-top: 8px; padding: 12px; }}
-            .info-grid {{ grid-template-columns: repeat(3, 1fr); gap: 8px; }}
-            .info-value {{ font-size: 12px; }}
-            .info-title {{ font-size: 14px; }}
-            .info-description {{ font-size: 11px; }}
-            .footer {{ padding: 6px 10px 12px; font-size: 8px; }}
-        }}
-
-        /* === 아주 작은 화면 === */
-        @media (max-width: 420px) {{
-            .header {{ padding: 10px 8px 8px; }}
-            .header h1 {{ font-size: 14px; }}
-            .table-container {{ max-height: 150px; }}
-            .legend {{ gap: 4px; padding: 6px 8px; font-size: 8px; }}
-            .info-grid {{ grid-template-columns: repeat(2, 1fr); }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>SPY 대비 상위 종목</h1>
-            <div class="sub">S&P 500 + Nasdaq 100 — SPY 수익률을 초과한 상위 20개 종목</div>
-            <div class="time">마지막 업데이트: {last_updated}</div>
-        </div>
-
-        <div class="share-bar">
-            <button class="share-btn twitter" onclick="shareTwitter()"><svg viewBox="0 0 24 24" fill="currentColor"><path d="M18.244 2.25h3.308l-7.227 8.26 8.502 11.24H16.17l-5.214-6.817L4.99 21.75H1.68l7.73-8.835L1.254 2.25H8.08l4.713 6.231zm-1.161 17.52h1.833L7.084 4.126H5.117z"/></svg>트위터</button>
-            <button class="share-btn kakao" onclick="shareKakao()"><svg viewBox="0 0 24 24" fill="currentColor"><path d="M12 3c-5.52 0-10 3.36-10 7.5 0 2.66 1.74 5 4.36 6.33-.14.53-.9 3.4-.93 3.61 0 0-.02.17.09.23.11.07.24.03.24.03.32-.04 3.7-2.42 4.28-2.83.62.09 1.27.13 1.96.13 5.52 0 10-3.36 10-7.5S17.52 3 12 3z"/></svg>카카오톡</button>
-            <button class="share-btn telegram" onclick="shareTelegram()"><svg viewBox="0 0 24 24" fill="currentColor"><path d="M11.944 0A12 12 0 0 0 0 12a12 12 0 0 0 12 12 12 12 0 0 0 12-12A12 12 0 0 0 12 0a12 12 0 0 0-.056 0zm4.962 7.224c.1-.002.321.023.465.14a.506.506 0 0 1 .171.325c.016.093.036.306.02.472-.18 1.898-.962 6.502-1.36 8.627-.168.9-.499 1.201-.82 1.23-.696.065-1.225-.46-1.9-.902-1.056-.693-1.653-1.124-2.678-1.8-1.185-.78-.417-1.21.258-1.91.177-.184 3.247-2.977 3.307-3.23.007-.032.014-.15-.056-.212s-.174-.041-.249-.024c-.106.024-1.793 1.14-5.061 3.345-.479.33-.913.49-1.302.48-.428-.008-1.252-.241-1.865-.44-.752-.245-1.349-.374-1.297-.789.027-.216.325-.437.893-.663 3.498-1.524 5.83-2.529 6.998-3.014 3.332-1.386 4.025-1.627 4.476-1.635z"/></svg>텔레그램</button>
-            <button class="share-btn instagram" onclick="shareInstagram(this)"><svg viewBox="0 0 24 24" fill="currentColor"><path d="M12 2.163c3.204 0 3.584.012 4.85.07 3.252.148 4.771 1.691 4.919 4.919.058 1.265.069 1.645.069 4.849 0 3.205-.012 3.584-.069 4.849-.149 3.225-1.664 4.771-4.919 4.919-1.266.058-1.644.07-4.85.07-3.204 0-3.584-.012-4.849-.07-3.26-.149-4.771-1.699-4.919-4.92-.058-1.265-.07-1.644-.07-4.849 0-3.204.013-3.583.07-4.849.149-3.227 1.664-4.771 4.919-4.919 1.266-.057 1.645-.069 4.849-.069zM12 0C8.741 0 8.333.014 7.053.072 2.695.272.273 2.69.073 7.052.014 8.333 0 8.741 0 12c0 3.259.014 3.668.072 4.948.2 4.358 2.618 6.78 6.98 6.98C8.333 23.986 8.741 24 12 24c3.259 0 3.668-.014 4.948-.072 4.354-.2 6.782-2.618 6.979-6.98.059-1.28.073-1.689.073-4.948 0-3.259-.014-3.667-.072-4.947-.196-4.354-2.617-6.78-6.979-6.98C15.668.014 15.259 0 12 0zm0 5.838a6.162 6.162 0 100 12.324 6.162 6.162 0 000-12.324zM12 16a4 4 0 110-8 4 4 0 010 8zm6.406-11.845a1.44 1.44 0 100 2.881 1.44 1.44 0 000-2.881z"/></svg>인스타그램</button>
-            <button class="share-btn copy" onclick="copyLink(this)"><svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="9" y="9" width="13" height="13" rx="2" ry="2"/><path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"/></svg>링크복사</button>
-        </div>
-
-        <div class="controls">
-            <div class="spy-info">
-                <span class="spy-label">SPY</span>
-                <span class="spy-value" id="spy-perf">-</span>
-            </div>
-            <div class="period-buttons">
-                <button class="period-btn" data-period="1W">1주</button>
-                <button class="period-btn" data-period="1M">1개월</button>
-                <button class="period-btn" data-period="3M">3개월</button>
-                <button class="period-btn" data-period="12M">1년</button>
-                <button class="period-btn active" data-period="YTD">YTD</button>
-            </div>
-        </div>
-
-        <div class="main-content">
-            <div class="left-column">
-                <div class="chart-container">
-                    <canvas id="perfChart"></canvas>
-                </div>
-                <div class="stock-info-card" id="stock-info-card">
-                    <div class="info-header">
-                        <div>
-                            <div class="info-title" id="info-title">-</div>
-                            <div class="info-sector" id="info-sector">-</div>
-                        </div>
-                    </div>
-                    <div class="info-grid">
-                        <div class="info-item">
-                            <div class="info-label">시가총액</div>
-                            <div class="info-value" id="info-marketcap">-</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">현재가</div>
-                            <div class="info-value" id="info-price">-</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">52주 최고</div>
-                            <div class="info-value" id="info-high52">-</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">52주 최저</div>
-                            <div class="info-value" id="info-low52">-</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">PER</div>
-                            <div class="info-value" id="info-per">-</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">PBR</div>
-                            <div class="info-value" id="info-pbr">-</div>
-                        </div>
-                    </div>
-                    <div class="info-description" id="info-description">-</div>
-                </div>
-            </div>
-            <div class="table-container">
-                <div class="table-header">
-                    <div class="table-title">상위 20 종목</div>
-                </div>
-                <div class="table-scroll">
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>#</th>
-                                <th>종목</th>
-                                <th style="text-align:right">수익률</th>
-                                <th style="text-align:right">vs SPY</th>
-                            </tr>
-                        </thead>
-                        <tbody id="table-body"></tbody>
-                    </table>
-                </div>
-            </div>
-        </div>
-
-        <div class="legend" id="legend"></div>
-
-        <div class="footer">데이터 출처: Yahoo Finance · S&P 500 + Nasdaq 100 기준 · 투자 판단은 본인의 책임입니다</div>
-    </div>
-
-    <div class="toast" id="toast"></div>
-
-    <script>
-        /* ====== SHARE ====== */
-        const SHARE_URL = 'https://herdvibe.com/25';
-        const SHARE_TITLE = 'SPY 대비 상위 종목 — Herdvibe';
-        const SHARE_DESC = 'S&P 500 + Nasdaq 100 SPY 초과 수익 상위 20 종목 | Herdvibe';
-
-        function showToast(msg) {{
-            const t = document.getElementById('toast');
-            t.textContent = msg;
-            t.classList.add('show');
-            setTimeout(() => t.classList.remove('show'), 3000);
-        }}
-        function shareTwitter() {{
-            window.open(`https://twitter.com/intent/tweet?text=${{encodeURIComponent(SHARE_TITLE)}}&url=${{encodeURIComponent(SHARE_URL)}}`, '_blank');
-        }}
-        function shareKakao() {{
-            if (window.Kakao && !Kakao.isInitialized()) Kakao.init('a43ed7b39fac35458f4f9df925a279b5');
-            if (window.Kakao) {{
-                Kakao.Share.sendDefault({{
-                    objectType: 'feed',
-                    content: {{ title: SHARE_TITLE, description: SHARE_DESC, imageUrl: 'https://herdvibe.com/og-spy.png', link: {{ mobileWebUrl: SHARE_URL, webUrl: SHARE_URL }} }}
-                }});
-            }}
-        }}
-        function shareTelegram() {{
-            window.open(`https://t.me/share/url?url=${{encodeURIComponent(SHARE_URL)}}&text=${{encodeURIComponent(SHARE_TITLE)}}`, '_blank');
-        }}
-        function shareInstagram(btn) {{
-            try {{
-                if (window.parent !== window) {{ window.parent.postMessage({{ type: 'copy', text: SHARE_URL }}, '*'); }}
-                else {{ navigator.clipboard.writeText(SHARE_URL); }}
-                const orig = btn.innerHTML;
-                btn.classList.add('copied');
-                btn.innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>복사됨!';
-                showToast('링크가 복사되었습니다 - 인스타그램에 붙여넣기 하세요');
-                setTimeout(() => {{ btn.classList.remove('copied'); btn.innerHTML = orig; }}, 2000);
-            }} catch(e) {{ showToast('복사 실패'); }}
-        }}
-        function copyLink(btn) {{
-            try {{
-                if (window.parent !== window) {{ window.parent.postMessage({{ type: 'copy', text: SHARE_URL }}, '*'); }}
-                else {{ navigator.clipboard.writeText(SHARE_URL); }}
-                const orig = btn.innerHTML;
-                btn.classList.add('copied');
-                btn.innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>복사됨!';
-                showToast('링크가 복사되었습니다');
-                setTimeout(() => {{ btn.classList.remove('copied'); btn.innerHTML = orig; }}, 2000);
-            }} catch(e) {{ showToast('복사 실패'); }}
-        }}
-
-        /* ====== DATA ====== */
-        const SPY_DATA = {spy_json};
-        const STOCKS = {stocks_json};
-        const STOCK_NAMES = {stock_names_json};
-        const STOCK_INFO = {stock_info_json};
-
-        const COLORS = [
-            '#4a90ff', '#ef4444', '#22c55e', '#ffd644', '#a855f7',
-            '#22d3ee', '#ec4899', '#84cc16', '#f97316', '#14b8a6',
-            '#8b5cf6', '#eab308', '#64748b', '#dc2626', '#0891b2',
-            '#c026d3', '#e11d48', '#ea580c', '#16a34a', '#2563eb'
-        ];
-
-        let currentPeriod = 'YTD';
-        let chart = null;
-        let top20 = [];
-        let selectedStock = null;
-
-        function getStartDate(period) {{
-            const now = new Date();
-            switch(period) {{
-                case '1W': return new Date(now - 7 * 24 * 60 * 60 * 1000);
-                case '1M': return new Date(now - 30 * 24 * 60 * 60 * 1000);
-                case '3M': return new Date(now - 90 * 24 * 60 * 60 * 1000);
-                case '12M': return new Date(now - 365 * 24 * 60 * 60 * 1000);
-                case 'YTD': return new Date(now.getFullYear(), 0, 1);
-                default: return new Date(now.getFullYear(), 0, 1);
-            }}
-        }}
-
-        function calculatePercentChange(prices, startDate) {{
-            const startStr = startDate.toISOString().split('T')[0];
-            const filtered = prices.filter(p => p.date >= startStr);
-            if (filtered.length === 0) return [];
-            const basePrice = filtered[0].price;
-            return filtered.map(p => ({{
-                x: p.date,
-                y: ((p.price - basePrice) / basePrice * 100)
-            }}));
-        }}
-
-        function getTop20(period) {{
-            const spyPerf = SPY_DATA.performance[period] || 0;
-            const withVsSpy = STOCKS
-                .filter(s => s.performance && s.performance[period] !== undefined)
-                .map(s => ({{
-                    ...s,
-                    vsSpy: s.performance[period] - spyPerf
-                }}))
-                .sort((a, b) => b.vsSpy - a.vsSpy)
-                .slice(0, 20);
-            return withVsSpy;
-        }}
-
-        function updateChart() {{
-            const startDate = getStartDate(currentPeriod);
-            const datasets = [];
-
-            const spyData = calculatePercentChange(SPY_DATA.prices, startDate);
-            datasets.push({{
-                label: 'SPY',
-                data: spyData,
-                borderColor: '#52525b',
-                borderWidth: 2,
-                borderDash: [5, 5],
-                pointRadius: 0,
-                tension: 0.1,
-                fill: false
-            }});
-
-            top20.forEach((stock, i) => {{
-                const stockData = calculatePercentChange(stock.prices, startDate);
-                if (stockData.length === 0) return;
-
-                let borderWidth = 2;
-                let borderColor = COLORS[i % COLORS.length];
-
-                if (selectedStock) {{
-                    if (stock.symbol === selectedStock) {{
-                        borderWidth = 4;
-                    }} else {{
-                        borderWidth = 1;
-                        borderColor = COLORS[i % COLORS.length] + '40';
-                    }}
-                }}
-
-                datasets.push({{
-                    label: stock.symbol,
-                    data: stockData,
-                    borderColor: borderColor,
-                    borderWidth: borderWidth,
-                    pointRadius: 0,
-                    pointHoverRadius: 4,
-                    tension: 0.1,
-                    fill: false,
-                    originalColor: COLORS[i % COLORS.length]
-                }});
-            }});
-
-            if (chart) {{
-                chart.data.datasets = datasets;
-                chart.update('none');
-            }} else {{
-                const ctx = document.getElementById('perfChart').getContext('2d');
-                chart = new Chart(ctx, {{
-                    type: 'line',
-                    data: {{ datasets }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        interaction: {{
-                            mode: 'index',
-                            intersect: false
-                        }},
-                        plugins: {{
-                            legend: {{ display: false }},
-                            tooltip: {{
-                                backgroundColor: '#18181b',
-                                titleColor: '#fff',
-                                bodyColor: '#a1a1aa',
-                                borderColor: '#2a2a2a',
-                                borderWidth: 1,
-                                padding: window.innerWidth <= 600 ? 6 : 10,
-                                titleFont: {{ family: 'Noto Sans KR' }},
-                                bodyFont: {{ family: 'JetBrains Mono', size: window.innerWidth <= 600 ? 10 : 11 }},
-                                callbacks: {{
-                                    label: (ctx) => `${{ctx.dataset.label}}: ${{ctx.parsed.y >= 0 ? '+' : ''}}${{ctx.parsed.y.toFixed(2)}}%`
-                                }}
-                            }}
-                        }},
-                        scales: {{
-                            x: {{
-                                type: 'time',
-                                time: {{
-                                    unit: currentPeriod === '1W' ? 'day' :
-                                          currentPeriod === '1M' ? 'week' : 'month',
-                                    displayFormats: {{
-                                        day: 'MM/dd',
-                                        week: 'MM/dd',
-                                        month: 'yy/MM'
-                                    }}
-                                }},
-                                grid: {{ color: '#1a1a1a' }},
-                                ticks: {{ color: '#52525b', font: {{ family: 'JetBrains Mono', size: window.innerWidth <= 600 ? 9 : 10 }} }}
-                            }},
-                            y: {{
-                                grid: {{ color: '#1a1a1a' }},
-                                ticks: {{
-                                    color: '#52525b',
-                                    font: {{ family: 'JetBrains Mono', size: window.innerWidth <= 600 ? 9 : 10 }},
-                                    callback: (v) => v + '%'
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
-            }}
-        }}
-
-        function updateTable() {{
-            const spyPerf = SPY_DATA.performance[currentPeriod] || 0;
-            const spyEl = document.getElementById('spy-perf');
-            spyEl.textContent = (spyPerf >= 0 ? '+' : '') + spyPerf.toFixed(2) + '%';
-            spyEl.className = 'spy-value ' + (spyPerf >= 0 ? '' : 'negative');
-
-            const tbody = document.getElementById('table-body');
-            tbody.innerHTML = top20.map((stock, i) => {{
-                const perf = stock.performance[currentPeriod];
-                const vsSpy = stock.vsSpy;
-                const name = STOCK_NAMES[stock.symbol] || stock.symbol;
-                const isSelected = selectedStock === stock.symbol;
-                const isDimmed = selectedStock && !isSelected;
-                return `
-                    <tr data-symbol="${{stock.symbol}}" class="${{isSelected ? 'selected' : ''}} ${{isDimmed ? 'dimmed' : ''}}">
-                        <td class="rank">${{i + 1}}</td>
-                        <td>
-                            <div class="stock-info">
-                                <span class="stock-symbol" style="color: ${{COLORS[i % COLORS.length]}}">${{stock.symbol}}</span>
-                                <span class="stock-name">${{name.substring(0, 25)}}</span>
-                            </div>
-                        </td>
-                        <td class="perf-value ${{perf >= 0 ? 'positive' : 'negative'}}">${{perf >= 0 ? '+' : ''}}${{perf.toFixed(2)}}%</td>
-                        <td class="vs-spy ${{vsSpy >= 0 ? 'positive' : 'negative'}}">${{vsSpy >= 0 ? '+' : ''}}${{vsSpy.toFixed(2)}}%</td>
-                    </tr>
-                `;
-            }}).join('');
-
-            tbody.querySelectorAll('tr').forEach(row => {{
-                row.addEventListener('click', () => {{
-                    const symbol = row.dataset.symbol;
-                    selectedStock = symbol;
-                    updateChart();
-                    updateTable();
-                    updateInfoCard();
-                }});
-            }});
-        }}
-
-        function updateInfoCard() {{
-            if (!selectedStock) return;
-            const info = STOCK_INFO[selectedStock];
-            if (!info || !info.name) return;
-            document.getElementById('info-title').textContent = `${{selectedStock}} - ${{info.name}}`;
-            document.getElementById('info-sector').textContent = info.sector || '-';
-            document.getElementById('info-marketcap').textContent = info.marketCap || '-';
-            document.getElementById('info-price').textContent = info.price ? `$${{info.price.toLocaleString()}}` : '-';
-            document.getElementById('info-high52').textContent = info.high52w ? `$${{info.high52w.toLocaleString()}}` : '-';
-            document.getElementById('info-low52').textContent = info.low52w ? `$${{info.low52w.toLocaleString()}}` : '-';
-            document.getElementById('info-per').textContent = info.per || '-';
-            document.getElementById('info-pbr').textContent = info.pbr || '-';
-            document.getElementById('info-description').textContent = info.description || '설명 없음';
-        }}
-
-        function updateLegend() {{
-            const legend = document.getElementById('legend');
-            let html = '<div class="legend-item"><div class="legend-spy"></div><span>SPY</span></div>';
-            top20.forEach((stock, i) => {{
-                html += `<div class="legend-item"><div class="legend-dot" style="background: ${{COLORS[i % COLORS.length]}}"></div><span>${{stock.symbol}}</span></div>`;
-            }});
-            legend.innerHTML = html;
-        }}
-
-        function update() {{
-            top20 = getTop20(currentPeriod);
-            selectedStock = top20.length > 0 ? top20[0].symbol : null;
-            updateChart();
-            updateTable();
-            updateLegend();
-            updateInfoCard();
-        }}
-
-        document.querySelectorAll('.period-btn').forEach(btn => {{
-            btn.addEventListener('click', () => {{
-                document.querySelectorAll('.period-btn').forEach(b => b.classList.remove('active'));
-                btn.classList.add('active');
-                currentPeriod = btn.dataset.period;
-                update();
-            }});
-        }});
-
-        let resizeTimeout;
-        window.addEventListener('resize', () => {{
-            clearTimeout(resizeTimeout);
-            resizeTimeout = setTimeout(() => {{
-                if (chart) {{ chart.update('none'); }}
-            }}, 200);
-        }});
-
-        update();
-    </script>
-</body>
-</html>'''
-    
-    output_path = Path(__file__).parent.parent / "index.html"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
-    
-    # spy-outperform.html 도 같이 생성
-    outperform_path = Path(__file__).parent.parent / "spy-outperform.html"
-    with open(outperform_path, "w", encoding="utf-8") as f:
-        f.write(html)
+from string import Template
+
+import numpy as np
+
+from compress import COMPRESSED_SUFFIXES, format_report, precompress, remove_siblings, summarize
+from fileio import write_if_changed
+from metrics import Metrics
+from price_matrix import PriceMatrixWriter
+from performance import get_date_ranges
+from stocks_schema import StocksReader, decode_entry
+
+ROOT = Path(__file__).parent.parent
+DATA_PATH = ROOT / "data" / "stocks.json"
+ASSET_DIR = ROOT / "assets" / "data"
+STATIC_DIR = ROOT / "assets" / "static"
+TEMPLATE_DIR = ROOT / "templates"
+HASH_LENGTH = 10
+TOP_N = 20
+# 기간별 차트 시리즈 최대 날짜 수 (이보다 길면 LTTB 다운샘플링)
+MAX_POINTS = 200
+METRICS_NAME = "html_metrics.json"
+
+
+def compact_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def write_hashed(directory, stem, text, written=None, suffix=".json"):
+    """<stem>.<내용 해시><suffix> 로 저장하고 파일명 반환"""
+    name = f"{stem}.{content_hash(text)}{suffix}"
+    write_if_changed(Path(directory) / name, text, written)
+    return name
+
+
+def prune_assets(directory, keep, pattern="*.*.json"):
+    """manifest/셸에서 참조하지 않는 이전 해시 파일 삭제 (압축본 포함)"""
+    for path in Path(directory).glob(pattern):
+        if path.suffix in COMPRESSED_SUFFIXES or path.name in keep:
+            continue
+        path.unlink()
+        remove_siblings(path)
+
+
+def render_shell(template_dir=TEMPLATE_DIR, static_dir=STATIC_DIR, out_dir=ROOT, written=None):
+    """
+    templates/ → HTML 셸
+    app.css / app.js 는 내용 해시 파일로 static_dir 에 쓰고 셸에는 out_dir 기준 상대 경로만 넣음
+    """
+    template_dir, static_dir = Path(template_dir), Path(static_dir)
+    base = static_dir.relative_to(out_dir).as_posix()
+    refs = {}
+    for suffix in (".css", ".js"):
+        text = (template_dir / f"app{suffix}").read_text(encoding="utf-8")
+        refs[f"app_{suffix[1:]}"] = f"{base}/{write_hashed(static_dir, 'app', text, written, suffix)}"
+    prune_assets(static_dir, {ref.rsplit("/", 1)[1] for ref in refs.values()}, "app.*")
+
+    shell = Template((template_dir / "index.html").read_text(encoding="utf-8"))
+    return shell.substitute(refs)
+
+
+def rebase(values):
+    """첫 유효값 기준 수익률(%) 배열 (결측은 None, 유효값이 없으면 None)"""
+    base = next((v for v in values if v is not None), None)
+    if not base:
+        return None
+    return [None if v is None else round((v - base) / base * 100, 2) for v in values]
+
+
+def lttb_indices(series, max_points=MAX_POINTS):
+    """
+    여러 시리즈가 공유하는 LTTB(Largest-Triangle-Three-Buckets) 다운샘플링 인덱스
+    - series: (시리즈 수 × 날짜 수) 배열, 결측은 NaN
+    - 버킷마다 모든 시리즈의 삼각형 넓이 합이 가장 큰 날짜 하나 선택 (처음/마지막 날짜는 항상 포함)
+    - 모든 시리즈가 같은 날짜를 쓰므로 차트 툴팁(index 모드)이 날짜별로 맞음
+    """
+    n = series.shape[1]
+    if max_points is None or n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    every = (n - 2) / (max_points - 2)
+    selected = [0]
+    a = 0
+    for bucket in range(max_points - 2):
+        lo = int(bucket * every) + 1
+        hi = int((bucket + 1) * every) + 1
+        next_lo, next_hi = hi, min(int((bucket + 2) * every) + 1, n)
+
+        # 다음 버킷 평균점 (마지막 버킷은 마지막 점)
+        if next_lo >= n - 1 or bucket == max_points - 3:
+            avg_x, avg_y = x[n - 1], series[:, n - 1]
+        else:
+            avg_x = x[next_lo:next_hi].mean()
+            with np.errstate(invalid="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                avg_y = np.nanmean(series[:, next_lo:next_hi], axis=1)
+
+        ya = series[:, a:a + 1]
+        area = np.abs((x[a] - avg_x) * (series[:, lo:hi] - ya) - (x[a] - x[lo:hi]) * (avg_y[:, None] - ya))
+        a = lo + int(np.argmax(np.nansum(area, axis=0)))
+        selected.append(a)
+
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def rank_periods(stocks, spy_performance, periods, top_n=TOP_N):
+    """
+    종목 이터러블을 한 번만 훑어 기간별 상위 N 종목 (SPY 대비 초과수익 순)
+    메모리에는 기간별 후보 N개만 유지, 동점은 먼저 나온 종목 우선
+    """
+    heaps = {period: [] for period in periods}
+    for i, stock in enumerate(stocks):
+        for period, heap in heaps.items():
+            if period not in stock["performance"]:
+                continue
+            spy_perf = spy_performance.get(period) or 0
+            item = (stock["performance"][period] - spy_perf, -i, stock)
+            if len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+    return {
+        period: [stock for _, _, stock in sorted(heap, key=lambda item: item[:2], reverse=True)]
+        for period, heap in heaps.items()
+    }
+
+
+def build_period(header, period, start, ranked, max_points=MAX_POINTS, binary=False):
+    """
+    기간 데이터: 상위 종목 + 기간 시작 기준 재기준 시리즈 (최대 max_points 개 날짜로 다운샘플링)
+    binary=True 면 시리즈 대신 종가 행렬 열 번호("index")만 넣음 (재기준은 페이지에서)
+    """
+    n_dates = len(header["dates"])
+    spy_perf = header["spy"]["performance"].get(period) or 0
+
+    def series(entry):
+        return rebase(decode_entry(entry, n_dates, header["priceScale"], header["priceEncoding"])[start:])
+
+    spy = series(header["spy"])
+    stocks = [series(s) for s in ranked]
+    dates = header["dates"][start:]
+    keep = range(len(dates))
+
+    # SPY + 상위 종목이 같은 날짜를 공유하도록 한 번에 선택
+    lines = [values for values in [spy, *stocks] if values is not None]
+    if lines:
+        matrix = np.array([[np.nan if v is None else v for v in values] for values in lines], dtype=float)
+        keep = lttb_indices(matrix, max_points).tolist()
+        if len(keep) < len(dates):
+            pick = lambda values: None if values is None else [values[i] for i in keep]
+            dates, spy, stocks = pick(dates), pick(spy), [pick(values) for values in stocks]
+
+    payload = {
+        "period": period,
+        "dates": dates,
+        "spyPerf": spy_perf,
+        "spy": spy,
+        "top": [
+            {
+                "symbol": s["symbol"],
+                "perf": s["performance"][period],
+                "vsSpy": round(s["performance"][period] - spy_perf, 2),
+                "risk": s.get("risk", {}),
+                "series": values,
+            }
+            for s, values in zip(ranked, stocks)
+        ],
+    }
+    if binary:
+        del payload["spy"]
+        for entry in payload["top"]:
+            del entry["series"]
+        payload["index"] = [start + i for i in keep]
+    return payload
+
+
+def write_data_assets(reader, asset_dir=ASSET_DIR, written=None, max_points=MAX_POINTS, binary=False):
+    """stocks.json 을 한 번 훑어 meta + 기간별 데이터 파일 (+ 종가 행렬) 작성, manifest 반환"""
+    header = reader.header
+    date_ranges = get_date_ranges()
+    stocks = reader.iter_stocks()
+    matrix = PriceMatrixWriter(asset_dir, header, written) if binary else None
+    try:
+        # 종가 행렬은 순위 계산과 같은 순회에서 행 단위로 기록
+        rankings = rank_periods(matrix.tap(stocks) if matrix else stocks,
+                                header["spy"]["performance"], date_ranges.keys())
+    except BaseException:
+        if matrix:
+            matrix.abort()
+        raise
+
+    trailer = reader.trailer()
+    meta = {
+        "lastUpdated": header["lastUpdated"],
+        "stockNames": trailer["stockNames"],
+        "stockInfo": trailer.get("stockInfo", {}),
+    }
+    return write_assets(header, rankings, meta, asset_dir, written, max_points,
+                        matrix.finish() if matrix else None)
+
+
+def write_assets(header, rankings, meta, asset_dir=ASSET_DIR, written=None, max_points=MAX_POINTS, prices=None,
+                 live=None):
+    """
+    기간별 상위 종목 + meta → 해시 데이터 파일 + manifest (내용이 같은 파일은 다시 쓰지 않음)
+    prices: 종가 행렬 헤더 (PriceMatrixWriter.finish) → 기간 파일은 시리즈 대신 열 번호
+    live: 행렬 뒤에 붙일 오늘 행 (감시 모드, watch.WatchSession.live_row) → manifest 의 live
+    """
+    date_ranges = get_date_ranges()
+    periods = {}
+    for period, ranked in rankings.items():
+        start = bisect_left(header["dates"], date_ranges[period].strftime("%Y-%m-%d"))
+        payload = build_period(header, period, start, ranked, max_points, prices is not None)
+        periods[period] = write_hashed(asset_dir, f"period-{period}", compact_json(payload), written)
+
+    manifest = {"meta": write_hashed(asset_dir, "meta", compact_json(meta), written), "periods": periods}
+    keep = {manifest["meta"], *periods.values()}
+    if prices is not None:
+        manifest["prices"] = write_hashed(asset_dir, "prices", compact_json(prices), written)
+        keep.update({manifest["prices"], prices["data"]})
+    if live is not None:
+        manifest["live"] = write_hashed(asset_dir, "live", compact_json(live), written)
+        keep.add(manifest["live"])
+    write_if_changed(Path(asset_dir) / "manifest.json", compact_json(manifest), written)
+    prune_assets(asset_dir, keep)
+    prune_assets(asset_dir, keep, "prices.*.f32")
+    return manifest
+
+
+def generate_html(data_path=DATA_PATH, out_dir=ROOT, max_points=MAX_POINTS, compress=True, binary=False):
+    data_path = Path(data_path)
+    out_dir = Path(out_dir)
+    asset_dir = out_dir / ASSET_DIR.relative_to(ROOT)
+    static_dir = out_dir / STATIC_DIR.relative_to(ROOT)
+    metrics = Metrics("generate_html", data_path.parent / METRICS_NAME)
+    written = []
+
+    # stocks.json 을 종목 단위로 읽으면서 해시 데이터 파일 작성
+    # (version 1 / 한 줄 JSON 파일은 전체 로드 후 컬럼형으로 변환)
+    with metrics.stage("assets") as stage:
+        with StocksReader(data_path) as reader:
+            manifest = write_data_assets(reader, asset_dir, written, max_points, binary)
+        stage["items"] = len(manifest["periods"]) + 1 + ("prices" in manifest)
+        stage["bytes"] = data_path.stat().st_size
+        stage["written"] = len(written)
+
+    with metrics.stage("html") as stage:
+        html = render_shell(TEMPLATE_DIR, static_dir, out_dir, written)
+        output_path = out_dir / "index.html"
+        write_if_changed(output_path, html, written)
+
+        # spy-outperform.html 도 같이 생성
+        outperform_path = out_dir / "spy-outperform.html"
+        write_if_changed(outperform_path, html, written)
+        stage["items"] = 2
+        stage["bytes"] = len(html.encode("utf-8"))
+
+    static_changed = sum(path.parent == static_dir for path in written)
+    report = {}
+    if compress:
+        with metrics.stage("compress") as stage:
+            outputs = [output_path, outperform_path] + sorted(
+                path for directory in (asset_dir, static_dir) for path in directory.iterdir()
+                if path.suffix not in COMPRESSED_SUFFIXES
+            )
+            report = precompress(outputs, changed=list(written), written=written)
+            totals = summarize(report)
+            stage["items"] = len(outputs)
+            stage["bytes"] = totals["raw"]
+            stage["gzipBytes"] = totals[".gz"]
+            if ".br" in totals:
+                stage["brotliBytes"] = totals[".br"]
+
+    metrics.set("filesWritten", len(written))
+    metrics.add_bytes(*written)
+    metrics.finish()
     
     print(f"✅ HTML 생성 완료: {output_path}")
+    print(f"📦 데이터 파일: {asset_dir} (meta + {len(manifest['periods'])}개 기간)")
+    print(f"🎨 정적 파일: {static_dir} (변경 {static_changed}개)")
+    if report:
+        print("🗜️ 압축 결과 (원본 → 압축본)" + ("" if ".br" in summarize(report) else " — brotli 없음, .gz 만 생성"))
+        print(format_report(report, out_dir))
 
 
 if __name__ == "__main__":
-    generate_html()
+    parser = argparse.ArgumentParser(description="대시보드 HTML + 데이터 파일 생성")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="stocks.json 경로")
+    parser.add_argument("--out-dir", type=Path, default=ROOT, help="출력 디렉터리 (기본: 저장소 루트)")
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS,
+                        help="기간별 차트 시리즈 최대 날짜 수 (0 이면 다운샘플링 안 함)")
+    parser.add_argument("--no-compress", action="store_true", help=".gz / .br 압축본 생성 안 함")
+    parser.add_argument("--binary", action="store_true",
+                        help="종가 행렬 Float32 바이너리 작성 (페이지는 기간 시리즈 대신 바이너리 사용)")
+    args = parser.parse_args()
+    generate_html(args.data, args.out_dir, args.max_points or None,
+                  compress=not args.no_compress, binary=args.binary)
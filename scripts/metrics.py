@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+실행 지표 기록 (단계별 시간 + 카운터) → JSON
+- 단계가 끝날 때마다 파일을 갱신하므로 중간에 종료돼도 어느 단계까지 걸렸는지 남음
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+class Metrics:
+    """단계별 실행 시간, 처리 개수, 실패/재시도, 기록 바이트"""
+
+    def __init__(self, run, path=None):
+        self.run = run
+        self.path = Path(path) if path else None
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.status = "running"
+
+    @contextmanager
+    def stage(self, name):
+        """with metrics.stage("download") as stage: stage["items"] = n"""
+        record = {}
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 4)
+            self.stages[name] = record
+            self.write()
+
+    def count(self, key, value=1):
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, key, value):
+        self.counters[key] = value
+
+    def add_bytes(self, *paths):
+        """기록한 파일 크기 누적"""
+        for path in paths:
+            path = Path(path)
+            if path.exists():
+                self.count("bytesWritten", path.stat().st_size)
+
+    def finish(self, status="ok"):
+        self.status = status
+        self.write()
+
+    def to_dict(self):
+        return {
+            "run": self.run,
+            "status": self.status,
+            "startedAt": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "totalSeconds": round(time.perf_counter() - self.started, 4),
+            "stages": self.stages,
+            "counters": self.counters,
+        }
+
+    def write(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=1), encoding="utf-8")
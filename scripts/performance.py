@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+종가 행렬(날짜 × 티커) 기반 기간별 수익률 계산
+- 공통 날짜 축에서 기간 시작 인덱스를 이진 탐색으로 한 번만 계산
+- 모든 종목 × 모든 기간 수익률을 NumPy 연산 몇 번으로 계산
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def round2(values):
+    """
+    소수 2자리 반올림 (배열)
+    np.round 는 x * 100 을 반올림해 드물게 Python round(x, 2) 와 0.01 차이 → 원소마다 Python round 사용
+    """
+    values = np.asarray(values, dtype=float)
+    return np.array([round(v, 2) for v in values.ravel().tolist()], dtype=float).reshape(values.shape)
+
+
+def get_date_ranges(today=None):
+    """기간별 시작 날짜 계산"""
+    today = today or datetime.now()
+    return {
+        "1W": today - timedelta(days=7),
+        "1M": today - timedelta(days=30),
+        "3M": today - timedelta(days=90),
+        "12M": today - timedelta(days=365),
+        "YTD": datetime(today.year, 1, 1),
+    }
+
+
+def history_start(date_ranges):
+    """종가 행렬 시작일: 가장 긴 기간(12M) 시작보다 10일 앞"""
+    return date_ranges["12M"] - timedelta(days=10)
+
+
+def period_start_indices(dates, date_ranges):
+    """기간별 시작 인덱스 (시작일 이후 첫 거래일)"""
+    index = pd.DatetimeIndex(dates).values
+    starts = np.array([np.datetime64(pd.Timestamp(d).normalize()) for d in date_ranges.values()])
+    positions = np.searchsorted(index, starts, side="left")
+    return dict(zip(date_ranges.keys(), positions.tolist()))
+
+
+def calculate_performance_matrix(close_data, date_ranges):
+    """
+    기간별 수익률(%) 행렬: index=기간, columns=티커
+    - 시작가: 기간 시작일 이후 첫 유효 종가
+    - 종료가: 마지막 유효 종가
+    - 계산 불가(데이터 부족, 시작가 0/없음)는 NaN
+    """
+    # float32 입력도 float64 로 바꾼 뒤 반올림 (float32 의 252.21 은 float64 의 252.21 과 다른 값)
+    prices = close_data.astype(float).round(2)
+    values = prices.to_numpy(dtype=float)
+    n_dates = values.shape[0]
+
+    # 시작일 이후 첫 유효값 / 마지막 유효값
+    next_valid = prices.bfill().to_numpy(dtype=float)
+    last_valid = prices.ffill().to_numpy(dtype=float)[-1] if n_dates else np.full(values.shape[1], np.nan)
+    enough = np.count_nonzero(~np.isnan(values), axis=0) >= 2
+
+    starts = period_start_indices(prices.index, date_ranges)
+    result = np.full((len(starts), values.shape[1]), np.nan)
+    for row, position in enumerate(starts.values()):
+        if position >= n_dates:
+            continue
+        start_price = next_valid[position]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (last_valid - start_price) / start_price * 100
+        change[(start_price == 0) | ~enough] = np.nan
+        result[row] = change
+
+    return pd.DataFrame(round2(result), index=list(starts.keys()), columns=close_data.columns)
+
+
+def performance_dict(matrix, symbol):
+    """한 종목의 기간별 수익률 dict (계산 불가 기간 제외)"""
+    column = matrix[symbol]
+    return {period: float(value) for period, value in column.items() if not np.isnan(value)}
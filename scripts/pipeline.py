@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+데이터 수집 → HTML 생성 파이프라인 (단계 DAG + 입력 지문)
+- 단계마다 입력(파라미터, 코드, 입력 파일) sha256 지문과 출력 파일 지문을 data/pipeline_state.json 에 기록
+- 지문이 지난 실행과 같고 출력도 기록한 그대로면 단계를 건너뜀
+  fetch: 날짜가 입력에 포함 (기간 수익률이 오늘 날짜 기준) → 같은 날 다시 실행하면 건너뜀
+  html: stocks.json 은 lastUpdated 를 빼고 비교 → 휴장일처럼 데이터가 그대로면 HTML/데이터 파일을 다시 쓰지 않음
+- 커밋하지 않는 중간 산출물(stocks.json)은 기록해 둔 지문으로 판단,
+  하위 단계가 실제로 실행돼야 하는데 파일이 없으면 상위 단계부터 다시 실행
+- pandas / yfinance 등 무거운 모듈은 단계가 실행될 때만 import → --dry-run 과 할 일 없는 날은 표준 라이브러리만 사용
+
+사용 예:
+    python scripts/pipeline.py                 # 필요한 단계만 실행
+    python scripts/pipeline.py --dry-run       # 단계별 실행/건너뜀 계획만 출력
+    python scripts/pipeline.py --force html    # 지정 단계 강제 실행 (이름 생략 시 전체)
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+from fileio import write_atomic
+from metrics import Metrics
+from universe import DEFAULT_UNIVERSE, universe_path
+
+ROOT = Path(__file__).parent.parent
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = ROOT / "data"
+TEMPLATE_DIR = ROOT / "templates"
+STATE_NAME = "pipeline_state.json"
+METRICS_NAME = "pipeline_metrics.json"
+CHUNK = 1 << 20
+
+# 단계별로 출력에 영향을 주는 코드 (바뀌면 다시 실행)
+FETCH_CODE = ["fetch_data", "performance", "risk", "ranges", "price_cache", "price_store", "checkpoint",
+              "downloader", "sources", "stock_info", "stocks_schema", "universe"]
+HTML_CODE = ["generate_html", "compress", "price_matrix", "performance", "stocks_schema"]
+
+# 실행 시각만 담은 필드 (지문에서 제외)
+LAST_UPDATED = re.compile(rb'"lastUpdated":\s*"[^"]*"')
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stocks_digest(path):
+    """stocks.json 지문 (lastUpdated 제외, 헤더는 첫 줄이라 첫 줄만 치환)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(LAST_UPDATED.sub(b"", f.readline(), count=1))
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+DIGESTS = {"stocks.json": stocks_digest}
+
+
+def path_digest(path):
+    """파일/디렉터리 지문 (디렉터리는 상대 경로 + 파일 지문, 없으면 None)"""
+    path = Path(path)
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for child in sorted(p for p in path.rglob("*") if p.is_file() and p.suffix != ".tmp"):
+            digest.update(f"{child.relative_to(path).as_posix()}:{file_digest(child)}\n".encode())
+        return digest.hexdigest()
+    if not path.exists():
+        return None
+    return DIGESTS.get(path.name, file_digest)(path)
+
+
+def state_key(path):
+    """상태 파일 키 (저장소 안이면 상대 경로)"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(ROOT.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class Stage:
+    """
+    DAG 의 한 단계
+    run: 실행 함수 (참이 되는 값을 반환하면 실패)
+    inputs: 입력 파일/디렉터리 (다른 단계의 출력이면 그 단계가 상위 단계)
+    outputs: 커밋되는 출력 (건너뛸 때 기록한 지문과 같은지 확인)
+    transient: 커밋하지 않는 중간 산출물 (없어도 건너뛸 수 있음)
+    """
+
+    def __init__(self, name, run, params=None, code=(), inputs=(), outputs=(), transient=()):
+        self.name = name
+        self.run = run
+        self.params = params or {}
+        self.code = [SCRIPT_DIR / f"{module}.py" for module in code]
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.transient = [Path(p) for p in transient]
+
+
+class Pipeline:
+    """단계를 순서대로 (상위 → 하위) 지문 비교 후 필요한 것만 실행"""
+
+    def __init__(self, stages, data_dir=DATA_DIR):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = Path(data_dir) / STATE_NAME
+        self.state = json.loads(self.state_path.read_text(encoding="utf-8")) if self.state_path.exists() else {}
+        self.producers = {
+            state_key(path): stage.name for stage in stages for path in stage.outputs + stage.transient
+        }
+        self.metrics = Metrics("pipeline")
+        self.metrics_path = Path(data_dir) / METRICS_NAME
+        self.ran = set()
+
+    def upstream(self, stage):
+        return {self.producers[state_key(p)] for p in stage.inputs if state_key(p) in self.producers}
+
+    def parts(self, stage):
+        """지문 구성 요소 {"params": .., 코드/입력 경로: 지문}"""
+        parts = {"params": hashlib.sha256(json.dumps(stage.params, sort_keys=True).encode()).hexdigest()}
+        for path in stage.code:
+            parts[state_key(path)] = file_digest(path)
+        for path in stage.inputs:
+            key = state_key(path)
+            digest = path_digest(path)
+            producer = self.producers.get(key)
+            # 상위 단계를 이번에 건너뛰었으면 중간 산출물은 기록해 둔 지문 그대로
+            if digest is None and producer and producer not in self.ran:
+                digest = self.state.get(producer, {}).get("outputs", {}).get(key)
+            parts[key] = digest
+        return parts
+
+    def reason(self, stage, parts, force):
+        """실행 이유 (건너뛰면 None)"""
+        if stage.name in force:
+            return "강제 실행"
+        record = self.state.get(stage.name)
+        if record is None:
+            return "첫 실행"
+        changed = [key for key, digest in parts.items() if digest is None or record["inputs"].get(key) != digest]
+        if changed:
+            return "입력 변경: " + ", ".join(changed)
+        for path in stage.outputs:
+            if path_digest(path) != record["outputs"].get(state_key(path)):
+                return f"출력 변경/없음: {state_key(path)}"
+        return None
+
+    def ensure_inputs(self, stage):
+        """없는 중간 산출물은 만든 단계를 다시 실행"""
+        for path in stage.inputs:
+            producer = self.producers.get(state_key(path))
+            if not path.exists() and producer and producer not in self.ran:
+                print(f"  ↩️  {state_key(path)} 없음 → {producer} 다시 실행")
+                if not self.execute(self.stages[producer], "하위 단계 입력 없음"):
+                    return False
+        return True
+
+    def execute(self, stage, reason):
+        print(f"\n▶️  {stage.name}: 실행 ({reason})")
+        # 실제로 실행한 단계가 있을 때만 지표 파일 작성 (할 일 없는 날은 저장소 변경 없음)
+        self.metrics.path = self.metrics_path
+        parts = self.parts(stage)
+        with self.metrics.stage(stage.name) as record:
+            record["reason"] = reason
+            failed = stage.run()
+        self.ran.add(stage.name)
+        if failed:
+            print(f"❌ {stage.name} 실패")
+            return False
+
+        self.state[stage.name] = {
+            "fingerprint": hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest(),
+            "inputs": parts,
+            "outputs": {state_key(p): path_digest(p) for p in stage.outputs + stage.transient},
+            "finishedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.save_state()
+        return True
+
+    def save_state(self):
+        write_atomic(self.state_path, json.dumps(self.state, ensure_ascii=False, indent=1, sort_keys=True))
+
+    def run(self, force=(), dry_run=False):
+        """반환: 종료 코드 (0 성공, 1 실패)"""
+        force = set(self.stages) if force == [] else set(force or ())
+        planned = set()
+        for stage in self.stages.values():
+            if dry_run and self.upstream(stage) & planned and stage.name not in force:
+                print(f"⏳ {stage.name}: 상위 단계 실행 후 판단")
+                planned.add(stage.name)
+                continue
+
+            reason = self.reason(stage, self.parts(stage), force)
+            if reason is None:
+                print(f"⏭️  {stage.name}: 건너뜀 (입력/출력 동일)")
+                with self.metrics.stage(stage.name) as record:
+                    record["skipped"] = True
+                continue
+            if dry_run:
+                print(f"▶️  {stage.name}: 실행 예정 ({reason})")
+                planned.add(stage.name)
+                continue
+
+            ran = set(self.ran)
+            if not self.ensure_inputs(stage):
+                self.metrics.finish("failed")
+                return 1
+            # 상위 단계를 다시 실행했으면 입력이 바뀌었을 수 있으므로 다시 판단
+            if self.ran != ran:
+                reason = self.reason(stage, self.parts(stage), force)
+            if reason is None:
+                print(f"⏭️  {stage.name}: 건너뜀 (다시 만든 입력이 이전과 동일)")
+                continue
+            if not self.execute(stage, reason):
+                self.metrics.finish("failed")
+                return 1
+
+        if not dry_run:
+            self.metrics.finish()
+        print(f"\n✅ 파이프라인 완료 ({self.metrics.to_dict()['totalSeconds']:.2f}초, "
+              f"실행 {len(self.ran)}개 / 전체 {len(self.stages)}개 단계)")
+        return 0
+
+
+def build_stages(args):
+    """fetch (종가 수집 → stocks.json) → html (HTML + 해시 데이터 파일)"""
+    data_dir, out_dir = Path(args.data_dir), Path(args.out_dir)
+    stocks_path = data_dir / "stocks.json"
+    universe = [name.strip() for name in args.universe.split(",") if name.strip()]
+
+    def fetch():
+        from fetch_data import main
+        from sources import get_source
+
+        source = get_source(args.source, n_tickers=args.tickers, seed=args.seed, fixture=args.fixture)
+        options = {"chunk_size": args.chunk_size, "workers": args.workers}
+        return main(source=source, data_dir=data_dir, resume=not args.no_resume, universe=args.universe,
+                    **{key: value for key, value in options.items() if value is not None})
+
+    def html():
+        from generate_html import generate_html
+
+        options = {} if args.max_points is None else {"max_points": args.max_points or None}
+        generate_html(stocks_path, out_dir, compress=not args.no_compress, binary=args.binary, **options)
+
+    fetch_inputs = [universe_path(name) for name in universe]
+    if args.fixture:
+        fetch_inputs.append(Path(args.fixture))
+
+    return [
+        Stage(
+            "fetch", fetch,
+            params={"source": args.source, "tickers": args.tickers, "seed": args.seed,
+                    "universe": universe, "today": date.today().isoformat()},
+            code=FETCH_CODE, inputs=fetch_inputs,
+            outputs=[data_dir / "prices"], transient=[stocks_path],
+        ),
+        Stage(
+            "html", html,
+            params={"maxPoints": args.max_points, "compress": not args.no_compress, "binary": args.binary},
+            code=HTML_CODE, inputs=[stocks_path, TEMPLATE_DIR],
+            outputs=[out_dir / "index.html", out_dir / "spy-outperform.html", out_dir / "assets"],
+        ),
+    ]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="데이터 수집 → HTML 생성 (바뀐 단계만 실행)")
+    parser.add_argument("--dry-run", action="store_true", help="실행하지 않고 단계별 계획만 출력")
+    parser.add_argument("--force", nargs="*", choices=["fetch", "html"],
+                        help="지문과 관계없이 실행할 단계 (이름 생략 시 전체)")
+    parser.add_argument("--source", default="yfinance", choices=["yfinance", "synthetic", "fixture"],
+                        help="가격/메타데이터 소스 (기본: yfinance)")
+    parser.add_argument("--universe", default=",".join(DEFAULT_UNIVERSE),
+                        help="종목 목록 (universes/ 아래 이름 또는 파일 경로, 쉼표로 병합)")
+    parser.add_argument("--tickers", type=int, help="synthetic: 합성 종목 수")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic: 난수 시드")
+    parser.add_argument("--fixture", help="fixture: closes.csv / info.json 디렉터리")
+    parser.add_argument("--chunk-size", type=int, help="다운로드 청크당 종목 수 (기본: fetch_data 기본값)")
+    parser.add_argument("--workers", type=int, help="청크 처리 스레드 수 (yfinance 는 요청이 한 번에 한 청크씩, 기본: fetch_data 기본값)")
+    parser.add_argument("--no-resume", action="store_true", help="체크포인트 무시하고 처음부터 실행")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="데이터 디렉터리 (기본: data/)")
+    parser.add_argument("--out-dir", type=Path, default=ROOT, help="HTML 출력 디렉터리 (기본: 저장소 루트)")
+    parser.add_argument("--max-points", type=int,
+                        help="기간별 차트 시리즈 최대 날짜 수 (0 이면 다운샘플링 안 함, 기본: generate_html 기본값)")
+    parser.add_argument("--no-compress", action="store_true", help=".gz / .br 압축본 생성 안 함")
+    parser.add_argument("--binary", action="store_true", help="종가 행렬 Float32 바이너리 작성")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = Pipeline(build_stages(args), args.data_dir)
+    if args.dry_run:
+        print("🔍 dry run (실행하지 않음)")
+    return pipeline.run(force=args.force, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+메모리 맵 종가 캐시 (data/cache/, 저장소에는 올리지 않음)
+- close.npy: (날짜 × 티커) float64 종가 (소수 2자리, 결측 NaN)
+  Fortran 순서로 저장 → 티커 한 열이 파일에서 연속 → 필요한 종목 페이지만 읽힘
+- dates.npy: datetime64[D] 날짜 축, symbols.npy: 티커 축
+- fetch_data.py 가 종가 저장소(data/prices/ 월별 세그먼트)와 같은 종가로 작성, JSON 파싱 없이 밀리초 단위로 열림
+
+사용 예:
+    from price_cache import load_prices
+    cache = load_prices()
+    cache.series("NVDA")            # pd.Series (해당 열만 읽음)
+    cache.frame(["SPY", "NVDA"])    # pd.DataFrame
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
+FILES = ("close.npy", "dates.npy", "symbols.npy")
+
+
+def save_array(path, array):
+    """임시 파일 → rename (읽는 쪽이 반쯤 쓴 파일을 열지 않도록)"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def save_prices(close_data, directory=CACHE_DIR):
+    """종가 DataFrame(날짜 × 티커) → .npy 3개"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    values = np.asfortranarray(close_data.round(2).to_numpy(dtype=np.float64))
+    save_array(directory / "dates.npy", close_data.index.values.astype("datetime64[D]"))
+    save_array(directory / "symbols.npy", np.array(close_data.columns, dtype=str))
+    save_array(directory / "close.npy", values)
+    return [directory / name for name in FILES]
+
+
+class PriceCache:
+    """메모리 맵 종가 행렬 + 날짜/티커 축 (열 단위 지연 로드)"""
+
+    def __init__(self, close, dates, symbols):
+        self.close = close
+        self.dates = dates
+        self.symbols = symbols
+        self.position = {symbol: i for i, symbol in enumerate(symbols)}
+
+    def __contains__(self, symbol):
+        return symbol in self.position
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def index(self):
+        return pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="Date")
+
+    def series(self, symbol):
+        """종목 하나의 종가 pd.Series (결측 포함)"""
+        return pd.Series(np.asarray(self.close[:, self.position[symbol]]), index=self.index, name=symbol)
+
+    def frame(self, symbols=None):
+        """여러 종목(기본: 전체)의 종가 DataFrame (복사본)"""
+        if symbols is None:
+            return pd.DataFrame(np.asarray(self.close), index=self.index, columns=self.symbols)
+        columns = [self.position[symbol] for symbol in symbols]
+        return pd.DataFrame(self.close[:, columns], index=self.index, columns=list(symbols))
+
+
+def load_prices(directory=CACHE_DIR, mmap=True):
+    """캐시 열기 (mmap=True 면 실제 데이터는 접근할 때 읽음), 없으면 FileNotFoundError"""
+    directory = Path(directory)
+    missing = [name for name in FILES if not (directory / name).exists()]
+    if missing:
+        raise FileNotFoundError(f"종가 캐시 없음: {directory} ({', '.join(missing)}, fetch_data.py 먼저 실행)")
+    close = np.load(directory / "close.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+    dates = np.load(directory / "dates.npy", allow_pickle=False)
+    symbols = np.load(directory / "symbols.npy", allow_pickle=False).tolist()
+    return PriceCache(close, dates, symbols)
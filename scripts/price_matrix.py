@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+종가 행렬 바이너리 (브라우저 + NumPy 공용)
+- prices.<hash>.f32: little-endian Float32, C 순서 (종목 × 날짜), 결측은 NaN
+  0번 행은 SPY, 이후 stocks.json 의 종목 순서
+- prices.<hash>.json: 헤더 {"data", "dtype", "order", "shape", "symbols", "origin", "days"}
+  날짜 = origin + days[i] 일
+- 브라우저: fetch().arrayBuffer() → new Float32Array(buffer, row * 날짜 수 * 4, 날짜 수) (파싱 없음)
+- Python: load_price_matrix(헤더 경로) → np.memmap (복사 없음)
+
+사용 예:
+    python scripts/price_matrix.py assets/data/prices.<hash>.json --symbol NVDA
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from stocks_schema import decode_entry
+
+DTYPE = "<f4"
+BENCHMARK = "SPY"
+
+
+class PriceMatrixWriter:
+    """종목을 하나씩 받아 행 단위로 바로 기록 (메모리에는 한 행만 유지)"""
+
+    def __init__(self, directory, header, written=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dates = header["dates"]
+        self.scale = header["priceScale"]
+        self.encoding = header["priceEncoding"]
+        self.written = written
+        self.symbols = []
+        self.digest = hashlib.sha256()
+        self.tmp = self.directory / "prices.f32.tmp"
+        self.file = open(self.tmp, "wb")
+        self.add(BENCHMARK, header["spy"])
+
+    def add(self, symbol, entry):
+        values = decode_entry(entry, len(self.dates), self.scale, self.encoding)
+        self.add_values(symbol, [np.nan if v is None else v for v in values])
+
+    def add_values(self, symbol, values):
+        """디코딩된 종가 한 행 (날짜 수 길이, 결측 NaN)"""
+        row = np.asarray(values, dtype=DTYPE).tobytes()
+        self.file.write(row)
+        self.digest.update(row)
+        self.symbols.append(symbol)
+
+    def tap(self, stocks):
+        """종목 이터러블을 그대로 넘기면서 기록 (다른 단계와 한 번의 순회 공유)"""
+        for stock in stocks:
+            self.add(stock["symbol"], stock)
+            yield stock
+
+    def finish(self):
+        """데이터 파일 확정 → 헤더 dict (같은 내용의 파일이 이미 있으면 그대로 사용)"""
+        self.file.close()
+        name = f"prices.{self.digest.hexdigest()[:10]}.f32"
+        path = self.directory / name
+        if path.exists():
+            self.tmp.unlink()
+        else:
+            os.replace(self.tmp, path)
+            if self.written is not None:
+                self.written.append(path)
+
+        origin = date.fromisoformat(self.dates[0]) if self.dates else date.today()
+        return {
+            "data": name,
+            "dtype": DTYPE,
+            "order": "C",
+            "shape": [len(self.symbols), len(self.dates)],
+            "symbols": self.symbols,
+            "origin": origin.isoformat(),
+            "days": [(date.fromisoformat(d) - origin).days for d in self.dates],
+        }
+
+    def abort(self):
+        self.file.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def load_price_matrix(header_path, mmap=True):
+    """헤더 경로 → (종목 리스트, datetime64[D] 날짜 배열, (종목 × 날짜) float32 행렬)"""
+    header_path = Path(header_path)
+    header = json.loads(header_path.read_text(encoding="utf-8"))
+    data_path = header_path.parent / header["data"]
+    shape = tuple(header["shape"])
+    if mmap:
+        matrix = np.memmap(data_path, dtype=header["dtype"], mode="r", shape=shape, order=header["order"])
+    else:
+        matrix = np.fromfile(data_path, dtype=header["dtype"]).reshape(shape, order=header["order"])
+    dates = np.datetime64(header["origin"], "D") + np.asarray(header["days"], dtype="timedelta64[D]")
+    return header["symbols"], dates, matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="종가 행렬 바이너리 확인")
+    parser.add_argument("header", type=Path, help="prices.<hash>.json 경로")
+    parser.add_argument("--symbol", help="종목 하나의 마지막 종가 출력")
+    args = parser.parse_args(argv)
+
+    symbols, dates, matrix = load_price_matrix(args.header)
+    print(f"📐 {matrix.shape[0]}개 종목 × {matrix.shape[1]}일 ({dates[0]} ~ {dates[-1]})")
+    if args.symbol:
+        row = matrix[symbols.index(args.symbol.upper())]
+        valid = np.flatnonzero(~np.isnan(row))
+        if len(valid):
+            print(f"  {args.symbol.upper()}: {row[valid[-1]]:.2f} ({dates[valid[-1]]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
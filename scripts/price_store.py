@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+종가 로컬 저장소 (날짜 × 티커)
+- data/prices/ 아래 월별 세그먼트(YYYY-MM.csv) + manifest.json 으로 저장하고 다음 실행 때 재사용
+  내용이 바뀐 세그먼트만 다시 씀 (가장 오래된 달은 요청 구간 앞의 기존 행을 유지 → 구간이 하루씩 밀려도 그대로)
+  · 재조정 종목이 없는 날: 이번 달(head) + manifest 만 바뀜
+  · 저장하는 종가는 yfinance 수정 종가(배당/분할 반영) → 배당락/분할 종목이 있으면 그 종목 값이 있는 모든 달이 바뀜
+    S&P 500 은 거의 매 거래일 배당락 종목이 있으므로 실제로는 대부분의 날 전체 세그먼트를 다시 씀
+    (세그먼트가 줄이는 것은 재조정 없는 날과 종목 추가 때의 쓰기)
+  · 원 종가 + 종목별 조정 비율로 나눠 저장하지 않는 이유: 소스는 수정 종가만 주므로 비율을 소수 2자리 종가에서
+    구하게 되고, 그렇게 복원한 종가는 전체 재다운로드 값과 0.01~0.02 어긋남 (기간 수익률 최대 0.3%p)
+- 예전 단일 파일(data/prices.csv)이 있으면 읽어서 세그먼트로 옮기고 삭제
+- 티커별 마지막 저장일 이후 구간만 다시 받도록 다운로드 계획 수립
+- 겹치는 하루의 종가가 반올림 오차(0.01) 넘게 바뀐 종목은 분할/배당 재조정으로 보고 전체 구간 재다운로드
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from fileio import write_if_changed
+
+STORE_PATH = Path(__file__).parent.parent / "data" / "prices"
+MANIFEST_NAME = "manifest.json"
+LEGACY_NAME = "prices.csv"
+
+# 겹치는 날짜의 종가(소수 2자리)가 이 금액보다 더 달라지면 (분할/배당 재조정) 전체 재다운로드
+# yfinance Close 는 수정 종가 → 분기 배당도 과거 종가를 0.2~1% 바꾸므로 비율이 아니라 반올림 오차 수준으로 비교
+REVISION_TOLERANCE = 0.01
+
+
+def manifest_path(path=STORE_PATH):
+    return Path(path) / MANIFEST_NAME
+
+
+def read_segment(path):
+    segment = pd.read_csv(path, index_col=0, parse_dates=True)
+    segment.index.name = "Date"
+    return segment
+
+
+def load_store(path=STORE_PATH):
+    """저장된 종가 행렬 로드 (세그먼트 병합, 없으면 빈 DataFrame)"""
+    path = Path(path)
+    manifest = manifest_path(path)
+    if not manifest.exists():
+        legacy = path.parent / LEGACY_NAME
+        return read_segment(legacy) if legacy.exists() else pd.DataFrame()
+
+    info = json.loads(manifest.read_text(encoding="utf-8"))
+    segments = [read_segment(path / segment["name"]) for segment in info["segments"]]
+    if not segments:
+        return pd.DataFrame()
+    store = pd.concat(segments, sort=False).reindex(columns=info["columns"])
+    store.index.name = "Date"
+    return store
+
+
+def save_store(close_data, path=STORE_PATH):
+    """종가 행렬을 월별 세그먼트로 저장 → 다시 쓴 세그먼트 이름 리스트"""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    months = close_data.index.to_period("M")
+    segments = []
+    changed = []
+    for month in months.unique():
+        name = f"{month}.csv"
+        frame = close_data[months == month]
+        # 가장 오래된 달: 요청 구간 앞의 기존 행 유지
+        if not segments and (path / name).exists():
+            existing = read_segment(path / name)
+            frame = pd.concat([existing[existing.index < frame.index.min()], frame], sort=False)
+        # 그 달에 값이 하나도 없는 종목은 빼서 지난 달 파일이 종목 추가로 바뀌지 않게 함
+        frame = frame.dropna(axis=1, how="all")
+        buffer = io.StringIO()
+        # 출력과 같은 소수 2자리로 저장 (재로드 후 반올림이 다시 일어나지 않도록)
+        frame.to_csv(buffer, float_format="%.2f")
+        if write_if_changed(path / name, buffer.getvalue()):
+            changed.append(name)
+        segments.append({"name": name, "rows": len(frame)})
+
+    # 구간에서 빠진 달 삭제
+    keep = {segment["name"] for segment in segments}
+    for stale in path.glob("*.csv"):
+        if stale.name not in keep:
+            stale.unlink()
+
+    manifest = {
+        "version": 1,
+        "lastDate": close_data.index.max().strftime("%Y-%m-%d") if len(close_data) else None,
+        "head": segments[-1]["name"] if segments else None,
+        "columns": list(close_data.columns),
+        "segments": segments,
+    }
+    write_if_changed(manifest_path(path), json.dumps(manifest, indent=1) + "\n")
+
+    legacy = path.parent / LEGACY_NAME
+    if legacy.exists():
+        legacy.unlink()
+    return changed
+
+
+def plan_downloads(store, symbols, start_date):
+    """
+    다운로드 계획: {요청 시작일: [티커...]}
+    - 저장소에 없는 티커는 전체 기간(start_date)부터
+    - 저장된 티커는 마지막 확정 종가일(끝에서 두 번째 날)부터 겹쳐서 받음
+      (마지막 날은 장중 가격일 수 있어 덮어쓰고, 겹친 날로 재조정 여부를 확인)
+    """
+    start_ts = pd.Timestamp(start_date).normalize()
+    plan = {}
+
+    # 저장소가 요청 구간 앞부분을 덮지 못하면 전부 새로 받음
+    covers_window = not store.empty and store.index.min() <= start_ts + pd.Timedelta(days=7)
+
+    for symbol in symbols:
+        if not covers_window or symbol not in store.columns:
+            plan.setdefault(start_ts, []).append(symbol)
+            continue
+
+        valid = store[symbol].dropna()
+        if len(valid) < 2:
+            plan.setdefault(start_ts, []).append(symbol)
+            continue
+
+        plan.setdefault(valid.index[-2], []).append(symbol)
+
+    return plan
+
+
+def find_revised(store, fetched, check_date):
+    """겹치는 날짜(check_date)의 종가가 반올림 오차 이상 달라진 티커 (전체 재다운로드 대상)"""
+    if check_date not in store.index or check_date not in fetched.index:
+        return []
+
+    revised = []
+    for symbol in fetched.columns:
+        if symbol not in store.columns:
+            continue
+        old = store.at[check_date, symbol]
+        new = fetched.at[check_date, symbol]
+        if pd.isna(old) or pd.isna(new):
+            continue
+        # 저장소와 같은 소수 2자리로 맞춘 뒤 비교 (부동소수 오차 여유)
+        if abs(round(float(new), 2) - float(old)) > REVISION_TOLERANCE + 1e-9:
+            revised.append(symbol)
+    return revised
+
+
+def merge_store(store, fetched, symbols, start_date):
+    """새로 받은 종가를 저장소에 병합 (겹치는 값은 새 값 우선) 후 요청 구간으로 정리"""
+    if not fetched.empty:
+        fetched = fetched.copy()
+        fetched.index = pd.DatetimeIndex(fetched.index).tz_localize(None).normalize()
+        fetched = fetched[~fetched.index.duplicated(keep="last")]
+
+    if store.empty:
+        merged = fetched.copy()
+    elif fetched.empty:
+        merged = store.copy()
+    else:
+        merged = fetched.combine_first(store)
+
+    merged = merged.sort_index()
+    merged = merged[merged.index >= pd.Timestamp(start_date).normalize()]
+
+    columns = [s for s in symbols if s in merged.columns]
+    merged = merged[columns].dropna(how="all")
+    merged.index.name = "Date"
+    return merged
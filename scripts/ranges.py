@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+임의 기간 SPY 대비 성과 순위 (누적 로그 수익률 인덱스)
+- 공통 거래일 축에서 종목별 누적 로그 수익률 cum[t] = log(종가[t] / 첫 종가) 를 미리 계산
+  (결측일은 직전 종가 유지, 상장 전은 0)
+- 시작가용 start_cum 은 결측일에 다음 종가를 사용 (performance.py 와 같이 시작일 이후 첫 유효 종가)
+- [start, end] 수익률: 첫 로그 종가 base 로 두 날의 종가(소수 2자리)를 복원해 (종료가 - 시작가) / 시작가
+  → 종목 수와 무관하게 벡터 연산 몇 번, 계산식이 performance.py 와 같아 반올림 경계 값까지 일치
+- 시작가: 시작일 이후 첫 유효 종가 / 종료가: 종료일 이전 마지막 유효 종가
+- 유효 종가가 종료일까지 2개 미만이거나 [start, end] 안에 없으면 NaN
+- 인덱스는 data/log_index.npz 에 저장 (종가 저장소 manifest 보다 오래됐으면 다시 생성)
+
+사용 예:
+    python scripts/ranges.py --start 2026-09-17              # 9/17 FOMC 이후
+    python scripts/ranges.py --start 2026-07-01 --end 2026-09-30 --top 10
+    python scripts/ranges.py --period YTD --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from performance import get_date_ranges, round2
+from price_store import STORE_PATH, load_store, manifest_path
+
+INDEX_PATH = STORE_PATH.parent / "log_index.npz"
+BENCHMARK = "SPY"
+
+
+class LogReturnIndex:
+    """
+    종목별 누적 로그 수익률 (날짜 × 티커)
+    - cum: 종료가용 (결측일은 직전 종가), start_cum: 시작가용 (결측일은 다음 종가)
+    - base: 종목별 첫 로그 종가, seen: 날짜별 누적 유효 종가 수
+    """
+
+    def __init__(self, dates, symbols, base, cum, start_cum, seen):
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.symbols = list(symbols)
+        self.base = base
+        self.cum = cum
+        self.start_cum = start_cum
+        self.seen = seen
+        self.position = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_close(cls, close_data):
+        """종가 행렬(소수 2자리로 반올림해서 사용) → 인덱스"""
+        values = close_data.astype(float).round(2).to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            valid = values > 0
+        n_dates = len(values)
+        first = np.where(valid.any(axis=0), valid.argmax(axis=0), 0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_price = pd.DataFrame(np.log(np.where(valid, values, np.nan)))
+        base = log_price.to_numpy()[first, np.arange(values.shape[1])] if n_dates else np.zeros(values.shape[1])
+        base = np.nan_to_num(base, nan=0.0)
+        # 결측일: 종료가는 직전 종가, 시작가는 다음 종가 (계산 불가 칸은 seen 으로 걸러냄)
+        cum = np.nan_to_num(log_price.ffill().to_numpy() - base, nan=0.0)
+        start_cum = np.nan_to_num(log_price.bfill().to_numpy() - base, nan=0.0)
+        seen = np.cumsum(valid, axis=0, dtype=np.int32)
+
+        dates = close_data.index.values.astype("datetime64[D]")
+        return cls(dates, close_data.columns, base, cum, start_cum, seen)
+
+    def save(self, path=INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, dates=self.dates, symbols=np.array(self.symbols),
+                                base=self.base, cum=self.cum, start_cum=self.start_cum, seen=self.seen)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """저장된 인덱스 (예전 형식이라 키가 없으면 KeyError)"""
+        with np.load(path) as data:
+            return cls(data["dates"], data["symbols"].tolist(), data["base"], data["cum"], data["start_cum"], data["seen"])
+
+    def window(self, start, end=None):
+        """[start, end] 날짜 → (시작 행, 종료 행) (해당 거래일이 없으면 None)"""
+        i = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date()), side="left"))
+        j = len(self.dates) - 1 if end is None else \
+            int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date()), side="right")) - 1
+        if i >= len(self.dates) or j < i:
+            return None
+        return i, j
+
+    def returns(self, start, end=None):
+        """모든 종목의 [start, end] 수익률(%) 배열 (계산 불가는 NaN)"""
+        bounds = self.window(start, end)
+        if bounds is None:
+            return np.full(len(self.symbols), np.nan)
+        i, j = bounds
+        # 로그 오차는 0.005 보다 훨씬 작으므로 반올림하면 원래 종가
+        end_price = np.round(np.exp(self.base + self.cum[j]), 2)
+        start_price = np.round(np.exp(self.base + self.start_cum[i]), 2)
+        result = (end_price - start_price) / start_price * 100
+        # 종료일까지 종가가 2개 미만이거나 [start, end] 안에 종가가 없는 종목 제외
+        in_window = self.seen[j] - (self.seen[i - 1] if i else 0)
+        result[(self.seen[j] < 2) | (in_window == 0)] = np.nan
+        return result
+
+    def rank(self, start, end=None, top_n=20, benchmark=BENCHMARK):
+        """
+        SPY 대비 초과수익 상위 top_n → (SPY 수익률, [{"symbol", "perf", "vsSpy"}])
+        페이지와 같게 소수 2자리 수익률끼리 비교
+        """
+        result = round2(self.returns(start, end))
+        spy_perf = result[self.position[benchmark]] if benchmark in self.position else np.nan
+        spy_perf = 0.0 if np.isnan(spy_perf) else float(spy_perf)
+
+        excess = result - spy_perf
+        if benchmark in self.position:
+            excess[self.position[benchmark]] = np.nan
+        candidates = np.flatnonzero(~np.isnan(excess))
+        if len(candidates) > top_n:
+            candidates = candidates[np.argpartition(-excess[candidates], top_n - 1)[:top_n]]
+        order = candidates[np.argsort(-excess[candidates], kind="stable")]
+
+        return spy_perf, [
+            {"symbol": self.symbols[k], "perf": float(result[k]), "vsSpy": round(float(excess[k]), 2)}
+            for k in order
+        ]
+
+
+def load_index(index_path=INDEX_PATH, store_path=STORE_PATH):
+    """저장된 인덱스 로드 (없거나 예전 형식이거나 종가 저장소보다 오래됐으면 다시 생성 후 저장)"""
+    index_path, manifest = Path(index_path), manifest_path(store_path)
+    if index_path.exists() and (not manifest.exists()
+                                or index_path.stat().st_mtime >= manifest.stat().st_mtime):
+        try:
+            return LogReturnIndex.load(index_path)
+        except KeyError:
+            pass
+
+    store = load_store(store_path)
+    if store.empty:
+        raise FileNotFoundError(f"종가 저장소 없음: {store_path} (fetch_data.py 먼저 실행)")
+    index = LogReturnIndex.from_close(store)
+    index.save(index_path)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="임의 기간 SPY 대비 성과 순위")
+    parser.add_argument("--start", help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", help="종료일 (YYYY-MM-DD, 기본: 마지막 거래일)")
+    parser.add_argument("--period", choices=list(get_date_ranges().keys()), help="기본 기간 (--start 대신)")
+    parser.add_argument("--top", type=int, default=20, help="상위 종목 수")
+    parser.add_argument("--json", action="store_true", help="JSON 출력")
+    parser.add_argument("--data-dir", type=Path, default=STORE_PATH.parent, help="데이터 디렉터리 (기본: data/)")
+    args = parser.parse_args(argv)
+
+    if not args.start and not args.period:
+        parser.error("--start 또는 --period 필요")
+    start = get_date_ranges()[args.period] if args.period else args.start
+
+    index = load_index(args.data_dir / INDEX_PATH.name, args.data_dir / STORE_PATH.name)
+    started = time.perf_counter()
+    spy_perf, ranked = index.rank(start, args.end, args.top)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    bounds = index.window(start, args.end)
+    if bounds is None:
+        print("❌ 해당 기간에 거래일이 없습니다")
+        return 1
+    first_day, last_day = (str(index.dates[k]) for k in bounds)
+
+    if args.json:
+        print(json.dumps({"start": first_day, "end": last_day, "spyPerf": spy_perf, "top": ranked},
+                         ensure_ascii=False))
+        return 0
+
+    print(f"📅 {first_day} ~ {last_day} (SPY {spy_perf:+.2f}%, {len(index.symbols)}개 종목, {elapsed_ms:.1f}ms)")
+    for i, stock in enumerate(ranked, 1):
+        print(f"  {i:2}. {stock['symbol']:6} {stock['perf']:+8.2f}% (SPY 대비 {stock['vsSpy']:+.2f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+종가 행렬(날짜 × 티커) 기반 위험/상대강도 지표
+- 일간 수익률 행렬 한 번으로 모든 종목의 지표를 NumPy 연산으로 계산 (종목별 루프 없음)
+- beta: SPY 대비 베타 (같은 날 둘 다 수익률이 있는 날 기준)
+- volatility: 연율화 변동성(%)
+- maxDrawdown: 최대 낙폭(%, 음수)
+- sharpe: 연율화 평균 수익률 / 연율화 변동성 (무위험 수익률 RISK_FREE_RATE 차감)
+- relStrength: 최근 RS_WINDOW 거래일 SPY 대비 상대 수익률(%)
+- rsRating: relStrength 의 전체 종목 내 백분위 (1~99)
+"""
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.0
+RS_WINDOW = 63
+# 이보다 일간 수익률이 적으면 계산하지 않음
+MIN_OBSERVATIONS = 20
+
+RISK_FIELDS = ["beta", "volatility", "maxDrawdown", "sharpe", "relStrength", "rsRating"]
+
+
+def daily_returns(values):
+    """(날짜 × 티커) 가격 배열 → 일간 수익률 (첫 행/결측 인접은 NaN)"""
+    returns = np.full(values.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = values[1:] / values[:-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def max_drawdown(values):
+    """종목별 최대 낙폭(%) — 결측은 직전 값 유지"""
+    filled = pd.DataFrame(values).ffill().to_numpy()
+    peak = np.fmax.accumulate(filled, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = filled / peak - 1
+    drawdown[~np.isfinite(drawdown)] = np.inf
+    worst = drawdown.min(axis=0)
+    return np.where(np.isfinite(worst), worst, np.nan) * 100
+
+
+def relative_strength(values, benchmark, window=RS_WINDOW):
+    """최근 window 거래일 SPY 대비 상대 수익률(%) (창 시작 이후 첫 유효가 기준)"""
+    start = max(len(values) - window - 1, 0)
+    recent = pd.DataFrame(values[start:])
+    first = recent.bfill().to_numpy()[0]
+    last = recent.ffill().to_numpy()[-1]
+    spy = pd.Series(benchmark[start:]).dropna()
+    if spy.empty:
+        return np.full(values.shape[1], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (last / first) / (spy.iloc[-1] / spy.iloc[0])
+    return (ratio - 1) * 100
+
+
+def calculate_risk_matrix(close_data, benchmark="SPY"):
+    """
+    위험/상대강도 지표 행렬: index=지표(RISK_FIELDS), columns=티커
+    계산 불가(데이터 부족, 변동성 0)는 NaN
+    """
+    prices = close_data.round(2)
+    values = prices.to_numpy(dtype=float)
+    returns = daily_returns(values)
+    valid = ~np.isnan(returns)
+    counts = valid.sum(axis=0)
+    enough = counts >= MIN_OBSERVATIONS
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(returns, axis=0) / counts
+        std = np.sqrt(np.nansum((returns - mean) ** 2, axis=0) / (counts - 1))
+
+        # 베타: 종목과 SPY 모두 수익률이 있는 날만 사용
+        spy = returns[:, prices.columns.get_loc(benchmark)]
+        paired = valid & ~np.isnan(spy)[:, None]
+        n = paired.sum(axis=0)
+        x = np.where(paired, returns, 0.0)
+        y = np.where(paired, spy[:, None], 0.0)
+        x_mean = x.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        cov = ((x - x_mean) * (y - y_mean) * paired).sum(axis=0) / (n - 1)
+        var = (((y - y_mean) ** 2) * paired).sum(axis=0) / (n - 1)
+        beta = np.where((n >= MIN_OBSERVATIONS) & (var > 0), cov / var, np.nan)
+
+        volatility = std * np.sqrt(TRADING_DAYS) * 100
+        excess = mean * TRADING_DAYS - RISK_FREE_RATE
+        sharpe = np.where(std > 0, excess / (std * np.sqrt(TRADING_DAYS)), np.nan)
+
+    drawdown = max_drawdown(values)
+    rs = relative_strength(values, values[:, prices.columns.get_loc(benchmark)])
+
+    # 상대강도 백분위 (계산 가능한 종목끼리)
+    rs_rank = pd.Series(np.where(enough, rs, np.nan)).rank(pct=True).to_numpy()
+    rs_rating = np.clip(np.round(rs_rank * 99), 1, 99)
+
+    result = np.vstack([beta, volatility, drawdown, sharpe, rs, rs_rating])
+    result[:, ~enough] = np.nan
+    matrix = pd.DataFrame(np.round(result, 2), index=RISK_FIELDS, columns=close_data.columns)
+    matrix.loc["rsRating"] = np.round(matrix.loc["rsRating"])
+    return matrix
+
+
+def risk_dict(matrix, symbol):
+    """한 종목의 지표 dict (계산 불가 지표 제외)"""
+    column = matrix[symbol]
+    return {
+        field: (int(value) if field == "rsRating" else float(value))
+        for field, value in column.items()
+        if not np.isnan(value)
+    }
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+로컬 조회 API 서버 (오프라인, 표준 라이브러리 HTTP 서버)
+- 시작할 때 stocks.json (+ 종목 정보 캐시의 섹터/이름)을 한 번 읽어 메모리 인덱스 구성
+  stocks.json 이 없으면 (커밋하지 않는 파생 파일) 종가 저장소(data/prices/)에서 fetch_data 와 같은 계산으로 구성
+  · 종목 → 행 번호 맵, (종목 × 날짜) 종가 행렬
+  · 기간별 (섹터별) SPY 대비 초과수익 내림차순 정렬 배열 → 상위 N 은 앞에서 N 개만 읽음
+- 응답은 JSON, 본문 해시 ETag (If-None-Match 가 같으면 304), Server-Timing 헤더로 처리 시간
+- 경로별 응답 시간(p50/p95/최대)은 /metrics, 종료할 때 data/server_metrics.json
+- 섹터는 stocks.json stockInfo + 종목 정보 캐시 (fetch_data 가 전체 종목 이름/섹터를 캐시에 유지)
+  → 요청 실패 등으로 섹터를 모르는 종목은 섹터 필터에서 빠짐, 응답의 unclassified(섹터 모르는 순위 종목 수)/coverage 로 누락 규모 표시
+
+엔드포인트:
+    GET /rankings?period=3M&n=50&sector=Energy   기간별 SPY 대비 상위 종목 (sector: 영문/한글, 섹터 아는 종목만)
+    GET /series/NVDA?period=YTD                  종가 + 기간 시작 기준 수익률 (period 생략 시 전체)
+    GET /info/NVDA                               종목 정보 + 기간별 수익률/순위 + 위험 지표
+    GET /meta                                    데이터 기준 시각, 종목 수, 기간, 섹터
+    GET /metrics                                 경로별 요청 수/응답 시간
+
+사용 예:
+    python scripts/server.py --port 8765
+    curl 'http://127.0.0.1:8765/rankings?period=3M&n=50&sector=Energy'
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from fetch_data import iter_stocks, process_spy
+from generate_html import DATA_PATH, TOP_N, rebase
+from metrics import Metrics
+from performance import calculate_performance_matrix, get_date_ranges, history_start
+from price_store import STORE_PATH, load_store, manifest_path
+from risk import calculate_risk_matrix
+from stock_info import CACHE_PATH, SECTOR_MAP, load_cache
+from stocks_schema import StocksReader, decode_entry
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_N = 500
+# 경로별로 보관할 최근 응답 시간 개수
+LATENCY_WINDOW = 10000
+METRICS_NAME = "server_metrics.json"
+BENCHMARK = "SPY"
+
+SECTOR_NAMES = {korean: english for english, korean in SECTOR_MAP.items()}
+
+
+class QueryError(Exception):
+    """잘못된 요청 (status 코드 포함)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def sector_key(sector):
+    """영문/한글 섹터 이름 → 영문 소문자 키 (모르는 이름은 그대로 소문자)"""
+    sector = sector.strip()
+    return SECTOR_NAMES.get(sector, sector).lower()
+
+
+def read_stocks(data_path):
+    """stocks.json → (기준 시각, 날짜, 항목 [SPY, 종목...], 종가 행렬, stockInfo)"""
+    with StocksReader(data_path) as reader:
+        header = reader.header
+        entries = [header["spy"], *reader.iter_stocks()]
+        trailer = reader.trailer()
+
+    n_dates = len(header["dates"])
+    prices = np.full((len(entries), n_dates), np.nan)
+    for i, entry in enumerate(entries):
+        values = decode_entry(entry, n_dates, header["priceScale"], header["priceEncoding"])
+        prices[i] = [np.nan if v is None else v for v in values]
+    return header["lastUpdated"], header["dates"], entries, prices, trailer.get("stockInfo", {})
+
+
+def read_store(store_path):
+    """종가 저장소 → read_stocks 와 같은 형태 (fetch_data 와 같은 구간/종목 제외 규칙, stockInfo 없음)"""
+    close_data = load_store(store_path)
+    if close_data.empty or BENCHMARK not in close_data.columns:
+        raise FileNotFoundError(f"stocks.json 도 종가 저장소도 없음: {store_path} (fetch_data.py 먼저 실행)")
+    date_ranges = get_date_ranges()
+    close_data = close_data[close_data.index >= pd.Timestamp(history_start(date_ranges)).normalize()].round(2)
+
+    perf_matrix = calculate_performance_matrix(close_data, date_ranges)
+    risk_matrix = calculate_risk_matrix(close_data)
+    tickers = [symbol for symbol in close_data.columns if symbol != BENCHMARK]
+    entries = [process_spy(close_data, perf_matrix, risk_matrix),
+               *iter_stocks(close_data, tickers, perf_matrix, risk_matrix=risk_matrix)]
+    symbols = [BENCHMARK] + [entry["symbol"] for entry in entries[1:]]
+
+    last_updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest_path(store_path).stat().st_mtime))
+    dates = close_data.index.strftime("%Y-%m-%d").tolist()
+    return last_updated, dates, entries, close_data[symbols].to_numpy(dtype=float).T, {}
+
+
+class QueryIndex:
+    """stocks.json (없으면 종가 저장소) 한 번 로드 → 순위/시리즈/정보 조회용 인덱스 (읽기 전용, 스레드 간 공유)"""
+
+    def __init__(self, data_path=DATA_PATH, cache_path=CACHE_PATH, store_path=None):
+        data_path = Path(data_path)
+        if data_path.exists():
+            self.source = data_path
+            self.last_updated, self.dates, entries, self.prices, stock_info = read_stocks(data_path)
+        else:
+            store_path = Path(store_path or data_path.parent / STORE_PATH.name)
+            self.source = manifest_path(store_path)
+            self.last_updated, self.dates, entries, self.prices, stock_info = read_store(store_path)
+
+        self.symbols = [BENCHMARK] + [entry["symbol"] for entry in entries[1:]]
+        self.position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.periods = list(get_date_ranges().keys())
+
+        self.spy_performance = {period: entries[0]["performance"].get(period) or 0 for period in self.periods}
+        self.performance = {
+            period: np.array([entry["performance"].get(period, np.nan) for entry in entries], dtype=float)
+            for period in self.periods
+        }
+        self.performance_raw = [entry["performance"] for entry in entries]
+        self.risk = [entry.get("risk", {}) for entry in entries]
+
+        # 이름/섹터: stocks.json 의 상위 종목 정보 + 종목 정보 캐시 (캐시에 없는 종목은 섹터 없음)
+        self.stock_info = stock_info
+        cache = load_cache(cache_path) if Path(cache_path).exists() else {}
+        self.names, self.sectors = {}, {}
+        for symbol in self.symbols:
+            info = self.stock_info.get(symbol) or {}
+            cached = {field: value["value"] for field, value in cache.get(symbol, {}).items()}
+            self.names[symbol] = info.get("name") or cached.get("name") or symbol
+            sector = info.get("sectorEn") or cached.get("sectorEn")
+            if sector and sector != "N/A":
+                self.sectors[symbol] = sector
+
+        # 기간별 (섹터별) 정렬 배열: 초과수익 내림차순, 동점은 stocks.json 순서 (페이지 순위와 같음)
+        sector_of = np.array([sector_key(self.sectors.get(s, "")) for s in self.symbols])
+        self.sector_names = sorted(set(self.sectors.values()))
+        self.order = {}
+        self.unclassified = {}
+        self.rank = {}
+        for period, perf in self.performance.items():
+            excess = perf - self.spy_performance[period]
+            valid = np.flatnonzero(~np.isnan(excess))
+            valid = valid[valid != self.position[BENCHMARK]]
+            order = valid[np.argsort(-excess[valid], kind="stable")]
+            self.order[period, None] = order
+            self.unclassified[period] = int(np.count_nonzero(sector_of[order] == ""))
+            for sector in self.sector_names:
+                key = sector_key(sector)
+                self.order[period, key] = order[sector_of[order] == key]
+            rank = np.zeros(len(self.symbols), dtype=int)
+            rank[order] = np.arange(1, len(order) + 1)
+            self.rank[period] = rank
+
+        self.version = hashlib.sha256(
+            f"{self.source.stat().st_mtime_ns}:{self.source.stat().st_size}".encode()
+        ).hexdigest()[:10]
+
+    def _period(self, period):
+        period = period or "YTD"
+        if period not in self.performance:
+            raise QueryError(400, f"알 수 없는 기간: {period} (가능: {', '.join(self.periods)})")
+        return period
+
+    def _symbol(self, symbol):
+        symbol = symbol.upper().replace(".", "-")
+        if symbol not in self.position:
+            raise QueryError(404, f"종목 없음: {symbol}")
+        return symbol
+
+    def rankings(self, period=None, n=TOP_N, sector=None):
+        period = self._period(period)
+        key = sector_key(sector) if sector else None
+        if (period, key) not in self.order:
+            raise QueryError(404, f"섹터 없음: {sector} (가능: {', '.join(self.sector_names)})")
+        order = self.order[period, key]
+        perf = self.performance[period]
+        spy_perf = self.spy_performance[period]
+        result = {
+            "period": period,
+            "sector": sector,
+            "spyPerf": spy_perf,
+            "total": len(order),
+        }
+        if key:
+            # 섹터를 모르는 종목은 어느 섹터 필터에도 안 나옴 → 얼마나 빠졌는지 같이 반환
+            ranked = len(self.order[period, None])
+            unclassified = self.unclassified[period]
+            result["unclassified"] = unclassified
+            result["coverage"] = round((ranked - unclassified) / ranked, 4) if ranked else None
+        result["items"] = [
+            {
+                "rank": rank,
+                "symbol": self.symbols[i],
+                "name": self.names[self.symbols[i]],
+                "sector": self.sectors.get(self.symbols[i]),
+                "perf": float(perf[i]),
+                "vsSpy": round(float(perf[i]) - spy_perf, 2),
+            }
+            for rank, i in enumerate(order[:n].tolist(), 1)
+        ]
+        return result
+
+    def series(self, symbol, period=None):
+        symbol = self._symbol(symbol)
+        start = 0
+        if period:
+            period = self._period(period)
+            start = bisect_left(self.dates, get_date_ranges()[period].strftime("%Y-%m-%d"))
+        values = [None if np.isnan(v) else float(v) for v in self.prices[self.position[symbol], start:]]
+        return {
+            "symbol": symbol,
+            "period": period,
+            "dates": self.dates[start:],
+            "prices": values,
+            "returns": rebase(values),
+        }
+
+    def info(self, symbol):
+        symbol = self._symbol(symbol)
+        i = self.position[symbol]
+        return {
+            "symbol": symbol,
+            "name": self.names[symbol],
+            "sector": self.sectors.get(symbol),
+            "info": self.stock_info.get(symbol),
+            "performance": self.performance_raw[i],
+            "vsSpy": {
+                period: round(perf - self.spy_performance[period], 2)
+                for period, perf in self.performance_raw[i].items() if perf is not None
+            },
+            "rank": {period: int(self.rank[period][i]) or None for period in self.periods},
+            "risk": self.risk[i],
+        }
+
+    def meta(self):
+        return {
+            "lastUpdated": self.last_updated,
+            "version": self.version,
+            "symbols": len(self.symbols) - 1,
+            "dates": [self.dates[0], self.dates[-1]] if self.dates else [],
+            "periods": self.periods,
+            "sectors": self.sector_names,
+            "classified": sum(symbol != BENCHMARK for symbol in self.sectors),
+        }
+
+
+class LatencyStats:
+    """경로별 응답 시간 (최근 LATENCY_WINDOW 개)"""
+
+    def __init__(self):
+        self.samples = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def record(self, route, seconds):
+        with self.lock:
+            self.samples.setdefault(route, deque(maxlen=LATENCY_WINDOW)).append(seconds * 1000)
+            self.counts[route] = self.counts.get(route, 0) + 1
+
+    def summary(self):
+        with self.lock:
+            result = {}
+            for route, samples in self.samples.items():
+                values = np.array(samples)
+                result[route] = {
+                    "requests": self.counts[route],
+                    "p50Ms": round(float(np.percentile(values, 50)), 3),
+                    "p95Ms": round(float(np.percentile(values, 95)), 3),
+                    "maxMs": round(float(values.max()), 3),
+                }
+            return result
+
+
+def make_handler(index, stats, quiet=False):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "spy-outperform"
+
+        def do_GET(self):
+            started = time.perf_counter()
+            url = urlsplit(self.path)
+            parts = [unquote(p) for p in url.path.split("/") if p]
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            route = "/" + (parts[0] if parts else "")
+            try:
+                status, body = 200, self.route(parts, query)
+            except QueryError as e:
+                status, body = e.status, {"error": str(e)}
+            except ValueError as e:
+                status, body = 400, {"error": str(e)}
+
+            payload = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            etag = f'"{index.version}-{hashlib.sha256(payload).hexdigest()[:16]}"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            if payload:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            elapsed = time.perf_counter() - started
+            self.send_header("Server-Timing", f"app;dur={elapsed * 1000:.3f}")
+            self.end_headers()
+            self.wfile.write(payload)
+            stats.record(route, elapsed)
+
+        def route(self, parts, query):
+            name = parts[0] if parts else ""
+            if name == "rankings" and len(parts) == 1:
+                n = min(max(int(query.get("n", TOP_N)), 1), MAX_N)
+                return index.rankings(query.get("period"), n, query.get("sector"))
+            if name == "series" and len(parts) == 2:
+                return index.series(parts[1], query.get("period"))
+            if name == "info" and len(parts) == 2:
+                return index.info(parts[1])
+            if name in ("", "meta") and len(parts) <= 1:
+                return index.meta()
+            if name == "metrics" and len(parts) == 1:
+                return stats.summary()
+            raise QueryError(404, f"알 수 없는 경로: /{'/'.join(parts)}")
+
+        def log_message(self, format, *args):
+            if not quiet:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def serve(data_path=DATA_PATH, host=HOST, port=PORT, cache_path=CACHE_PATH, quiet=False):
+    data_path = Path(data_path)
+    metrics = Metrics("server", data_path.parent / METRICS_NAME)
+    with metrics.stage("load") as stage:
+        index = QueryIndex(data_path, cache_path)
+        stage["items"] = len(index.symbols)
+        stage["source"] = index.source.name
+        if index.source == data_path:
+            stage["bytes"] = data_path.stat().st_size
+
+    stats = LatencyStats()
+    server = ThreadingHTTPServer((host, port), make_handler(index, stats, quiet))
+    print(f"🌐 http://{host}:{server.server_port} ({len(index.symbols) - 1}개 종목, 기준 {index.last_updated},"
+          f" 로드 {metrics.to_dict()['stages']['load']['seconds'] * 1000:.0f}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  서버 종료")
+    finally:
+        server.server_close()
+        metrics.set("latency", stats.summary())
+        metrics.finish()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 조회 API 서버 (stocks.json 기반)")
+    parser.add_argument("--data", type=Path, default=DATA_PATH,
+                        help="stocks.json 경로 (없으면 같은 디렉터리의 prices/ 종가 저장소에서 계산)")
+    parser.add_argument("--cache", type=Path, help="종목 정보 캐시 경로 (기본: stocks.json 옆 info_cache.json)")
+    parser.add_argument("--host", default=HOST, help=f"바인드 주소 (기본: {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"포트 (기본: {PORT}, 0 이면 자동)")
+    parser.add_argument("--quiet", action="store_true", help="요청 로그 출력 안 함")
+    args = parser.parse_args()
+    serve(args.data, args.host, args.port, args.cache or args.data.parent / CACHE_PATH.name, args.quiet)
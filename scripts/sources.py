@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+가격/메타데이터 소스
+- PriceSource: download(종가 행렬) + info(yfinance .info 형식 dict) + quotes(최신 시세) 인터페이스
+- YFinanceSource: yfinance (필요할 때만 import)
+- SyntheticSource: 네트워크 없이 결정적인 랜덤워크 종가 + 메타데이터 생성
+- FixtureSource: 기록해 둔 종가 CSV + info JSON 재생
+- RecordingSource: 다른 소스의 응답을 fixture 로 기록
+"""
+
+import json
+import threading
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SECTORS = [
+    'Technology', 'Healthcare', 'Financial Services', 'Consumer Cyclical',
+    'Consumer Defensive', 'Communication Services', 'Industrials', 'Energy',
+    'Utilities', 'Real Estate', 'Basic Materials',
+]
+
+
+class PriceSource:
+    """가격/메타데이터 소스 인터페이스"""
+
+    name = "base"
+    # info 요청 속도 제한 (초당 요청 수, None 이면 제한 없음)
+    max_rate = None
+
+    def universe(self):
+        """소스가 정하는 종목 목록 (없으면 None → --universe 목록 사용)"""
+        return None
+
+    def download(self, symbols, start, end):
+        """종가 행렬 (index=날짜, columns=티커, 데이터 없으면 빈 DataFrame)"""
+        raise NotImplementedError
+
+    def info(self, symbol):
+        """종목 메타데이터 (yfinance .info 형식)"""
+        raise NotImplementedError
+
+    def quotes(self, symbols):
+        """
+        최신 시세 pd.Series (index=티커, 시세가 없는 종목은 빠짐)
+        기본: 최근 며칠 종가 중 마지막 값 (장중 시세를 따로 주는 소스는 재정의)
+        """
+        now = pd.Timestamp.now()
+        close = self.download(list(symbols), now.normalize() - pd.Timedelta(days=10), now + pd.Timedelta(days=1))
+        if close.empty:
+            return pd.Series(dtype=float)
+        return close.ffill().iloc[-1].dropna()
+
+
+class YFinanceSource(PriceSource):
+    """
+    yfinance
+    yf.download 는 모듈 전역 결과 dict(shared._DFS)를 비우고 다시 채워 결과를 만듦
+    → 동시에 여러 번 호출하면 서로의 결과를 덮어씀 (컬럼 누락/뒤섞임, 한 종목 요청의 KeyError)
+    → 호출은 DOWNLOAD_LOCK 으로 한 번에 하나씩, 병렬성은 청크 안의 threads=True (yfinance 가 결과를 모은 뒤 반환)
+    """
+
+    name = "yfinance"
+    max_rate = 5.0
+    # 인스턴스가 여러 개여도 yfinance 전역 상태는 하나
+    DOWNLOAD_LOCK = threading.Lock()
+
+    def __init__(self):
+        import yfinance
+        self.yf = yfinance
+
+    def download(self, symbols, start, end):
+        # downloader 의 청크 스레드는 여기서 순서대로 대기, 청크 안의 종목은 yfinance 스레드로 동시 요청
+        symbols = list(symbols)
+        with self.DOWNLOAD_LOCK:
+            data = self.yf.download(symbols, start=start, end=end, progress=False, threads=True)
+        if data is None or data.empty or "Close" not in data:
+            return pd.DataFrame()
+        close = data["Close"]
+        if isinstance(close, pd.Series):
+            close = close.to_frame(symbols[0])
+        return close
+
+    def info(self, symbol):
+        return self.yf.Ticker(symbol).info
+
+    def quotes(self, symbols):
+        # 당일 1분봉의 마지막 종가 = 최신 체결가 (지연 시세)
+        symbols = list(symbols)
+        with self.DOWNLOAD_LOCK:
+            data = self.yf.download(symbols, period="1d", interval="1m", progress=False, threads=True)
+        if data is None or data.empty or "Close" not in data:
+            return pd.Series(dtype=float)
+        close = data["Close"]
+        if isinstance(close, pd.Series):
+            close = close.to_frame(symbols[0])
+        return close.ffill().iloc[-1].dropna()
+
+
+def synthetic_symbols(n_tickers):
+    return [f"S{i:05d}" for i in range(n_tickers)]
+
+
+def synthetic_universe(n_tickers, n_days, seed=0, end=None):
+    """
+    벤치마크용 종가 행렬 (n_days 거래일 × SPY + n_tickers 종목)
+    시장 요인 + 종목별 베타/변동성/추세, 일부 종목은 중간 상장 (앞부분 NaN)
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+    dates = pd.bdate_range(end=end, periods=n_days, name="Date")
+
+    market = rng.normal(0.0004, 0.011, n_days)
+    beta = rng.uniform(0.5, 1.8, n_tickers).astype(np.float32)
+    vol = rng.uniform(0.008, 0.035, n_tickers).astype(np.float32)
+    drift = rng.normal(0.0002, 0.0006, n_tickers).astype(np.float32)
+
+    returns = rng.standard_normal((n_days, n_tickers), dtype=np.float32)
+    returns *= vol
+    returns += drift
+    returns += market[:, None].astype(np.float32) * beta
+    np.cumsum(returns, axis=0, out=returns)
+    np.exp(returns, out=returns)
+    returns *= rng.uniform(5, 500, n_tickers).astype(np.float32)
+
+    listed = rng.random(n_tickers) < 0.03
+    for column in np.flatnonzero(listed):
+        returns[: rng.integers(1, n_days), column] = np.nan
+
+    close = pd.DataFrame(returns, index=dates, columns=synthetic_symbols(n_tickers))
+    close.insert(0, "SPY", 450 * np.exp(np.cumsum(market)))
+    return close
+
+
+class SyntheticSource(PriceSource):
+    """
+    결정적 랜덤워크 소스
+    - 같은 (seed, 티커, 날짜)면 언제 호출해도 같은 종가 → 증분 저장소와 함께 사용 가능
+    - n_tickers 를 주면 S00000... 형식의 합성 종목 목록 사용
+    """
+
+    name = "synthetic"
+    ORIGIN = pd.Timestamp("2018-01-01")
+
+    def __init__(self, n_tickers=None, seed=0):
+        self.n_tickers = n_tickers
+        self.seed = seed
+        self._market = None
+        self._lock = threading.Lock()
+
+    def universe(self):
+        return synthetic_symbols(self.n_tickers) if self.n_tickers else None
+
+    def _rng(self, symbol):
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+
+    def _market_returns(self, n_days):
+        with self._lock:
+            if self._market is None or len(self._market) < n_days:
+                self._market = np.random.default_rng([self.seed, 0]).normal(0.0004, 0.011, n_days)
+            return self._market[:n_days]
+
+    def _path(self, symbol, n_days):
+        """ORIGIN 부터 n_days 거래일 종가"""
+        market = self._market_returns(n_days)
+        if symbol == "SPY":
+            return 450 * np.exp(np.cumsum(market))
+
+        rng = self._rng(symbol)
+        beta = rng.uniform(0.5, 1.8)
+        vol = rng.uniform(0.008, 0.035)
+        drift = rng.normal(0.0002, 0.0006)
+        base = rng.uniform(5, 500)
+        listed = rng.integers(0, n_days) if rng.random() < 0.03 else 0
+        shocks = rng.normal(drift, vol, n_days) + beta * market
+
+        path = base * np.exp(np.cumsum(shocks))
+        path[:listed] = np.nan
+        return path
+
+    def download(self, symbols, start, end):
+        dates = pd.bdate_range(self.ORIGIN, pd.Timestamp(end).normalize(), name="Date")
+        window = dates >= pd.Timestamp(start).normalize()
+        if not window.any():
+            return pd.DataFrame()
+
+        columns = {symbol: self._path(symbol, len(dates))[window] for symbol in symbols}
+        return pd.DataFrame(columns, index=dates[window]).round(4)
+
+    def quotes(self, symbols, now=None):
+        """오늘(주말이면 직전 거래일) 종가에 분 단위로 결정적인 흔들림을 더한 장중 시세"""
+        now = pd.Timestamp(now or pd.Timestamp.now())
+        close = self.download(symbols, now.normalize() - pd.Timedelta(days=10), now)
+        if close.empty:
+            return pd.Series(dtype=float)
+        minute = now.hour * 60 + now.minute
+        last = close.ffill().iloc[-1].dropna()
+        noise = [np.random.default_rng([self.seed, zlib.crc32(s.encode()), minute]).normal(0, 0.003) for s in last.index]
+        return (last * np.exp(noise)).round(4)
+
+    def info(self, symbol):
+        rng = self._rng(symbol)
+        price = float(rng.uniform(5, 500))
+        shares = float(rng.uniform(5e7, 1e10))
+        eps = float(rng.normal(5, 4))
+        book_value = float(rng.uniform(2, 80))
+        return {
+            "shortName": f"{symbol} Corp",
+            "sector": SECTORS[zlib.crc32(symbol.encode()) % len(SECTORS)],
+            "currentPrice": price,
+            "marketCap": price * shares,
+            "sharesOutstanding": shares,
+            "trailingEps": eps,
+            "trailingPE": price / eps if eps > 0 else None,
+            "bookValue": book_value,
+            "priceToBook": price / book_value,
+            "longBusinessSummary": f"{symbol} is a synthetic company generated for offline testing.",
+        }
+
+
+class FixtureSource(PriceSource):
+    """기록된 fixture 재생 (closes.csv + info.json)"""
+
+    name = "fixture"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.close = pd.read_csv(self.path / "closes.csv", index_col=0, parse_dates=True)
+        info_path = self.path / "info.json"
+        self.infos = json.loads(info_path.read_text(encoding="utf-8")) if info_path.exists() else {}
+
+    def universe(self):
+        return [c for c in self.close.columns if c != "SPY"]
+
+    def download(self, symbols, start, end):
+        index = self.close.index
+        rows = (index >= pd.Timestamp(start).normalize()) & (index < pd.Timestamp(end))
+        columns = [s for s in symbols if s in self.close.columns]
+        return self.close.loc[rows, columns]
+
+    def info(self, symbol):
+        if symbol not in self.infos:
+            raise KeyError(symbol)
+        return self.infos[symbol]
+
+
+class RecordingSource(PriceSource):
+    """다른 소스를 감싸서 응답을 fixture 디렉터리에 기록"""
+
+    def __init__(self, source, path):
+        self.source = source
+        self.name = f"{source.name}+record"
+        self.max_rate = source.max_rate
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def universe(self):
+        return self.source.universe()
+
+    def download(self, symbols, start, end):
+        close = self.source.download(symbols, start, end)
+        if close.empty:
+            return close
+
+        with self._lock:
+            path = self.path / "closes.csv"
+            recorded = close
+            if path.exists():
+                recorded = close.combine_first(pd.read_csv(path, index_col=0, parse_dates=True))
+            recorded.sort_index().to_csv(path)
+        return close
+
+    def quotes(self, symbols):
+        # 장중 시세는 기록하지 않음 (fixture 는 종가만 재생)
+        return self.source.quotes(symbols)
+
+    def info(self, symbol):
+        info = self.source.info(symbol)
+        with self._lock:
+            path = self.path / "info.json"
+            infos = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+            infos[symbol] = info
+            path.write_text(json.dumps(infos, ensure_ascii=False, default=str), encoding="utf-8")
+        return info
+
+
+def get_source(name, n_tickers=None, seed=0, fixture=None, record=None):
+    """이름으로 소스 생성 (yfinance / synthetic / fixture)"""
+    if name == "yfinance":
+        source = YFinanceSource()
+    elif name == "synthetic":
+        source = SyntheticSource(n_tickers=n_tickers, seed=seed)
+    elif name == "fixture":
+        if not fixture:
+            raise ValueError("fixture 소스는 --fixture 경로가 필요합니다")
+        source = FixtureSource(fixture)
+    else:
+        raise ValueError(f"알 수 없는 소스: {name}")
+
+    if record:
+        source = RecordingSource(source, record)
+    return source
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+종목 정보(stockInfo) 수집
+- 느리게 변하는 필드(이름, 섹터, 설명, 주식수, EPS, BPS)는 필드별 TTL 캐시
+  (data/info_cache.json) 에 저장하고 만료된 종목만 .info 재요청
+- 이름/섹터(CLASSIFY_FIELDS)는 전체 종목을 캐시에 유지 (섹터 필터용, refresh_cache)
+- 가격 기반 필드(현재가, 시가총액, 52주 최고/최저, PER, PBR)는 다운로드한 종가로 계산
+- 스레드 풀 + 공유 토큰 버킷으로 요청 속도 제한
+- 요청 제한(429) 응답은 지수 백오프로 재시도
+- 실패한 종목은 {"name": symbol} 로 대체
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fileio import write_atomic
+
+CACHE_PATH = Path(__file__).parent.parent / "data" / "info_cache.json"
+
+# 필드별 캐시 유효기간 (일)
+FIELD_TTL_DAYS = {
+    "name": 28,
+    "sectorEn": 28,
+    "description": 28,
+    "sharesOutstanding": 28,
+    "trailingEps": 7,
+    "bookValue": 7,
+}
+
+# 전체 종목에 대해 캐시에 유지하는 필드 (상위 종목이 아니어도 섹터로 분류 가능하도록)
+CLASSIFY_FIELDS = ("name", "sectorEn")
+
+# 모든 종목이 같은 날 만료되지 않도록 종목별로 0~6일 분산
+TTL_SPREAD_DAYS = 7
+
+# 섹터 한국어 변환
+SECTOR_MAP = {
+    'Technology': '기술',
+    'Healthcare': '헬스케어',
+    'Financial Services': '금융',
+    'Consumer Cyclical': '경기소비재',
+    'Consumer Defensive': '필수소비재',
+    'Communication Services': '커뮤니케이션',
+    'Industrials': '산업재',
+    'Energy': '에너지',
+    'Utilities': '유틸리티',
+    'Real Estate': '부동산',
+    'Basic Materials': '소재'
+}
+
+MAX_WORKERS = 8
+# 이 개수만큼 받을 때마다 캐시 저장 (중단돼도 받은 만큼은 다음 실행에서 재사용)
+SAVE_EVERY = 25
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+
+
+class TokenBucket:
+    """스레드 간 공유되는 토큰 버킷 (초당 rate 개, 최대 burst 개)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_rate_limited(error):
+    """요청 제한 응답 여부 (yfinance YFRateLimitError / HTTP 429)"""
+    text = str(error)
+    return (
+        type(error).__name__ == "YFRateLimitError"
+        or "429" in text
+        or "Too Many Requests" in text
+    )
+
+
+def format_market_cap(market_cap):
+    """시가총액 포맷"""
+    market_cap = market_cap or 0
+    if market_cap >= 1e12:
+        return f"${market_cap/1e12:.2f}T"
+    elif market_cap >= 1e9:
+        return f"${market_cap/1e9:.2f}B"
+    elif market_cap >= 1e6:
+        return f"${market_cap/1e6:.2f}M"
+    return "N/A"
+
+
+def extract_fields(symbol, info):
+    """yfinance .info → 캐시할 느린 필드"""
+    price = info.get('currentPrice', info.get('regularMarketPrice', 0)) or 0
+    shares = info.get('sharesOutstanding') or 0
+    if not shares and price:
+        shares = (info.get('marketCap', 0) or 0) / price
+
+    eps = info.get('trailingEps') or 0
+    if not eps and price and info.get('trailingPE'):
+        eps = price / info['trailingPE']
+
+    book_value = info.get('bookValue') or 0
+    if not book_value and price and info.get('priceToBook'):
+        book_value = price / info['priceToBook']
+
+    return {
+        "name": info.get('shortName', info.get('longName', symbol)),
+        "sectorEn": info.get('sector', 'N/A'),
+        "description": (info.get('longBusinessSummary', '') or '')[:200],
+        "sharesOutstanding": shares,
+        "trailingEps": eps,
+        "bookValue": book_value,
+    }
+
+
+def build_stock_info(symbol, fields, prices):
+    """캐시 필드 + 종가 시리즈(dropna) → stockInfo 항목"""
+    sector_en = fields.get("sectorEn", 'N/A')
+    entry = {
+        "name": fields.get("name", symbol),
+        "sector": SECTOR_MAP.get(sector_en, sector_en),
+        "sectorEn": sector_en,
+        "marketCap": "N/A",
+        "price": 0,
+        "high52w": 0,
+        "low52w": 0,
+        "per": 0,
+        "pbr": 0,
+        "description": fields.get("description", ""),
+    }
+    if prices is None or prices.empty:
+        return entry
+
+    # 종가 기준 (장중 고가/저가가 아닌 종가의 52주 최고/최저)
+    price = float(prices.iloc[-1])
+    year = prices[prices.index >= prices.index[-1] - timedelta(days=365)]
+    eps = fields.get("trailingEps") or 0
+    book_value = fields.get("bookValue") or 0
+
+    entry.update({
+        "marketCap": format_market_cap(price * (fields.get("sharesOutstanding") or 0)),
+        "price": round(price, 2),
+        "high52w": round(float(year.max()), 2),
+        "low52w": round(float(year.min()), 2),
+        "per": round(price / eps, 2) if eps > 0 else 0,
+        "pbr": round(price / book_value, 2) if book_value > 0 else 0,
+    })
+    return entry
+
+
+def load_cache(path=CACHE_PATH):
+    """캐시 로드: {symbol: {field: {"value": v, "at": "YYYY-MM-DD"}}}"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(cache, path=CACHE_PATH):
+    """캐시 저장 (임시 파일 → rename, 중간에 끊겨도 이전 캐시 유지)"""
+    write_atomic(path, json.dumps(cache, ensure_ascii=False, indent=1, sort_keys=True))
+
+
+def is_stale(entry, symbol, today, fields=None):
+    """만료된 필드가 하나라도 있으면 True (fields 를 주면 그 필드만 확인)"""
+    spread = zlib.crc32(symbol.encode()) % TTL_SPREAD_DAYS
+    for field in fields or FIELD_TTL_DAYS:
+        ttl = FIELD_TTL_DAYS[field]
+        cached = entry.get(field)
+        if not cached:
+            return True
+        fetched = datetime.strptime(cached["at"], "%Y-%m-%d")
+        if today - fetched > timedelta(days=ttl + spread):
+            return True
+    return False
+
+
+def fetch_one(symbol, fetch_info, bucket, retries=MAX_RETRIES, on_retry=None):
+    """한 종목 정보 요청 (요청 제한 시 백오프 후 재시도)"""
+    for attempt in range(retries + 1):
+        if bucket:
+            bucket.acquire()
+        try:
+            return extract_fields(symbol, fetch_info(symbol))
+        except Exception as e:
+            if not is_rate_limited(e) or attempt == retries:
+                raise
+            if on_retry:
+                on_retry(symbol)
+            time.sleep(BACKOFF_BASE * (2 ** attempt) * (1 + random.random()))
+
+
+def refresh_cache(symbols, fetch_info, cache_path=CACHE_PATH, fields=None,
+                  workers=MAX_WORKERS, rate=None, save_every=SAVE_EVERY):
+    """
+    캐시 만료 종목만 동시 요청해서 캐시 갱신 (fields 를 주면 그 필드가 만료된 종목만, rate=None 이면 속도 제한 없음)
+    요청한 종목은 모든 필드를 새로 저장
+    반환: (cache, stats)
+    stats: {"requested": 요청 종목 수, "retries": 재시도 횟수, "failed": [요청 실패 종목]}
+    """
+    cache = load_cache(cache_path)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    stale = [s for s in symbols if is_stale(cache.get(s, {}), s, today, fields)]
+    bucket = TokenBucket(rate) if rate else None
+    retried = []
+
+    def task(symbol):
+        try:
+            return symbol, fetch_one(symbol, fetch_info, bucket, on_retry=retried.append)
+        except Exception:
+            return symbol, None
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for done, (symbol, fetched) in enumerate(pool.map(task, stale), 1):
+            if fetched is None:
+                failed.append(symbol)
+                continue
+            stamp = today.strftime("%Y-%m-%d")
+            cache[symbol] = {field: {"value": value, "at": stamp} for field, value in fetched.items()}
+            if save_every and done % save_every == 0:
+                save_cache(cache, cache_path)
+
+    save_cache(cache, cache_path)
+    return cache, {"requested": len(stale), "retries": len(retried), "failed": failed}
+
+
+def fetch_stock_info(symbols, fetch_info, close_data, cache_path=CACHE_PATH,
+                     workers=MAX_WORKERS, rate=None, save_every=SAVE_EVERY):
+    """
+    여러 종목 정보 수집 (캐시 만료 종목만 동시 요청, rate=None 이면 속도 제한 없음)
+    반환: (stock_names, stock_info, stats) — stats 는 refresh_cache 와 같음
+    """
+    symbols = list(symbols)
+    cache, stats = refresh_cache(symbols, fetch_info, cache_path, workers=workers, rate=rate,
+                                 save_every=save_every)
+
+    stock_names = {}
+    stock_info = {}
+    for symbol in symbols:
+        entry = cache.get(symbol)
+        if not entry:
+            # 요청 실패 + 캐시 없음
+            stock_names[symbol] = symbol
+            stock_info[symbol] = {"name": symbol}
+            continue
+
+        fields = {field: cached["value"] for field, cached in entry.items()}
+        prices = close_data[symbol].dropna() if symbol in close_data.columns else None
+        stock_info[symbol] = build_stock_info(symbol, fields, prices)
+        stock_names[symbol] = stock_info[symbol]["name"]
+
+    return stock_names, stock_info, stats
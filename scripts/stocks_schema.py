@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+data/stocks.json 스키마 (version 필드로 구분)
+
+version 1 (기존, version 필드 없음)
+    "spy":    {"prices": [{"date": "YYYY-MM-DD", "price": x}, ...], "performance": {...}}
+    "stocks": [{"symbol", "prices": [{"date", "price"}, ...], "performance"}, ...]
+
+version 2 (컬럼형)
+    "dates":         공통 날짜 축 ["YYYY-MM-DD", ...]
+    "priceScale":    100 (정수 센트)
+    "priceEncoding": "delta" (직전 유효값과의 차이, 첫 값은 절대값)
+    "spy":    {"start": i, "prices": [...], "performance": {...}, "risk": {...}}
+    "stocks": [{"symbol", "start": i, "prices": [...], "performance", "risk"}, ...]
+    prices[k] 는 dates[start + k] 의 가격, null 은 결측 (델타 기준값 유지)
+    risk (선택): {"beta", "volatility", "maxDrawdown", "sharpe", "relStrength", "rsRating"}
+             계산 불가 지표는 생략 (risk.py)
+
+줄 단위 배치 (StocksWriter 출력, 그대로 유효한 JSON)
+    1행: {"version":..,"lastUpdated":..,"dates":[..],"priceScale":..,"priceEncoding":..,
+    2행: "spy":{..},
+    3행: "stocks":[
+    종목마다 한 줄: {..},   (마지막 종목은 쉼표 없음)
+    "],"
+    "stockNames":{..},
+    "stockInfo":{..}}
+    → 전체를 메모리에 올리지 않고 종목 단위로 쓰고 읽을 수 있음
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+
+SCHEMA_VERSION = 2
+PRICE_SCALE = 100
+PRICE_ENCODING = "delta"
+
+
+def encode_prices(values):
+    """
+    날짜 축에 정렬된 가격 배열(NaN=결측) → (start, 델타 인코딩 정수 리스트)
+    앞뒤 결측은 잘라냄
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return 0, []
+
+    start, end = int(valid[0]), int(valid[-1])
+    segment = values[start:end + 1]
+    present = ~np.isnan(segment)
+    scaled = np.round(segment[present] * PRICE_SCALE).astype(np.int64)
+
+    deltas = np.diff(scaled, prepend=0).tolist()
+    if present.all():
+        return start, deltas
+
+    encoded = [None] * len(segment)
+    for i, delta in zip(np.flatnonzero(present).tolist(), deltas):
+        encoded[i] = delta
+    return start, encoded
+
+
+def decode_prices(encoded, scale=PRICE_SCALE, encoding=PRICE_ENCODING):
+    """인코딩된 가격 리스트 → 실수 리스트 (결측은 None)"""
+    decoded = []
+    current = 0
+    for value in encoded:
+        if value is None:
+            decoded.append(None)
+            continue
+        current = current + value if encoding == "delta" else value
+        decoded.append(round(current / scale, 4))
+    return decoded
+
+
+def decode_entry(entry, n_dates, scale=PRICE_SCALE, encoding=PRICE_ENCODING):
+    """항목 → 공통 날짜 축 길이(n_dates)의 가격 리스트 (결측은 None)"""
+    start = entry.get("start", 0)
+    prices = decode_prices(entry["prices"], scale, encoding)
+    aligned = [None] * start + prices
+    return aligned + [None] * (n_dates - len(aligned))
+
+
+def upgrade_v1(data):
+    """version 1 → version 2 (메모리 내 변환)"""
+    entries = [data["spy"]] + data["stocks"]
+    dates = sorted({p["date"] for entry in entries for p in entry["prices"]})
+    position = {date: i for i, date in enumerate(dates)}
+
+    def encode(entry):
+        values = [math.nan] * len(dates)
+        for p in entry["prices"]:
+            values[position[p["date"]]] = p["price"]
+        start, prices = encode_prices(values)
+        return {"start": start, "prices": prices}
+
+    upgraded = {
+        "version": SCHEMA_VERSION,
+        "lastUpdated": data["lastUpdated"],
+        "dates": dates,
+        "priceScale": PRICE_SCALE,
+        "priceEncoding": PRICE_ENCODING,
+        "spy": {**encode(data["spy"]), "performance": data["spy"]["performance"]},
+        "stocks": [
+            {"symbol": s["symbol"], **encode(s), "performance": s["performance"]}
+            for s in data["stocks"]
+        ],
+        "stockNames": data.get("stockNames", {}),
+        "stockInfo": data.get("stockInfo", {}),
+    }
+    return upgraded
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class StocksWriter:
+    """
+    stocks.json 스트리밍 저장 (종목을 처리하는 대로 한 줄씩 기록)
+    - tmp_path 에 쓰고 finish() 에서 path 로 rename → 중간에 끊겨도 기존 파일 유지
+    - append=True 면 이미 종목까지 기록된 tmp_path 에 이어서 기록 (trailer 기록, 체크포인트 재개)
+    """
+
+    def __init__(self, path, tmp_path=None, append=False):
+        self.path = Path(path)
+        self.tmp_path = Path(tmp_path) if tmp_path else self.path.with_name(self.path.name + ".tmp")
+        self.tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.tmp_path, "a" if append else "w", encoding="utf-8")
+        self.count = 0
+        self.stocks_closed = append
+
+    def write_header(self, last_updated, dates, spy):
+        header = {
+            "version": SCHEMA_VERSION,
+            "lastUpdated": last_updated,
+            "dates": list(dates),
+            "priceScale": PRICE_SCALE,
+            "priceEncoding": PRICE_ENCODING,
+        }
+        self.file.write(_dumps(header)[:-1] + ",\n")
+        self.file.write(f'"spy":{_dumps(spy)},\n')
+        self.file.write('"stocks":[\n')
+
+    def write_stock(self, entry):
+        if self.count:
+            self.file.write(",\n")
+        self.file.write(_dumps(entry))
+        self.count += 1
+
+    def close_stocks(self):
+        """종목 배열 닫기 (이후 tmp_path 는 append 재개 가능한 상태)"""
+        if not self.stocks_closed:
+            self.file.write("\n],\n")
+            self.stocks_closed = True
+        self.file.flush()
+
+    def close(self):
+        """종목 배열까지 기록하고 닫기 (trailer 는 append=True 로 다시 열어 finish)"""
+        self.close_stocks()
+        self.file.close()
+
+    def finish(self, stock_names, stock_info):
+        self.close_stocks()
+        self.file.write(f'"stockNames":{_dumps(stock_names)},\n')
+        self.file.write(f'"stockInfo":{_dumps(stock_info)}}}\n')
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """오류 시 파일만 닫음 (tmp_path 는 다음 실행이 처음부터 다시 쓰거나 체크포인트로 이어 씀)"""
+        self.file.close()
+
+
+class StocksReader:
+    """
+    stocks.json 종목 단위 읽기
+    - 줄 단위 배치면 header → iter_stocks() → trailer() 순서로 한 번만 훑음
+    - 그 외(version 1, 한 줄 JSON)는 load_stocks 로 전체 로드 후 같은 인터페이스 제공
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, "r", encoding="utf-8")
+        self.data = None
+        self.header = self._read_header()
+
+    def _read_header(self):
+        first = self.file.readline()
+        second = self.file.readline()
+        third = self.file.readline()
+        try:
+            if third.strip() != '"stocks":[':
+                raise ValueError
+            header = json.loads(first.rstrip().rstrip(",") + "}")
+            header["spy"] = json.loads("{" + second.rstrip().rstrip(",") + "}")["spy"]
+        except ValueError:
+            # 줄 단위 배치가 아님 → 전체 로드
+            self.file.close()
+            self.data = load_stocks(self.path)
+            return {k: v for k, v in self.data.items() if k not in ("stocks", "stockNames", "stockInfo")}
+
+        if header.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"지원하지 않는 stocks.json 버전: {header.get('version')}")
+        return header
+
+    def iter_stocks(self):
+        if self.data is not None:
+            yield from self.data["stocks"]
+            return
+        for line in self.file:
+            line = line.rstrip().rstrip(",")
+            if line == "]":
+                return
+            if line:
+                yield json.loads(line)
+
+    def trailer(self):
+        """iter_stocks() 를 끝까지 돈 뒤 호출 → {"stockNames", "stockInfo"}"""
+        if self.data is not None:
+            return {"stockNames": self.data.get("stockNames", {}), "stockInfo": self.data.get("stockInfo", {})}
+        rest = self.file.read().strip()
+        self.file.close()
+        return json.loads("{" + rest)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_stocks(path):
+    """stocks.json 로드 (항상 version 2 형태로 반환)"""
+    with open(Path(path), "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    version = data.get("version", 1)
+    if version == 1:
+        return upgrade_v1(data)
+    if version == SCHEMA_VERSION:
+        return data
+    raise ValueError(f"지원하지 않는 stocks.json 버전: {version}")
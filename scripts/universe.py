@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+종목 목록(universe) 파일 로드
+- universes/<이름>.txt: 공백/줄바꿈/쉼표로 구분한 티커, # 이후는 주석
+- 여러 목록은 처음 나온 순서를 유지하며 병합 (중복은 한 번만)
+- 이름 대신 파일 경로도 사용 가능 (예: Russell 1000/3000 구성 종목 파일)
+"""
+
+import re
+from pathlib import Path
+
+UNIVERSE_DIR = Path(__file__).parent.parent / "universes"
+DEFAULT_UNIVERSE = ["sp500", "nasdaq100", "growth"]
+
+
+def normalize_symbol(symbol):
+    """yfinance 티커 형식 (대문자, BRK.B → BRK-B)"""
+    return symbol.strip().upper().replace(".", "-")
+
+
+def universe_path(name):
+    """이름(universes/<이름>.txt) 또는 파일 경로"""
+    path = Path(name)
+    if path.suffix or path.parent != Path("."):
+        return path
+    return UNIVERSE_DIR / f"{name}.txt"
+
+
+def read_universe(path):
+    """파일 하나의 티커 목록 (파일 내 순서 유지)"""
+    symbols = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0]
+        symbols.extend(normalize_symbol(s) for s in re.split(r"[\s,]+", line) if s.strip())
+    return symbols
+
+
+def available_universes():
+    return sorted(path.stem for path in UNIVERSE_DIR.glob("*.txt"))
+
+
+def load_universe(names=DEFAULT_UNIVERSE):
+    """여러 목록 병합 (먼저 나온 순서 유지, SPY 는 기준 지수라 제외)"""
+    if isinstance(names, str):
+        names = [n for n in names.split(",") if n.strip()]
+
+    merged = {}
+    for name in names:
+        path = universe_path(name.strip())
+        if not path.exists():
+            raise FileNotFoundError(f"종목 목록 없음: {path} (사용 가능: {', '.join(available_universes())})")
+        merged.update(dict.fromkeys(read_universe(path)))
+
+    merged.pop("SPY", None)
+    return list(merged)
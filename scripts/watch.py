@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+장중 감시 모드 (fetch_data.py --watch)
+- 시작할 때 한 번: 종가 저장소 증분 갱신 → 기간별 시작가/위험 지표/종목 정보 캐시 준비
+- 매 틱 (--interval 초): 최신 시세만 받아 종목별 마지막 가격 하나만 교체
+  → 기간별 수익률 O(종목 수) 재계산 → heapq 로 기간별 상위 K 선택
+  → 상위 종목만 기간 데이터 파일로 만들어 내용이 바뀐 파일만 기록 (+ .gz/.br)
+- 시세가 하나도 바뀌지 않은 틱은 아무 파일도 쓰지 않음
+- 날짜가 바뀌면 (기간 시작일이 달라지므로) 처음부터 다시 준비
+- 위험 지표는 시작 시점 값 유지, stocks.json / HTML 셸은 다시 쓰지 않음 (일간 실행 담당)
+- 페이지가 generate_html --binary 로 만들어졌으면 (manifest 에 prices) 감시 중에도 바이너리 모드 유지
+  · 종가 행렬(.f32)은 오늘 행을 뺀 과거 구간으로 세션마다 한 번만 작성
+  · 틱마다 오늘 행만 live.<hash>.json (행렬 종목 순서의 가격 한 줄) 으로 작성 → 페이지가 행렬 뒤에 한 열로 붙임
+    (틱 비용이 종목 × 날짜 행렬 재작성/압축이 아니라 종목 수에 비례)
+"""
+
+import heapq
+import json
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from compress import precompress
+from downloader import CHUNK_SIZE, MAX_WORKERS, chunked
+from fetch_data import update_prices
+from generate_html import ASSET_DIR, MAX_POINTS, ROOT, TOP_N, write_assets
+from price_matrix import PriceMatrixWriter
+from metrics import Metrics
+from performance import get_date_ranges, history_start, period_start_indices, round2
+from price_store import STORE_PATH
+from risk import calculate_risk_matrix, risk_dict
+from stock_info import CACHE_PATH, build_stock_info, fetch_stock_info, load_cache
+from stocks_schema import PRICE_ENCODING, PRICE_SCALE, encode_prices
+
+INTERVAL = 60
+QUOTE_CHUNK_SIZE = 200
+# 종목 정보를 유지할 기간별 상위 종목 수 (일간 실행의 select_top_symbols 와 같음)
+INFO_TOP_N = 30
+# 이보다 유효 종가가 적은 종목은 순위에서 제외 (iter_stocks 와 같음)
+MIN_PRICES = 10
+METRICS_NAME = "watch_metrics.json"
+BENCHMARK = "SPY"
+
+
+class LiveRanking:
+    """
+    종가 행렬 + 오늘 행(장중 가격) → 기간별 수익률/상위 종목
+    과거 구간에서 나오는 값(기간 시작가, 직전 종가, 유효 개수)은 한 번만 계산하고
+    틱마다 바뀌는 오늘 행만으로 calculate_performance_matrix 와 같은 결과를 냄
+    """
+
+    def __init__(self, close_data, date_ranges, today=None):
+        # 주말에는 직전 거래일 행이 장중 행
+        today = pd.offsets.BDay().rollback(pd.Timestamp(today or datetime.now()).normalize())
+        prices = close_data.astype(float).round(2)
+        if prices.empty or prices.index[-1] < today:
+            today_row = pd.DataFrame(np.nan, index=pd.DatetimeIndex([today], name="Date"), columns=prices.columns)
+            prices = pd.concat([prices, today_row])
+        self.values = prices.to_numpy(dtype=float, copy=True)
+        self.dates = prices.index
+        self.date_strings = list(self.dates.strftime("%Y-%m-%d"))
+        self.symbols = list(prices.columns)
+        self.position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.periods = list(date_ranges.keys())
+
+        history = pd.DataFrame(self.values[:-1])
+        n_history = len(history)
+        self.previous = history.ffill().to_numpy()[-1] if n_history else np.full(len(self.symbols), np.nan)
+        self.history_count = history.count().to_numpy()
+        next_valid = history.bfill().to_numpy()
+
+        # 기간별 시작가 (과거 구간에 없으면 오늘 가격, 시작일이 오늘 이후면 계산 불가)
+        self.start_prices = {}
+        for period, position in period_start_indices(self.dates, date_ranges).items():
+            if position >= len(self.dates):
+                self.start_prices[period] = None
+            elif position < n_history:
+                self.start_prices[period] = next_valid[position]
+            else:
+                self.start_prices[period] = np.full(len(self.symbols), np.nan)
+
+        self.live = self.values[-1].copy()
+
+    def set_quotes(self, quotes):
+        """최신 시세 반영 (소수 2자리) → 가격이 바뀐 종목 리스트"""
+        live = self.live.copy()
+        for symbol, price in quotes.items():
+            column = self.position.get(symbol)
+            if column is not None and price > 0:
+                live[column] = round(float(price), 2)
+        same = (live == self.live) | (np.isnan(live) & np.isnan(self.live))
+        self.live = live
+        self.values[-1] = live
+        return [self.symbols[i] for i in np.flatnonzero(~same)]
+
+    def counts(self):
+        return self.history_count + ~np.isnan(self.live)
+
+    def performance(self):
+        """기간별 수익률(%) {기간: (종목 수,) 배열} (계산 불가는 NaN)"""
+        last = np.where(np.isnan(self.live), self.previous, self.live)
+        enough = self.counts() >= 2
+        result = {}
+        for period in self.periods:
+            start = self.start_prices[period]
+            if start is None:
+                result[period] = np.full(len(self.symbols), np.nan)
+                continue
+            start = np.where(np.isnan(start), self.live, start)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change = (last - start) / start * 100
+            change[(start == 0) | ~enough] = np.nan
+            result[period] = round2(change)
+        return result
+
+    def top(self, performance, top_n=TOP_N, benchmark=BENCHMARK):
+        """기간별 SPY 대비 상위 top_n 종목 인덱스 (동점은 앞 종목 우선, 기준 지수 제외)"""
+        spy = self.position.get(benchmark)
+        eligible = self.counts() >= MIN_PRICES
+        rankings = {}
+        for period, perf in performance.items():
+            spy_perf = 0.0 if spy is None or np.isnan(perf[spy]) else float(perf[spy])
+            candidates = (i for i in np.flatnonzero(eligible & ~np.isnan(perf)) if i != spy)
+            rankings[period] = heapq.nlargest(top_n, candidates, key=lambda i: float(perf[i]) - spy_perf)
+        return rankings
+
+    def series(self, symbol):
+        """종목 하나의 종가 pd.Series (오늘 행 포함, 결측 제외)"""
+        return pd.Series(self.values[:, self.position[symbol]], index=self.dates).dropna()
+
+    def entry(self, column, performance, risk_matrix=None):
+        """stocks.json 과 같은 형식의 종목 항목 (오늘 행 포함)"""
+        symbol = self.symbols[column]
+        start, prices = encode_prices(self.values[:, column])
+        entry = {
+            "symbol": symbol,
+            "start": start,
+            "prices": prices,
+            "performance": {
+                period: float(perf[column]) for period, perf in performance.items() if not np.isnan(perf[column])
+            },
+        }
+        if risk_matrix is not None and symbol in risk_matrix.columns:
+            entry["risk"] = risk_dict(risk_matrix, symbol)
+        return entry
+
+
+def poll_quotes(source, symbols, chunk_size=QUOTE_CHUNK_SIZE):
+    """청크별 최신 시세 (실패한 청크는 건너뜀 → 이전 가격 유지)"""
+    parts = []
+    for chunk in chunked(symbols, chunk_size):
+        try:
+            parts.append(source.quotes(chunk))
+        except Exception as e:
+            print(f"  ⚠️ 시세 요청 실패 ({len(chunk)}개 종목): {e}")
+    parts = [part for part in parts if not part.empty]
+    return pd.concat(parts) if parts else pd.Series(dtype=float)
+
+
+class WatchSession:
+    """하루 동안의 감시 상태 (날짜가 바뀌면 새로 만듦)"""
+
+    def __init__(self, source, tickers, data_dir, chunk_size=CHUNK_SIZE, workers=MAX_WORKERS):
+        self.day = date.today()
+        self.source = source
+        date_ranges = get_date_ranges()
+        start_date = history_start(date_ranges)
+
+        print(f"\n📡 {self.day} 감시 준비: 종가 저장소 갱신")
+        close_data = update_prices(source, ["SPY"] + list(tickers), start_date, Path(data_dir) / STORE_PATH.name,
+                                   {}, chunk_size, workers)
+        self.ranking = LiveRanking(close_data, date_ranges)
+        self.risk_matrix = calculate_risk_matrix(close_data)
+        self.cache_path = Path(data_dir) / CACHE_PATH.name
+        self.cache = load_cache(self.cache_path)
+        self.published = False
+        # 바이너리 모드: 과거 구간 종가 행렬 헤더 (세션 첫 틱에 작성)
+        self.prices = None
+
+    def stock_info(self, symbols):
+        """상위 종목 이름/정보 (캐시에 없는 종목만 요청, 가격 필드는 장중 가격 기준)"""
+        missing = [symbol for symbol in symbols if symbol not in self.cache]
+        if missing:
+            close = pd.DataFrame({symbol: self.ranking.series(symbol) for symbol in missing})
+            fetch_stock_info(missing, self.source.info, close, cache_path=self.cache_path, rate=self.source.max_rate)
+            self.cache = load_cache(self.cache_path)
+
+        stock_names, stock_info = {}, {}
+        for symbol in symbols:
+            cached = self.cache.get(symbol)
+            if not cached:
+                stock_names[symbol] = symbol
+                stock_info[symbol] = {"name": symbol}
+                continue
+            fields = {field: value["value"] for field, value in cached.items()}
+            stock_info[symbol] = build_stock_info(symbol, fields, self.ranking.series(symbol))
+            stock_names[symbol] = stock_info[symbol]["name"]
+        return stock_names, stock_info
+
+    def price_matrix(self, asset_dir, written):
+        """바이너리 모드용 종가 행렬 (SPY + 전체 종목, 오늘 행 제외) → 헤더 dict"""
+        ranking = self.ranking
+        history = ranking.values[:-1]
+        start, prices = encode_prices(history[:, ranking.position[BENCHMARK]])
+        header = {
+            "dates": ranking.date_strings[:-1],
+            "priceScale": PRICE_SCALE,
+            "priceEncoding": PRICE_ENCODING,
+            "spy": {"start": start, "prices": prices},
+        }
+        matrix = PriceMatrixWriter(asset_dir, header, written)
+        try:
+            for column, symbol in enumerate(ranking.symbols):
+                if symbol != BENCHMARK:
+                    matrix.add_values(symbol, history[:, column])
+        except BaseException:
+            matrix.abort()
+            raise
+        return matrix.finish()
+
+    def live_row(self, prices):
+        """오늘 행: 종가 행렬(prices 헤더) 종목 순서의 장중 가격 (결측은 None)"""
+        live = self.ranking.live
+        return {
+            "matrix": prices["data"],
+            "date": self.ranking.date_strings[-1],
+            "values": [
+                None if np.isnan(live[column]) else float(live[column])
+                for column in (self.ranking.position[symbol] for symbol in prices["symbols"])
+            ],
+        }
+
+    def tick(self, quotes, asset_dir=ASSET_DIR, max_points=MAX_POINTS, binary=False):
+        """
+        시세 반영 → (가격이 바뀐 종목, 기록한 파일) (바뀐 게 없으면 파일을 쓰지 않음)
+        binary: 기간 파일은 열 번호만 (generate_html --binary 와 같은 형식)
+                과거 구간 종가 행렬은 세션에 한 번, 오늘 행은 틱마다 live 파일로 작성
+        """
+        changed = self.ranking.set_quotes(quotes)
+        if not changed and self.published:
+            return changed, []
+
+        ranking = self.ranking
+        performance = ranking.performance()
+        info_top = ranking.top(performance, INFO_TOP_N)
+        symbols = list(dict.fromkeys(ranking.symbols[i] for top in info_top.values() for i in top))
+        stock_names, stock_info = self.stock_info(symbols)
+
+        # SPY 항목은 process_spy 와 같은 형식 (계산 불가 기간은 None)
+        column = ranking.position[BENCHMARK]
+        spy = ranking.entry(column, performance, self.risk_matrix)
+        del spy["symbol"]
+        spy["performance"] = {
+            period: (None if np.isnan(perf[column]) else float(perf[column])) for period, perf in performance.items()
+        }
+        last_updated = datetime.now().strftime("%Y-%m-%d %H:%M")
+        header = {
+            "lastUpdated": last_updated,
+            "dates": ranking.date_strings,
+            "priceScale": PRICE_SCALE,
+            "priceEncoding": PRICE_ENCODING,
+            "spy": spy,
+        }
+        rankings = {
+            period: [ranking.entry(i, performance, self.risk_matrix) for i in top[:TOP_N]]
+            for period, top in info_top.items()
+        }
+        meta = {"lastUpdated": last_updated, "stockNames": stock_names, "stockInfo": stock_info}
+
+        written = []
+        prices = live = None
+        if binary:
+            # 일간 실행(generate_html)이 행렬을 바꿔 정리했으면 다시 작성
+            if self.prices is None or not (Path(asset_dir) / self.prices["data"]).exists():
+                self.prices = self.price_matrix(asset_dir, written)
+            prices, live = self.prices, self.live_row(self.prices)
+        write_assets(header, rankings, meta, asset_dir, written, max_points, prices, live)
+        self.published = True
+        return changed, written
+
+
+def is_binary(asset_dir):
+    """기존 페이지가 종가 행렬 바이너리를 쓰는지 (manifest 에 prices)"""
+    manifest = Path(asset_dir) / "manifest.json"
+    return manifest.exists() and "prices" in json.loads(manifest.read_text(encoding="utf-8"))
+
+
+def watch(source, tickers, data_dir, out_dir=ROOT, interval=INTERVAL, chunk_size=CHUNK_SIZE,
+          workers=MAX_WORKERS, max_points=MAX_POINTS, compress=True, ticks=None, binary=None):
+    """
+    interval 초마다 시세 반영 (ticks 만큼 돌고 종료, None 이면 Ctrl+C 까지)
+    binary: None 이면 기존 manifest 를 보고 결정 (페이지 형식 유지)
+    """
+    data_dir, out_dir = Path(data_dir), Path(out_dir)
+    asset_dir = out_dir / ASSET_DIR.relative_to(ROOT)
+    if binary is None:
+        binary = is_binary(asset_dir)
+    metrics = Metrics("watch", data_dir / METRICS_NAME)
+    metrics.set("source", source.name)
+    metrics.set("tickers", len(tickers))
+    metrics.set("binary", binary)
+
+    print("=" * 60)
+    print(f"👀 장중 감시 시작 ({len(tickers)}개 종목, {interval}초 간격, 소스: {source.name}"
+          + (", 종가 행렬 바이너리)" if binary else ")"))
+    print("=" * 60)
+
+    session = None
+    done = 0
+    try:
+        while ticks is None or done < ticks:
+            started = time.perf_counter()
+            if session is None or session.day != date.today():
+                session = WatchSession(source, tickers, data_dir, chunk_size, workers)
+
+            quotes = poll_quotes(source, session.ranking.symbols)
+            changed, written = session.tick(quotes, asset_dir, max_points, binary)
+            if compress and written:
+                precompress([path for path in written if path.exists()], changed=written, written=written)
+
+            elapsed = time.perf_counter() - started
+            metrics.count("ticks")
+            metrics.count("quotes", len(quotes))
+            metrics.count("changedPrices", len(changed))
+            metrics.count("filesWritten", len(written))
+            print(f"⏱️  {datetime.now():%H:%M:%S} 시세 {len(quotes)}개 (변경 {len(changed)}개)"
+                  f" → 파일 {len(written)}개 ({elapsed * 1000:.0f}ms)")
+
+            done += 1
+            if ticks is None or done < ticks:
+                time.sleep(max(0.0, interval - elapsed))
+    except KeyboardInterrupt:
+        print("\n⏹️  감시 종료")
+    finally:
+        metrics.finish()
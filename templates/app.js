@@ -0,0 +1,361 @@
+/* ====== SHARE ====== */
+const SHARE_URL = 'https://herdvibe.com/25';
+const SHARE_TITLE = 'SPY 대비 상위 종목 — Herdvibe';
+const SHARE_DESC = 'S&P 500 + Nasdaq 100 SPY 초과 수익 상위 20 종목 | Herdvibe';
+
+function showToast(msg) {
+    const t = document.getElementById('toast');
+    t.textContent = msg;
+    t.classList.add('show');
+    setTimeout(() => t.classList.remove('show'), 3000);
+}
+function shareTwitter() {
+    window.open(`https://twitter.com/intent/tweet?text=${encodeURIComponent(SHARE_TITLE)}&url=${encodeURIComponent(SHARE_URL)}`, '_blank');
+}
+function shareKakao() {
+    if (window.Kakao && !Kakao.isInitialized()) Kakao.init('a43ed7b39fac35458f4f9df925a279b5');
+    if (window.Kakao) {
+        Kakao.Share.sendDefault({
+            objectType: 'feed',
+            content: { title: SHARE_TITLE, description: SHARE_DESC, imageUrl: 'https://herdvibe.com/og-spy.png', link: { mobileWebUrl: SHARE_URL, webUrl: SHARE_URL } }
+        });
+    }
+}
+function shareTelegram() {
+    window.open(`https://t.me/share/url?url=${encodeURIComponent(SHARE_URL)}&text=${encodeURIComponent(SHARE_TITLE)}`, '_blank');
+}
+function shareInstagram(btn) {
+    try {
+        if (window.parent !== window) { window.parent.postMessage({ type: 'copy', text: SHARE_URL }, '*'); }
+        else { navigator.clipboard.writeText(SHARE_URL); }
+        const orig = btn.innerHTML;
+        btn.classList.add('copied');
+        btn.innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>복사됨!';
+        showToast('링크가 복사되었습니다 - 인스타그램에 붙여넣기 하세요');
+        setTimeout(() => { btn.classList.remove('copied'); btn.innerHTML = orig; }, 2000);
+    } catch(e) { showToast('복사 실패'); }
+}
+function copyLink(btn) {
+    try {
+        if (window.parent !== window) { window.parent.postMessage({ type: 'copy', text: SHARE_URL }, '*'); }
+        else { navigator.clipboard.writeText(SHARE_URL); }
+        const orig = btn.innerHTML;
+        btn.classList.add('copied');
+        btn.innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>복사됨!';
+        showToast('링크가 복사되었습니다');
+        setTimeout(() => { btn.classList.remove('copied'); btn.innerHTML = orig; }, 2000);
+    } catch(e) { showToast('복사 실패'); }
+}
+
+/* ====== DATA (assets/data/ 에서 필요할 때 로드) ====== */
+const ASSET_BASE = 'assets/data/';
+let MANIFEST = null;
+let PERIOD = null;   // { dates, spy, spyPerf, spyPoints, top: [{ symbol, perf, vsSpy, risk, series, points }], index? }
+let STOCK_NAMES = {};
+let STOCK_INFO = {};
+const PERIOD_DATA = {};
+
+async function fetchJson(name, options) {
+    const res = await fetch(ASSET_BASE + name, options);
+    if (!res.ok) throw new Error(`${name}: ${res.status}`);
+    return res.json();
+}
+
+let PRICES = null;   // { symbol: Float32Array (날짜 수) } — manifest 에 prices 가 있을 때만
+
+function loadPrices() {
+    // 종가 행렬: 헤더(JSON) + Float32 바이너리 → 종목별 typed array 뷰 (숫자 파싱 없음, little-endian)
+    // 감시 모드(manifest 에 live)면 행렬은 과거 구간 → 오늘 행을 마지막 열로 붙임
+    if (!PRICES) PRICES = Promise.all([
+        fetchJson(MANIFEST.prices),
+        MANIFEST.live ? fetchJson(MANIFEST.live) : null,
+    ]).then(async ([header, live]) => {
+        const res = await fetch(ASSET_BASE + header.data);
+        if (!res.ok) throw new Error(`${header.data}: ${res.status}`);
+        const buffer = await res.arrayBuffer();
+        const n = header.shape[1];
+        const rows = {};
+        header.symbols.forEach((symbol, i) => { rows[symbol] = new Float32Array(buffer, i * n * 4, n); });
+        if (live && live.matrix === header.data) {
+            header.symbols.forEach((symbol, i) => {
+                const row = new Float32Array(n + 1);
+                row.set(rows[symbol]);
+                row[n] = live.values[i] ?? NaN;
+                rows[symbol] = row;
+            });
+        }
+        return rows;
+    });
+    return PRICES;
+}
+
+// 행렬 한 행 → 기간 시작 열 기준 수익률(%) 중 index 열만 (결측은 null, 기준가가 없으면 null)
+function rebaseRow(row, index) {
+    if (!row || !index.length) return null;
+    const round2 = v => Math.round(v * 100) / 100;
+    let base = NaN;
+    for (let i = index[0]; i < row.length && isNaN(base); i++) base = row[i];
+    if (!base) return null;
+    base = round2(base);
+    return index.map(i => isNaN(row[i]) ? null : round2((round2(row[i]) - base) / base * 100));
+}
+
+function loadPeriod(period) {
+    // 차트 포인트는 기간 데이터를 받을 때 한 번만 변환 (선택/재클릭 시 재사용)
+    if (!PERIOD_DATA[period]) PERIOD_DATA[period] = Promise.all([
+        fetchJson(MANIFEST.periods[period]),
+        MANIFEST.prices ? loadPrices() : null,
+    ]).then(([data, rows]) => {
+        if (rows) {
+            // 바이너리 모드: 기간 파일에는 열 번호만 있음
+            data.spy = rebaseRow(rows.SPY, data.index);
+            data.top.forEach(stock => { stock.series = rebaseRow(rows[stock.symbol], data.index); });
+        }
+        data.spyPoints = toPoints(data.dates, data.spy);
+        data.top.forEach(stock => { stock.points = toPoints(data.dates, stock.series); });
+        return data;
+    });
+    return PERIOD_DATA[period];
+}
+
+const COLORS = [
+    '#4a90ff', '#ef4444', '#22c55e', '#ffd644', '#a855f7',
+    '#22d3ee', '#ec4899', '#84cc16', '#f97316', '#14b8a6',
+    '#8b5cf6', '#eab308', '#64748b', '#dc2626', '#0891b2',
+    '#c026d3', '#e11d48', '#ea580c', '#16a34a', '#2563eb'
+];
+
+let currentPeriod = 'YTD';
+let chart = null;
+let top20 = [];
+let selectedStock = null;
+
+// 기간 날짜축 + 재기준 수익률 배열 → Chart.js 포인트 (결측 제외)
+function toPoints(dates, values) {
+    if (!values) return [];
+    const points = [];
+    values.forEach((y, i) => { if (y !== null) points.push({ x: dates[i], y }); });
+    return points;
+}
+
+function updateChart() {
+    const datasets = [];
+
+    const spyData = PERIOD.spyPoints;
+    datasets.push({
+        label: 'SPY',
+        data: spyData,
+        borderColor: '#52525b',
+        borderWidth: 2,
+        borderDash: [5, 5],
+        pointRadius: 0,
+        tension: 0.1,
+        fill: false
+    });
+
+    top20.forEach((stock, i) => {
+        const stockData = stock.points;
+        if (stockData.length === 0) return;
+
+        let borderWidth = 2;
+        let borderColor = COLORS[i % COLORS.length];
+
+        if (selectedStock) {
+            if (stock.symbol === selectedStock) {
+                borderWidth = 4;
+            } else {
+                borderWidth = 1;
+                borderColor = COLORS[i % COLORS.length] + '40';
+            }
+        }
+
+        datasets.push({
+            label: stock.symbol,
+            data: stockData,
+            borderColor: borderColor,
+            borderWidth: borderWidth,
+            pointRadius: 0,
+            pointHoverRadius: 4,
+            tension: 0.1,
+            fill: false,
+            originalColor: COLORS[i % COLORS.length]
+        });
+    });
+
+    if (chart) {
+        chart.data.datasets = datasets;
+        chart.update('none');
+    } else {
+        const ctx = document.getElementById('perfChart').getContext('2d');
+        chart = new Chart(ctx, {
+            type: 'line',
+            data: { datasets },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                interaction: {
+                    mode: 'index',
+                    intersect: false
+                },
+                plugins: {
+                    legend: { display: false },
+                    tooltip: {
+                        backgroundColor: '#18181b',
+                        titleColor: '#fff',
+                        bodyColor: '#a1a1aa',
+                        borderColor: '#2a2a2a',
+                        borderWidth: 1,
+                        padding: window.innerWidth <= 600 ? 6 : 10,
+                        titleFont: { family: 'Noto Sans KR' },
+                        bodyFont: { family: 'JetBrains Mono', size: window.innerWidth <= 600 ? 10 : 11 },
+                        callbacks: {
+                            label: (ctx) => `${ctx.dataset.label}: ${ctx.parsed.y >= 0 ? '+' : ''}${ctx.parsed.y.toFixed(2)}%`
+                        }
+                    }
+                },
+                scales: {
+                    x: {
+                        type: 'time',
+                        time: {
+                            unit: currentPeriod === '1W' ? 'day' :
+                                  currentPeriod === '1M' ? 'week' : 'month',
+                            displayFormats: {
+                                day: 'MM/dd',
+                                week: 'MM/dd',
+                                month: 'yy/MM'
+                            }
+                        },
+                        grid: { color: '#1a1a1a' },
+                        ticks: { color: '#52525b', font: { family: 'JetBrains Mono', size: window.innerWidth <= 600 ? 9 : 10 } }
+                    },
+                    y: {
+                        grid: { color: '#1a1a1a' },
+                        ticks: {
+                            color: '#52525b',
+                            font: { family: 'JetBrains Mono', size: window.innerWidth <= 600 ? 9 : 10 },
+                            callback: (v) => v + '%'
+                        }
+                    }
+                }
+            }
+        });
+    }
+}
+
+function updateTable() {
+    const spyPerf = PERIOD.spyPerf;
+    const spyEl = document.getElementById('spy-perf');
+    spyEl.textContent = (spyPerf >= 0 ? '+' : '') + spyPerf.toFixed(2) + '%';
+    spyEl.className = 'spy-value ' + (spyPerf >= 0 ? '' : 'negative');
+
+    const tbody = document.getElementById('table-body');
+    tbody.innerHTML = top20.map((stock, i) => {
+        const perf = stock.perf;
+        const vsSpy = stock.vsSpy;
+        const name = STOCK_NAMES[stock.symbol] || stock.symbol;
+        const isSelected = selectedStock === stock.symbol;
+        const isDimmed = selectedStock && !isSelected;
+        return `
+            <tr data-symbol="${stock.symbol}" class="${isSelected ? 'selected' : ''} ${isDimmed ? 'dimmed' : ''}">
+                <td class="rank">${i + 1}</td>
+                <td>
+                    <div class="stock-info">
+                        <span class="stock-symbol" style="color: ${COLORS[i % COLORS.length]}">${stock.symbol}</span>
+                        <span class="stock-name">${name.substring(0, 25)}</span>
+                    </div>
+                </td>
+                <td class="perf-value ${perf >= 0 ? 'positive' : 'negative'}">${perf >= 0 ? '+' : ''}${perf.toFixed(2)}%</td>
+                <td class="vs-spy ${vsSpy >= 0 ? 'positive' : 'negative'}">${vsSpy >= 0 ? '+' : ''}${vsSpy.toFixed(2)}%</td>
+            </tr>
+        `;
+    }).join('');
+
+    tbody.querySelectorAll('tr').forEach(row => {
+        row.addEventListener('click', () => {
+            const symbol = row.dataset.symbol;
+            selectedStock = symbol;
+            updateChart();
+            updateTable();
+            updateInfoCard();
+        });
+    });
+}
+
+function updateInfoCard() {
+    if (!selectedStock) return;
+    const info = STOCK_INFO[selectedStock];
+    if (!info || !info.name) return;
+    document.getElementById('info-title').textContent = `${selectedStock} - ${info.name}`;
+    document.getElementById('info-sector').textContent = info.sector || '-';
+    document.getElementById('info-marketcap').textContent = info.marketCap || '-';
+    document.getElementById('info-price').textContent = info.price ? `$${info.price.toLocaleString()}` : '-';
+    document.getElementById('info-high52').textContent = info.high52w ? `$${info.high52w.toLocaleString()}` : '-';
+    document.getElementById('info-low52').textContent = info.low52w ? `$${info.low52w.toLocaleString()}` : '-';
+    document.getElementById('info-per').textContent = info.per || '-';
+    document.getElementById('info-pbr').textContent = info.pbr || '-';
+
+    // 위험/상대강도 지표 (기간 데이터의 종목 항목)
+    const entry = top20.find(s => s.symbol === selectedStock);
+    const risk = (entry && entry.risk) || {};
+    const fmt = (v, suffix = '') => v === undefined ? '-' : `${v.toFixed(2)}${suffix}`;
+    document.getElementById('info-beta').textContent = fmt(risk.beta);
+    document.getElementById('info-volatility').textContent = fmt(risk.volatility, '%');
+    document.getElementById('info-mdd').textContent = fmt(risk.maxDrawdown, '%');
+    document.getElementById('info-sharpe').textContent = fmt(risk.sharpe);
+    document.getElementById('info-rs').textContent = risk.relStrength === undefined ? '-'
+        : `${risk.relStrength >= 0 ? '+' : ''}${risk.relStrength.toFixed(2)}% (${risk.rsRating})`;
+    document.getElementById('info-description').textContent = info.description || '설명 없음';
+}
+
+function updateLegend() {
+    const legend = document.getElementById('legend');
+    let html = '<div class="legend-item"><div class="legend-spy"></div><span>SPY</span></div>';
+    top20.forEach((stock, i) => {
+        html += `<div class="legend-item"><div class="legend-dot" style="background: ${COLORS[i % COLORS.length]}"></div><span>${stock.symbol}</span></div>`;
+    });
+    legend.innerHTML = html;
+}
+
+async function update() {
+    const period = currentPeriod;
+    const data = await loadPeriod(period);
+    if (period !== currentPeriod) return;   // 로딩 중 다른 기간 선택
+    PERIOD = data;
+    top20 = data.top;
+    selectedStock = top20.length > 0 ? top20[0].symbol : null;
+    updateChart();
+    updateTable();
+    updateLegend();
+    updateInfoCard();
+}
+
+document.querySelectorAll('.period-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        document.querySelectorAll('.period-btn').forEach(b => b.classList.remove('active'));
+        btn.classList.add('active');
+        currentPeriod = btn.dataset.period;
+        update();
+    });
+});
+
+let resizeTimeout;
+window.addEventListener('resize', () => {
+    clearTimeout(resizeTimeout);
+    resizeTimeout = setTimeout(() => {
+        if (chart) { chart.update('none'); }
+    }, 200);
+});
+
+async function init() {
+    MANIFEST = await fetchJson('manifest.json', { cache: 'no-cache' });
+    const [meta] = await Promise.all([fetchJson(MANIFEST.meta), loadPeriod(currentPeriod)]);
+    STOCK_NAMES = meta.stockNames;
+    STOCK_INFO = meta.stockInfo;
+    document.getElementById('last-updated').textContent = meta.lastUpdated;
+    await update();
+}
+
+init().catch(e => {
+    console.error(e);
+    showToast('데이터를 불러오지 못했습니다');
+});